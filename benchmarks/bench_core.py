@@ -0,0 +1,272 @@
+"""
+Benchmark suite kay_core: waktu dan peak RSS per operasi untuk input sintetis yang makin besar
+(PDF scan/teks, foto JPEG, tabel MCU). Setiap pengukuran berjalan di proses baru; waktu diukur
+hanya untuk pemanggilan kay_core (tanpa memuat input), peak RSS untuk seluruh proses (termasuk
+baseline impor, lihat baris "baseline"). Worker process pool tidak ikut dihitung dalam RSS.
+
+Ukuran N berarti: jumlah file (merge, lock, rename, organise, photos, img2pdf), jumlah halaman
+(split, text, reorder, watermark, compress_pdf), N x 10 paragraf (translate) atau N x 100 baris (tabel).
+
+    python benchmarks/bench_core.py [N ...] [--only merge,split,...] [--csv hasil.csv]
+"""
+
+import argparse
+import csv
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+from common import LocalStandInTranslator, make_mcu_frame, make_scan_pdf, make_text_pdf, measure, print_table, write_photos, write_scan_pdfs
+
+TABLE_ROWS_PER_N = 100
+PARAGRAPHS_PER_N = 10
+
+
+def _write(path: str, data: bytes) -> str:
+    with open(path, "wb") as fh:
+        fh.write(data)
+    return path
+
+
+def _timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def _size(out) -> int:
+    out.seek(0, 2)
+    return out.tell()
+
+
+# ----------------- operasi (dijalankan di proses anak) -----------------
+# Tiap fungsi mengembalikan (jumlah_item, detik, ukuran_output_byte)
+
+def run_baseline():
+    importlib.import_module("kay_core")
+    return 0, 0.0, 0
+
+
+def run_merge(paths):
+    from kay_core import merge_pdfs_streaming
+    (out, _), sec = _timed(merge_pdfs_streaming, paths)
+    return len(paths), sec, _size(out)
+
+
+def run_split(path):
+    from kay_core import split_pdf_to_zip
+    (out, count), sec = _timed(split_pdf_to_zip, path, "page")
+    return count, sec, _size(out)
+
+
+def run_lock(paths):
+    import pandas as pd
+    from kay_core import lock_pdfs_to_zip, plan_lock_jobs
+    sources = {os.path.basename(p): p for p in paths}
+    df = pd.DataFrame({"filename": list(sources), "password": [f"pw{i}" for i in range(len(sources))]})
+
+    def job():
+        jobs, _ = plan_lock_jobs(df, sources)
+        return lock_pdfs_to_zip(jobs, sources)
+    (out, count, _), sec = _timed(job)
+    return count, sec, _size(out)
+
+
+def run_rename(paths):
+    import pandas as pd
+    from kay_core import plan_rename
+    sources = {os.path.basename(p): p for p in paths}
+    df = pd.DataFrame({"nama_lama": list(sources), "nama_baru": [f"Hasil_{i}" for i in range(len(sources))]})
+    (out, count), sec = _timed(lambda: plan_rename(df, sources, force_ext=".pdf").execute(sources))
+    return count, sec, _size(out)
+
+
+def run_organise(paths):
+    from kay_core import plan_organise, write_organised
+    sources = {os.path.basename(p): p for p in paths}
+    df = make_mcu_frame(len(paths))
+
+    def job():
+        _, plan, _, _ = plan_organise(df, sources)
+        return write_organised(plan, sources)
+    (out, count), sec = _timed(job)
+    return count, sec, _size(out)
+
+
+def run_photos(paths):
+    from kay_core import compress_images_to_zip
+    sources = [(os.path.basename(p), p) for p in paths]
+    (out, count, _), sec = _timed(compress_images_to_zip, sources, 1200, 75)
+    return count, sec, _size(out)
+
+
+def run_img2pdf(paths):
+    from kay_core import images_to_pdf
+    (out, pages, _), sec = _timed(images_to_pdf, paths, page_size="A4")
+    return pages, sec, _size(out)
+
+
+def run_text(path):
+    from kay_core import extract_page_texts
+    results, sec = _timed(extract_page_texts, path)
+    return len(results), sec, sum(len(t) for _, t, _ in results)
+
+
+def run_reorder(path):
+    from kay_core import cached_page_count, reorder_pages
+    order = list(range(cached_page_count(path), 0, -1))
+    (out, pages), sec = _timed(reorder_pages, path, order)
+    return pages, sec, _size(out)
+
+
+def run_watermark(path, wm_path):
+    from kay_core import watermark_pdf
+    (out, pages), sec = _timed(watermark_pdf, path, wm_path)
+    return pages, sec, _size(out)
+
+
+def run_compress_pdf(path):
+    from kay_core import cached_page_count, compress_pdf
+    pages = cached_page_count(path)
+    (data, _), sec = _timed(compress_pdf, path)
+    return pages, sec, len(data)
+
+
+def run_translate(path, with_memory):
+    from kay_core import TranslationMemory, extract_page_texts, layout_paragraphs, translate_segments
+    from kay_core.document import is_content_paragraph
+    paragraphs = layout_paragraphs(t for _, t, _ in extract_page_texts(path))
+    memory = TranslationMemory(os.path.join(os.path.dirname(path), "tm.sqlite3")) if with_memory else None
+    backend = LocalStandInTranslator(target="en")
+    options = dict(backend=lambda: backend, memory=memory, engine="stand-in", source="id", target="en",
+                   should_translate=is_content_paragraph, on_fail="keep", workers=8, rate=200.0)
+    if memory is not None:
+        # Putaran pertama mengisi translation memory; yang diukur adalah dokumen yang sama diterjemahkan ulang
+        translate_segments(paragraphs, **options)
+    (out, _), sec = _timed(translate_segments, paragraphs, **options)
+    return len(paragraphs), sec, sum(len(p) for p in out)
+
+
+def run_read_table(path):
+    from kay_core import read_table
+    df, sec = _timed(read_table, path)
+    return len(df), sec, int(df.memory_usage(deep=True).sum())
+
+
+def run_profile(path):
+    from kay_core import parse_table, profile_table
+    df = parse_table(path, os.path.splitext(path)[1])
+    profile, sec = _timed(profile_table, df)
+    return len(df), sec, int(profile.df.memory_usage(deep=True).sum())
+
+
+def run_export(path, fmt):
+    from kay_core import export_dataframe, parse_table
+    df = parse_table(path, os.path.splitext(path)[1])
+    out, sec = _timed(export_dataframe, df, fmt)
+    return len(df), sec, _size(out)
+
+
+# ----------------- persiapan input (proses utama) -----------------
+
+def _scan_pdfs(tmp, n):
+    return (write_scan_pdfs(os.path.join(tmp, "pdf"), n),)
+
+
+def _text_pdf(tmp, n):
+    return (_write(os.path.join(tmp, "doc.pdf"), make_text_pdf(n)),)
+
+
+def _scan_pdf(tmp, n):
+    return (_write(os.path.join(tmp, "scan.pdf"), make_scan_pdf(n)),)
+
+
+def _photos(tmp, n):
+    return (write_photos(os.path.join(tmp, "img"), n),)
+
+
+def _watermark(tmp, n):
+    wm = _write(os.path.join(tmp, "wm.pdf"), make_text_pdf(1, lines=3, seed=1))
+    return _text_pdf(tmp, n) + (wm,)
+
+
+def _table(ext):
+    def prepare(tmp, n):
+        df = make_mcu_frame(n * TABLE_ROWS_PER_N)
+        path = os.path.join(tmp, f"mcu{ext}")
+        if ext == ".xlsx":
+            df.to_excel(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        return (path,)
+    return prepare
+
+
+def _paragraphs(tmp, n):
+    # ~40 baris per halaman -> +-30 paragraf setelah layout; jumlah halaman disesuaikan
+    pages = max(1, n * PARAGRAPHS_PER_N // 30)
+    return _text_pdf(tmp, pages)
+
+
+# nama -> (persiapan, fungsi, argumen tambahan, satuan item)
+OPERATIONS = {
+    "merge": (_scan_pdfs, run_merge, (), "file"),
+    "split": (_text_pdf, run_split, (), "file"),
+    "lock": (_scan_pdfs, run_lock, (), "file"),
+    "rename": (_scan_pdfs, run_rename, (), "file"),
+    "organise": (_scan_pdfs, run_organise, (), "file"),
+    "photos": (_photos, run_photos, (), "foto"),
+    "img2pdf": (_photos, run_img2pdf, (), "halaman"),
+    "text": (_text_pdf, run_text, (), "halaman"),
+    "reorder": (_text_pdf, run_reorder, (), "halaman"),
+    "watermark": (_watermark, run_watermark, (), "halaman"),
+    "compress_pdf": (_scan_pdf, run_compress_pdf, (), "halaman"),
+    "translate": (_paragraphs, run_translate, (False,), "paragraf"),
+    "translate_tm": (_paragraphs, run_translate, (True,), "paragraf"),
+    "read_xlsx": (_table(".xlsx"), run_read_table, (), "baris"),
+    "read_csv": (_table(".csv"), run_read_table, (), "baris"),
+    "profile": (_table(".csv"), run_profile, (), "baris"),
+    "export_xlsx": (_table(".csv"), run_export, ("xlsx",), "baris"),
+    "export_csv": (_table(".csv"), run_export, ("csv",), "baris"),
+    "export_parquet": (_table(".csv"), run_export, ("parquet",), "baris"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 50, 200])
+    parser.add_argument("--only", default="", help="daftar operasi dipisah koma (default: semua)")
+    parser.add_argument("--csv", default=None, help="simpan hasil ke file CSV")
+    args = parser.parse_args(argv)
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(OPERATIONS)
+    unknown = [n for n in names if n not in OPERATIONS]
+    if unknown:
+        parser.error(f"operasi tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(OPERATIONS)})")
+
+    header = ["op", "N", "items", "unit", "seconds", "items_s", "peak_rss_MB", "out_MB"]
+    _, rss, _ = measure(run_baseline)
+    rows = [("baseline", "-", 0, "-", "0.000", "-", f"{rss:.0f}", "-")]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cache kay_core (Arrow, translation memory) di folder sementara agar setiap putaran dingin
+        os.environ["KAY_CACHE_DIR"] = os.path.join(tmp, "cache")
+        for name in names:
+            prepare, func, extra, unit = OPERATIONS[name]
+            for n in args.sizes:
+                workdir = tempfile.mkdtemp(dir=tmp)
+                inputs = prepare(workdir, n)
+                sec, rss, (items, op_sec, out_bytes) = measure(func, *inputs, *extra)
+                rows.append((name, n, items, unit, f"{op_sec:.3f}", f"{items / op_sec:.1f}" if op_sec > 0 else "-",
+                             f"{rss:.0f}", f"{out_bytes / 1e6:.2f}"))
+                print(f"{name} N={n}: {op_sec:.3f} s, peak {rss:.0f} MB", file=sys.stderr)
+    print_table(header, rows)
+    if args.csv:
+        with open(args.csv, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
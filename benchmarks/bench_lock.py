@@ -0,0 +1,66 @@
+"""
+Benchmark Batch Lock: throughput (file/detik) cara lama vs kay_core.
+Cara lama: scan semua nama file per baris Excel + enkripsi serial.
+Cara baru: lookup dict + enkripsi di process pool, hasil langsung ke ZipSink.
+
+    python benchmarks/bench_lock.py [jumlah_file ...]
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from common import measure, print_table, write_scan_pdfs
+
+
+def _excel(paths):
+    names = [os.path.basename(p) for p in paths]
+    return pd.DataFrame({"filename": names, "password": [f"pw{i}" for i in range(len(names))]})
+
+
+def lock_legacy(paths):
+    from PyPDF2 import PdfReader, PdfWriter
+    from kay_core import ZipSink, try_encrypt
+    df = _excel(paths)
+    pdf_map = {os.path.basename(p): p for p in paths}
+    sink = ZipSink()
+    for _, row in df.iterrows():
+        target_col = next((c for c in df.columns if c.lower() in ("filename", "nama_file")), None)
+        pwd_col = next((c for c in df.columns if c.lower() in ("password", "kata_sandi")), None)
+        target, pwd = str(row[target_col]).strip(), str(row[pwd_col]).strip()
+        matches = [k for k in pdf_map.keys() if k == target]
+        if matches:
+            reader = PdfReader(pdf_map[matches[0]])
+            writer = PdfWriter()
+            for p in reader.pages:
+                writer.add_page(p)
+            try_encrypt(writer, pwd)
+            b = io.BytesIO(); writer.write(b); sink.add(f"locked_{matches[0]}", b.getvalue())
+    sink.close()
+    return sink.count
+
+
+def lock_pool(paths, workers=None):
+    from kay_core import lock_pdfs_to_zip, plan_lock_jobs
+    pdf_map = {os.path.basename(p): p for p in paths}
+    jobs, _ = plan_lock_jobs(_excel(paths), pdf_map)
+    _, count, _ = lock_pdfs_to_zip(jobs, pdf_map, workers=workers)
+    return count
+
+
+def main(counts):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_scan_pdfs(tmp, max(counts))
+        for n in counts:
+            t_old, _, c_old = measure(lock_legacy, paths[:n])
+            t_new, _, c_new = measure(lock_pool, paths[:n])
+            rows.append((n, os.cpu_count(), f"{t_old:.2f}", f"{t_new:.2f}", f"{c_old / t_old:.1f}", f"{c_new / t_new:.1f}"))
+    print_table(["files", "cpus", "legacy_s", "pool_s", "legacy_files_s", "pool_files_s"], rows)
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100, 1000, 5000])
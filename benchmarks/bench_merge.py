@@ -0,0 +1,46 @@
+"""
+Benchmark Gabung PDF: peak RSS vs jumlah file input.
+Membandingkan cara lama (PdfWriter + BytesIO) dengan merge streaming kay_core.
+
+    python benchmarks/bench_merge.py [jumlah_file ...]
+"""
+
+import io
+import sys
+import tempfile
+
+from common import measure, print_table, write_scan_pdfs
+
+
+def merge_legacy(paths):
+    from PyPDF2 import PdfReader, PdfWriter
+    writer = PdfWriter()
+    for path in paths:
+        with open(path, "rb") as fh:
+            reader = PdfReader(io.BytesIO(fh.read()))
+        for p in reader.pages:
+            writer.add_page(p)
+    out = io.BytesIO(); writer.write(out)
+    return len(out.getvalue())
+
+
+def merge_streaming(paths):
+    from kay_core import merge_pdfs_streaming
+    out, _ = merge_pdfs_streaming(paths)
+    out.seek(0, 2)
+    return out.tell()
+
+
+def main(counts):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_scan_pdfs(tmp, max(counts))
+        for n in counts:
+            t_old, rss_old, size_old = measure(merge_legacy, paths[:n])
+            t_new, rss_new, size_new = measure(merge_streaming, paths[:n])
+            rows.append((n, f"{size_new / 1e6:.1f}", f"{rss_old:.0f}", f"{rss_new:.0f}", f"{t_old:.2f}", f"{t_new:.2f}"))
+    print_table(["files", "out_MB", "legacy_rss_MB", "stream_rss_MB", "legacy_s", "stream_s"], rows)
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10, 50, 100, 300])
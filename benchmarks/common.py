@@ -0,0 +1,216 @@
+"""
+Helper bersama untuk benchmark: pembuat data sintetis (PDF scan/teks, foto, tabel MCU), backend terjemahan
+tiruan, dan pengukur peak RSS.
+Setiap pengukuran dijalankan di proses baru (spawn) agar peak RSS tidak saling tercampur.
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import resource
+import threading
+import multiprocessing as mp
+from collections import deque
+
+# Agar `import kay_core` berjalan saat benchmark dijalankan dari folder mana pun
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from PIL import Image
+
+from kay_core.translate import ThrottledError
+
+
+def make_scan_pdf(pages: int = 1, width: int = 850, height: int = 1100, seed: int = 0) -> bytes:
+    """PDF sintetis mirip hasil scan: tiap halaman berisi satu gambar JPEG noise."""
+    rng = random.Random(seed)
+    imgs = []
+    for _ in range(pages):
+        raw = rng.randbytes(width * height // 16)
+        small = Image.frombytes("L", (width // 4, height // 4), raw)
+        imgs.append(small.resize((width, height)).convert("RGB"))
+    buf = io.BytesIO()
+    imgs[0].save(buf, format="PDF", save_all=True, append_images=imgs[1:], resolution=100)
+    return buf.getvalue()
+
+
+def write_scan_pdfs(folder: str, count: int, pages: int = 1) -> list:
+    """Menulis `count` PDF sintetis ke folder. Mengembalikan daftar path."""
+    os.makedirs(folder, exist_ok=True)
+    template = make_scan_pdf(pages)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"MCU{i:05d}_report.pdf")
+        with open(path, "wb") as fh:
+            fh.write(template)
+        paths.append(path)
+    return paths
+
+
+_WORDS = ("hasil", "pemeriksaan", "tekanan", "darah", "normal", "gula", "kolesterol", "fit", "kerja",
+          "pasien", "dokter", "catatan", "laboratorium", "rontgen", "paru", "jantung", "audiometri")
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_text_pdf(pages: int = 1, lines: int = 40, seed: int = 0) -> bytes:
+    """PDF sintetis berisi teks (Helvetica) agar ekstraksi/terjemahan punya isi: paragraf panjang + baris label pendek."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_no in range(1, pages + 1):
+        rows = []
+        for i in range(lines):
+            if i % 5 == 4:
+                rows.append(f"Label {i}: {rng.choice(_WORDS)}")
+            else:
+                rows.append(" ".join(rng.choice(_WORDS) for _ in range(12)) + ".")
+        ops = ["BT /F1 9 Tf 12 TL 40 800 Td", f"(Halaman {page_no}) Tj"]
+        ops += [f"T* ({_pdf_escape(r)}) Tj" for r in rows]
+        ops.append("ET")
+        content = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+    buf = io.BytesIO()
+    buf.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, 1):
+        offsets.append(buf.tell())
+        buf.write(b"%d 0 obj\n" % num + obj + b"\nendobj\n")
+    xref = buf.tell()
+    buf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        buf.write(b"%010d 00000 n \n" % off)
+    buf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return buf.getvalue()
+
+
+def write_photos(folder: str, count: int, width: int = 2400, height: int = 1800, seed: int = 0) -> list:
+    """Menulis `count` foto JPEG sintetis (noise halus, mirip foto kamera). Mengembalikan daftar path."""
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    raw = rng.randbytes(width * height // 64)
+    img = Image.frombytes("L", (width // 8, height // 8), raw).resize((width, height)).convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=90)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"IMG_{i:05d}.jpg")
+        with open(path, "wb") as fh:
+            fh.write(buf.getvalue())
+        paths.append(path)
+    return paths
+
+
+def make_mcu_frame(rows: int, seed: int = 0):
+    """DataFrame mirip data hasil MCU massal (ID, nama, departemen, jabatan, status, angka lab)."""
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "No_MCU": [f"MCU{i:05d}" for i in range(rows)],
+        "Nama": [f"Pegawai {i}" for i in range(rows)],
+        "Departemen": rng.choice(["IT", "HR", "Finance", "Produksi", "Gudang", "QA"], rows),
+        "JABATAN": rng.choice(["Staf", "Supervisor", "Manager", "Operator"], rows),
+        "Gender": rng.choice(["L", "P"], rows),
+        "Status MCU": rng.choice(["fit", "FIT ", "unfit", "fit dengan catatan", None], rows),
+        "Tekanan Darah": rng.integers(90, 180, rows),
+        "Gula Darah": rng.normal(100, 20, rows).round(1),
+    })
+
+
+class LocalStandInTranslator:
+    """
+    Pengganti backend terjemahan untuk benchmark (tanpa jaringan, tidak dipakai aplikasi):
+    menambahkan prefix [target] per paragraf setelah jeda `latency` (+ jitter).
+    - max_per_second: lebih dari ini dalam 1 detik terakhir -> ThrottledError
+    - failure_rate: peluang ConnectionError acak
+    - hang_rate: peluang percobaan menggantung `hang_seconds` (untuk menguji timeout)
+    Thread-safe; satu instance dipakai bersama agar simulasi throttling bersifat global.
+    """
+
+    def __init__(self, target: str = "en", latency: float = 0.2, jitter: float = 0.1, max_per_second: float = None,
+                 failure_rate: float = 0.0, hang_rate: float = 0.0, hang_seconds: float = 60.0, seed: int = None):
+        self.target = target
+        self.latency = latency
+        self.jitter = jitter
+        self.max_per_second = max_per_second
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def translate(self, text: str) -> str:
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            throttled = self.max_per_second is not None and len(self._recent) >= self.max_per_second
+            self._recent.append(now)
+            roll, delay = self._rng.random(), self.latency + self._rng.uniform(0, self.jitter)
+        if throttled:
+            raise ThrottledError("429 Too Many Requests (simulasi)")
+        if roll < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        time.sleep(delay)
+        if roll < self.hang_rate + self.failure_rate:
+            raise ConnectionError("Koneksi terputus (simulasi)")
+        # Paragraf (dipisah baris kosong) dipertahankan, seperti penerjemah sungguhan
+        return "\n\n".join(f"[{self.target}] {p.strip()}" for p in text.strip().split("\n\n"))
+
+
+def _peak_rss_mb() -> float:
+    # Linux: VmHWM milik proses ini saja (ru_maxrss ikut membawa puncak proses induk melewati exec)
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss: Linux dalam KB, macOS dalam byte
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def _child(queue, func, args):
+    t0 = time.perf_counter()
+    try:
+        result = func(*args)
+    except BaseException as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+        raise
+    queue.put(("ok", (time.perf_counter() - t0, _peak_rss_mb(), result)))
+
+
+def measure(func, *args):
+    """Menjalankan func(*args) di proses baru. Mengembalikan (detik, peak_rss_mb, hasil); error di anak -> RuntimeError."""
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(queue, func, args))
+    proc.start()
+    status, out = queue.get()
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"{getattr(func, '__name__', func)} gagal: {out}")
+    return out
+
+
+def print_table(header: list, rows: list):
+    widths = [max(len(str(x)) for x in col) for col in zip(header, *rows)]
+    fmt = "  ".join(f"{{:>{w}}}" for w in widths)
+    print(fmt.format(*header))
+    for r in rows:
+        print(fmt.format(*r))
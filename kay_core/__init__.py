@@ -0,0 +1,41 @@
+"""
+KAY Core - mesin pemrosesan tanpa UI untuk KAY App.
+Modul di paket ini bisa diimpor oleh scrip.py (Streamlit) maupun oleh proses worker
+(multiprocessing), karena tidak bergantung pada `st.*`. scrip.py hanya berisi UI: semua operasi
+ada di sini (masukan path/bytes/file-like, keluaran file/bytes), sehingga juga dipakai oleh
+CLI batch (`python -m kay_core`), job latar belakang (jobs.py, tasks.py) dan benchmark
+(benchmarks/bench_core.py).
+"""
+
+from .spool import SPOOL_MAX_BYTES, new_spool, open_source, source_bytes, source_payload, spool_reader, spool_to_bytes
+from .zipsink import DirSink, ZipSink, as_sink, compression_for, extract_zip, zip_files
+from .merge import StreamingPdfMerger, merge_pdfs_in_memory, merge_pdfs_streaming
+from .parallel import default_workers
+from .split import SPLIT_MODES, parse_page_ranges, plan_split, split_pdf_to_zip
+from .compress import COMPRESS_STAGES, PIKEPDF_AVAILABLE, compress_pdf
+from .watermark import watermark_pdf
+from .raster import PDF2IMAGE_AVAILABLE, RASTER_WINDOW, iter_rendered_pages, rasterize_to_zip
+from .cache import LRUCache, cache_dir, content_hash
+from .text import TEXT_ENGINES, extract_page_texts, iter_page_texts, select_pages
+from .tables import DEFAULT_TABLE_SETTINGS, TABLE_STRATEGIES, iter_page_tables, tables_to_xlsx
+from .parsed import PARSED_CACHE_BYTES, cached_extraction, cached_page_count, cached_page_texts, open_pdf_reader, parsed_cache
+from .columnar import COLUMNAR_CACHE_BYTES, PYARROW_AVAILABLE, evict_columnar_cache
+from .ingest import CALAMINE_AVAILABLE, CSV_ENGINE, EXCEL_ENGINE, columnar_table, parse_table, read_table, read_table_columnar
+from .export import EXPORT_FORMATS, available_export_formats, export_dataframe, write_csv, write_excel, write_parquet
+from .dataprofile import PROFILE_MAX_CATEGORIES, STATUS_KEYWORDS, TableProfile, cached_profile, profile_table
+from .preview import PREVIEW_DPI, PREVIEW_PAGE_SIZE, page_texts, render_cache, render_thumbnails
+from .lock import encrypt_pdf_bytes, lock_pdfs_to_zip, plan_lock_jobs, resolve_lock_columns, try_encrypt
+from .pages import ROTATE_ANGLES, decrypt_pdf, encrypt_pdf, parse_page_order, remove_pages, reorder_pages, rotate_page_safe, rotate_pages
+from .organise import FOLDER_COLUMNS, MCU_COLUMNS, PrefixIndex, plan_organise, plan_organise_by_folder, plan_organise_by_mcu, write_organised
+from .rename import RENAME_COLUMNS, RenamePlan, plan_rename, plan_sequential_rename
+from .photos import IMAGE_FORMATS, compress_image_bytes, compress_images_to_zip, convert_image_bytes, convert_images_to_zip
+from .imagepdf import FIT_MODES, PAGE_SIZES, ImagePdfBuilder, images_to_pdf
+from .translation_memory import TM_MAX_BYTES, TranslationMemory, translation_memory
+from .translate import TRANSLATE_BACKENDS, TokenBucket, TranslationError, make_backend, translate_chunks, translate_segments
+from .document import (
+    DOCX_AVAILABLE, DOCX_MIME, PAGE_BREAK_MARKER, layout_paragraphs, page_texts_frame, page_texts_to_docx,
+    page_texts_to_text, paragraphs_text, paragraphs_to_docx, translate_paragraphs,
+)
+from .uploads import UPLOAD_SESSION_QUOTA, UPLOAD_SPOOL_MIN_BYTES, StoredUpload, UploadQuotaError, UploadStore, cleanup_stale_uploads
+from .jobs import JOB_MAX_AGE, JOB_STATES, JobCancelled, JobContext, JobRunner, JobStore, job_fingerprint, job_runner
+from .tasks import lock_task, merge_task, rasterize_task, translate_task
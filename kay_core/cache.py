@@ -0,0 +1,102 @@
+"""
+Cache in-process bersama (bertahan antar rerun Streamlit karena modul hanya diimpor sekali).
+Kunci berbasis hash isi file, sehingga file yang sama tidak diproses ulang.
+Cache persisten di disk (mis. translation memory) disimpan di bawah cache_dir().
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Lokasi cache persisten; bisa diganti lewat environment variable KAY_CACHE_DIR
+CACHE_DIR_ENV = "KAY_CACHE_DIR"
+
+
+def cache_dir(*parts: str) -> str:
+    """Folder cache persisten (dibuat jika belum ada), default ~/.cache/kay_app/<parts>."""
+    base = os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "kay_app")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_hash(source) -> str:
+    """Hash isi file (bytes, path, UploadedFile/BytesIO, atau file-like) tanpa membuat salinan jika memungkinkan."""
+    h = hashlib.blake2b(digest_size=20)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        h.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                h.update(block)
+    elif hasattr(source, "getbuffer"):
+        h.update(source.getbuffer())
+    else:
+        pos = source.tell() if hasattr(source, "tell") else None
+        source.seek(0)
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            h.update(block)
+        if pos is not None:
+            source.seek(pos)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe dengan batas total byte.
+    Setiap entri menyimpan perkiraan ukurannya; entri paling lama tidak dipakai dibuang
+    saat total melewati `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes: int):
+        """Menyimpan nilai. Nilai yang lebih besar dari seluruh budget tidak disimpan."""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes and self._data:
+                _, (_, size) = self._data.popitem(last=False)
+                self.bytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data), "bytes": self.bytes, "max_bytes": self.max_bytes,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
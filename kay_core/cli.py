@@ -0,0 +1,326 @@
+"""
+CLI batch tanpa UI untuk tool PDF dan MCU (dipakai job malam / server tanpa browser).
+
+    python -m kay_core merge        INPUT... -o gabungan.pdf
+    python -m kay_core split        INPUT... -o folder_atau.zip [--mode page|every|ranges]
+    python -m kay_core lock         INPUT... --excel daftar.xlsx -o folder_atau.zip
+    python -m kay_core organise     INPUT... --excel daftar.xlsx -o folder_atau.zip
+    python -m kay_core rename       INPUT... --excel daftar.xlsx -o folder_atau.zip [--force-ext .pdf]
+    python -m kay_core compress-photos INPUT... -o folder_atau.zip [--max-side 1200 --quality 75]
+    python -m kay_core extract-text INPUT... -o folder_atau.zip [--pages "1-3, 5"]
+
+INPUT boleh file atau folder (isi folder dipilih berdasarkan ekstensi, --recursive untuk subfolder).
+Output berakhiran .zip ditulis sebagai ZIP; selain itu sebagai folder. Semua engine memakai
+process pool (--workers, default semua core) dan hasil langsung ditulis ke disk. Progress dan
+ringkasan throughput dicetak ke stderr.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .document import page_texts_to_text
+from .ingest import read_table
+from .lock import lock_pdfs_to_zip, plan_lock_jobs
+from .merge import merge_pdfs_streaming
+from .organise import FOLDER_COLUMNS, MCU_COLUMNS, plan_organise, write_organised
+from .parallel import imap_unordered_bounded
+from .photos import compress_images_to_zip
+from .rename import RENAME_COLUMNS, plan_rename
+from .split import SPLIT_MODES, split_pdf_to_zip
+from .text import TEXT_ENGINES, extract_page_texts, page_count, select_pages
+from .zipsink import DirSink, ZipSink
+
+PDF_EXTENSIONS = (".pdf",)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+
+class Progress:
+    """Callback progress(selesai, total) yang mencetak satu baris status ke stderr (maksimal ~5x per detik)."""
+
+    def __init__(self, label: str, quiet: bool = False, stream=None):
+        self.label = label
+        self.quiet = quiet
+        self.stream = stream or sys.stderr
+        self.start = time.perf_counter()
+        self._last = 0.0
+        self.done = 0
+
+    def __call__(self, done: int, total: int = None):
+        self.done = done
+        now = time.perf_counter()
+        if self.quiet or (now - self._last < 0.2 and done != total):
+            return
+        self._last = now
+        rate = done / max(now - self.start, 1e-9)
+        pct = f" ({done / total * 100:5.1f}%)" if total else ""
+        self.stream.write(f"\r[{self.label}] {done}/{total if total else '?'}{pct} {rate:.1f}/s")
+        self.stream.flush()
+
+    def finish(self):
+        if not self.quiet and self._last:
+            self.stream.write("\n")
+
+
+def collect_inputs(paths: list, extensions: tuple, recursive: bool = False) -> list:
+    """File dari argumen (file langsung dipakai, folder dipindai berdasarkan ekstensi), urut per folder lalu nama."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                walker = ((root, files) for root, _, files in os.walk(path))
+            else:
+                walker = [(path, [e.name for e in os.scandir(path) if e.is_file()])]
+            for root, files in walker:
+                found.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(extensions))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            raise FileNotFoundError(f"Input tidak ditemukan: {path}")
+    return found
+
+
+def source_map(paths: list) -> dict:
+    """nama_file -> path (seperti daftar upload di UI). Nama ganda dari folder berbeda: yang pertama dipakai."""
+    mapping = {}
+    for path in paths:
+        name = os.path.basename(path)
+        if name in mapping:
+            _warn(f"nama file ganda diabaikan: {path} (dipakai {mapping[name]})")
+            continue
+        mapping[name] = path
+    return mapping
+
+
+def open_sink(out: str):
+    """Output .zip -> ZipSink di file tersebut, selain itu -> DirSink (folder)."""
+    if out.lower().endswith(".zip"):
+        return ZipSink(_open_output(out))
+    return DirSink(out)
+
+
+def _open_output(path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return open(path, "w+b")
+
+
+def close_sink(sink):
+    result = sink.close()
+    if isinstance(sink, DirSink):
+        return result
+    result.close()
+    return sink.out.name
+
+
+def _warn(message: str):
+    sys.stderr.write(f"peringatan: {message}\n")
+
+
+def _total_size(paths) -> int:
+    return sum(os.path.getsize(p) for p in paths)
+
+
+def _summary(label: str, count: int, unit: str, elapsed: float, bytes_in: int, output: str, errors: list = ()):
+    rate = count / elapsed if elapsed > 0 else 0.0
+    mb = bytes_in / 1024 / 1024
+    sys.stderr.write(
+        f"{label}: {count} {unit} dalam {elapsed:.2f} s ({rate:.1f} {unit}/s, input {mb:.1f} MB, "
+        f"{mb / elapsed if elapsed > 0 else 0.0:.1f} MB/s) -> {output}\n"
+    )
+    for name, err in list(errors)[:20]:
+        sys.stderr.write(f"  gagal: {name}: {err}\n")
+    if len(errors) > 20:
+        sys.stderr.write(f"  ... dan {len(errors) - 20} error lainnya\n")
+
+
+def _report_missing(label: str, missing: list):
+    if missing:
+        _warn(f"{len(missing)} {label} tidak ditemukan di input. Contoh: {missing[:10]}")
+
+
+def cmd_merge(args) -> int:
+    paths = collect_inputs(args.inputs, PDF_EXTENSIONS, args.recursive)
+    progress = Progress("merge", args.quiet)
+    with _open_output(args.output) as fh:
+        _, pages = merge_pdfs_streaming(paths, fh, progress=lambda i: progress(i, len(paths)))
+    progress.finish()
+    _summary("merge", len(paths), "file", time.perf_counter() - progress.start, _total_size(paths), f"{args.output} ({pages} halaman)")
+    return 0
+
+
+def cmd_split(args) -> int:
+    paths = collect_inputs(args.inputs, PDF_EXTENSIONS, args.recursive)
+    if len(paths) > 1 and args.output.lower().endswith(".zip"):
+        raise ValueError("Split banyak PDF sekaligus hanya ke folder output (satu subfolder per PDF).")
+    progress = Progress("split", args.quiet)
+    total = 0
+    for path in paths:
+        out = args.output if len(paths) == 1 else os.path.join(args.output, os.path.splitext(os.path.basename(path))[0])
+        sink = open_sink(out)
+        _, n = split_pdf_to_zip(path, args.mode, args.every, args.ranges, sink, args.workers,
+                                progress=lambda i, _t: progress(total + i))
+        close_sink(sink)
+        total += n
+    progress.finish()
+    _summary("split", total, "file", time.perf_counter() - progress.start, _total_size(paths), args.output)
+    return 0
+
+
+def cmd_lock(args) -> int:
+    sources = source_map(collect_inputs(args.inputs, PDF_EXTENSIONS, args.recursive))
+    jobs, not_found = plan_lock_jobs(read_table(args.excel), sources)
+    _report_missing("nama file dari Excel", not_found)
+    progress = Progress("lock", args.quiet)
+    sink = open_sink(args.output)
+    _, count, errors = lock_pdfs_to_zip(jobs, sources, sink, args.workers, progress)
+    output = close_sink(sink)
+    progress.finish()
+    _summary("lock", count, "file", time.perf_counter() - progress.start, _total_size(sources[n] for n, _ in jobs), output, errors)
+    return 1 if errors else 0
+
+
+def cmd_organise(args) -> int:
+    sources = source_map(collect_inputs(args.inputs, PDF_EXTENSIONS, args.recursive))
+    df = read_table(args.excel, columns=MCU_COLUMNS + FOLDER_COLUMNS)
+    mode, plan, not_found, ambiguous = plan_organise(df, sources)
+    _report_missing("ID/file dari Excel", not_found)
+    if ambiguous:
+        _warn(f"{len(ambiguous)} No_MCU cocok dengan lebih dari satu file (file pertama dipakai). Contoh: {dict(list(ambiguous.items())[:5])}")
+    progress = Progress(f"organise:{mode}", args.quiet)
+    sink = open_sink(args.output)
+    _, count = write_organised(plan, sources, sink, progress)
+    output = close_sink(sink)
+    progress.finish()
+    _summary("organise", count, "file", time.perf_counter() - progress.start, _total_size(sources[n] for _, n in plan), output)
+    return 0
+
+
+def cmd_rename(args) -> int:
+    sources = source_map(collect_inputs(args.inputs, args.extensions, args.recursive))
+    plan = plan_rename(read_table(args.excel, columns=RENAME_COLUMNS), sources, force_ext=args.force_ext)
+    _report_missing("nama_lama dari Excel", plan.not_found)
+    if plan.duplicates:
+        _warn(f"{len(plan.duplicates)} nama_baru dipakai lebih dari satu baris (diberi akhiran _2, _3, ...)")
+    progress = Progress("rename", args.quiet)
+    sink = open_sink(args.output)
+    _, count = plan.execute(sources, sink, progress)
+    output = close_sink(sink)
+    progress.finish()
+    _summary("rename", count, "file", time.perf_counter() - progress.start, _total_size(sources[o] for o, _ in plan.pairs), output)
+    return 0
+
+
+def cmd_compress_photos(args) -> int:
+    paths = collect_inputs(args.inputs, IMAGE_EXTENSIONS, args.recursive)
+    sources = list(source_map(paths).items())
+    progress = Progress("compress-photos", args.quiet)
+    sink = open_sink(args.output)
+    _, count, errors = compress_images_to_zip(sources, args.max_side, args.quality, sink, args.workers, progress)
+    output = close_sink(sink)
+    progress.finish()
+    _summary("compress-photos", count, "file", time.perf_counter() - progress.start, _total_size(p for _, p in sources), output, errors)
+    return 1 if errors else 0
+
+
+def _extract_file(job: tuple) -> tuple:
+    """Worker: satu PDF utuh -> teks (format sama dengan tombol Extract Text di UI)."""
+    path, engine, ranges = job
+    try:
+        pages = select_pages(ranges, page_count(path)) if ranges else None
+        results = extract_page_texts(path, engine, pages, workers=1)
+        return path, page_texts_to_text(results), len(results), None
+    except Exception as e:
+        return path, None, 0, f"{type(e).__name__}: {e}"
+
+
+def cmd_extract_text(args) -> int:
+    paths = collect_inputs(args.inputs, PDF_EXTENSIONS, args.recursive)
+    progress = Progress("extract-text", args.quiet)
+    sink = open_sink(args.output)
+    errors, n_pages, done = [], 0, 0
+
+    def write(path, text, pages, err):
+        # Hasil langsung ditulis ke sink; yang disimpan hanya penghitung dan daftar error
+        nonlocal n_pages
+        if err:
+            errors.append((path, err))
+            return
+        sink.add(os.path.splitext(os.path.basename(path))[0] + ".txt", text.encode("utf-8"))
+        n_pages += pages
+
+    if len(paths) == 1:
+        # Satu dokumen: paralel per halaman
+        pages = select_pages(args.pages, page_count(paths[0])) if args.pages else None
+        items = extract_page_texts(paths[0], args.engine, pages, args.workers, progress)
+        write(paths[0], page_texts_to_text(items), len(items), None)
+    else:
+        # Banyak dokumen: paralel per file (tiap worker memproses satu PDF utuh)
+        jobs = ((p, args.engine, args.pages) for p in paths)
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            for item in imap_unordered_bounded(ex, _extract_file, jobs, args.workers * 4):
+                write(*item)
+                done += 1
+                progress(done, len(paths))
+    output = close_sink(sink)
+    progress.finish()
+    _summary("extract-text", len(paths) - len(errors), "file", time.perf_counter() - progress.start,
+             _total_size(paths), f"{output} ({n_pages} halaman)", errors)
+    return 1 if errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m kay_core", description="Tool PDF/MCU KAY tanpa UI (batch).")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+", help="file atau folder input")
+    common.add_argument("-o", "--output", required=True, help="file/folder output (.zip = arsip ZIP)")
+    common.add_argument("-r", "--recursive", action="store_true", help="pindai subfolder")
+    common.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="jumlah proses worker")
+    common.add_argument("-q", "--quiet", action="store_true", help="tanpa baris progress")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("merge", parents=[common], help="gabung PDF (urut sesuai input) ke satu file")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("split", parents=[common], help="pisah PDF per halaman/per N halaman/per rentang")
+    p.add_argument("--mode", choices=SPLIT_MODES, default="page")
+    p.add_argument("--every", type=int, default=1, help="jumlah halaman per file (mode every)")
+    p.add_argument("--ranges", default="", help='rentang halaman, contoh "1-3, 5" (mode ranges)')
+    p.set_defaults(func=cmd_split)
+
+    for name, func, text in (
+        ("lock", cmd_lock, "kunci PDF dengan password dari Excel (filename, password)"),
+        ("organise", cmd_organise, "atur PDF ke folder dari Excel (No_MCU/Departemen/JABATAN atau filename/target_folder)"),
+    ):
+        p = sub.add_parser(name, parents=[common], help=text)
+        p.add_argument("--excel", required=True, help="file Excel/CSV")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("rename", parents=[common], help="ganti nama file dari Excel (nama_lama, nama_baru)")
+    p.add_argument("--excel", required=True, help="file Excel/CSV")
+    p.add_argument("--force-ext", default=None, help='ekstensi wajib untuk nama_baru, mis. ".pdf"')
+    p.add_argument("--extensions", type=lambda s: tuple(e.strip().lower() for e in s.split(",")),
+                   default=PDF_EXTENSIONS + IMAGE_EXTENSIONS, help="ekstensi file yang dipindai dari folder (koma)")
+    p.set_defaults(func=cmd_rename)
+
+    p = sub.add_parser("compress-photos", parents=[common], help="kompres foto ke JPEG")
+    p.add_argument("--max-side", type=int, default=1200)
+    p.add_argument("--quality", type=int, default=75)
+    p.set_defaults(func=cmd_compress_photos)
+
+    p = sub.add_parser("extract-text", parents=[common], help="ekstrak teks PDF ke .txt per file")
+    p.add_argument("--engine", choices=("auto",) + TEXT_ENGINES, default="auto")
+    p.add_argument("--pages", default="", help='halaman, contoh "1-3, 5" (kosong = semua)')
+    p.set_defaults(func=cmd_extract_text)
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.workers = max(1, args.workers)
+    try:
+        return args.func(args)
+    except (ValueError, FileNotFoundError, RuntimeError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 2
@@ -0,0 +1,93 @@
+"""
+Penyimpanan cache kolumnar (Arrow IPC) untuk tabel hasil upload.
+Tabel yang sudah di-parse disimpan sebagai file .arrow di disk dengan kunci hash isi file;
+membukanya lagi cukup memory-map (milidetik, tanpa parsing ulang dan tanpa menyalin data ke RAM).
+Cache bertahan antar restart dan dibatasi ukuran totalnya. Pembacaan upload ada di ingest.py.
+"""
+
+import os
+import threading
+
+from .cache import cache_dir
+
+pa = ipc = None
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except Exception:
+    pass
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+PYARROW_AVAILABLE = pa is not None
+
+# Budget disk untuk semua file .arrow; file yang paling lama tidak dipakai dibuang lebih dulu
+COLUMNAR_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def columnar_path(doc_key: str, ext: str = "") -> str:
+    return os.path.join(cache_dir("tables"), f"{doc_key}{ext.replace('.', '_')}.arrow")
+
+
+def arrow_safe(df):
+    """
+    Menyiapkan DataFrame untuk Arrow (diubah di tempat): nama kolom jadi teks, dan kolom object
+    campuran (mis. ID berisi angka dan teks dari Excel) disimpan sebagai teks (nilai kosong tetap kosong).
+    """
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns[(df.dtypes == object).to_numpy()]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def frame_to_arrow(df):
+    """pyarrow.Table dari DataFrame hasil parsing (lewat arrow_safe, diubah di tempat), tanpa index."""
+    return pa.Table.from_pandas(arrow_safe(df), preserve_index=False)
+
+
+def write_columnar(df, path: str):
+    """Menulis DataFrame ke file Arrow IPC secara atomik (temp file + rename)."""
+    table = frame_to_arrow(df)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with pa.OSFile(tmp, "wb") as fh, ipc.new_file(fh, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def evict_columnar_cache(max_bytes: int = COLUMNAR_CACHE_BYTES) -> int:
+    """Membuang file .arrow tertua (mtime) sampai total <= max_bytes. Mengembalikan jumlah file dibuang."""
+    folder = cache_dir("tables")
+    entries = []
+    for entry in os.scandir(folder):
+        if entry.name.endswith(".arrow"):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def open_columnar(path: str):
+    """pyarrow.Table yang di-memory-map dari file .arrow, atau None jika belum ada di cache."""
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        os.utime(path)  # penanda "baru dipakai" untuk eviksi
+        return ipc.open_file(pa.memory_map(path, "r")).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
@@ -0,0 +1,305 @@
+"""
+Kompres PDF (pengurangan ukuran sebenarnya, bukan sekadar rewrite).
+Tahapan:
+  1. images  - downsample gambar ke target DPI dan re-encode ke JPEG (quality)
+  2. dedupe  - gabungkan stream/font/ExtGState yang identik menjadi satu objek
+  3. flate   - kompres stream yang belum terkompres (content stream, dsb.) dengan FlateDecode
+  4. objstm  - kemas objek ke object streams (butuh `pikepdf`, opsional)
+Setiap tahap dilaporkan berapa byte yang dihemat.
+"""
+
+import hashlib
+import io
+import zlib
+
+from .spool import open_source
+
+PdfReader = PdfWriter = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import (
+        ArrayObject,
+        DictionaryObject,
+        IndirectObject,
+        NameObject,
+        NullObject,
+        NumberObject,
+        StreamObject,
+    )
+except Exception:
+    pass
+
+pikepdf = None
+try:
+    import pikepdf
+except Exception:
+    pass
+PIKEPDF_AVAILABLE = pikepdf is not None
+
+from PIL import Image
+
+COMPRESS_STAGES = ("images", "dedupe", "flate", "objstm")
+
+# Tipe dictionary non-stream yang aman digabung jika isinya identik
+DEDUPE_DICT_TYPES = {"/Font", "/FontDescriptor", "/Encoding", "/ExtGState"}
+
+# Gambar di bawah ukuran ini tidak sebanding dengan biaya decode/encode
+MIN_IMAGE_BYTES = 4096
+
+# Stream lebih kecil dari ini tidak perlu di-Flate
+MIN_FLATE_BYTES = 64
+
+
+class _CountingSink:
+    """Stream tiruan untuk mengukur ukuran output PdfWriter tanpa menyimpan datanya."""
+
+    def __init__(self):
+        self.pos = 0
+
+    def write(self, data):
+        self.pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.pos
+
+
+def _written_size(writer) -> int:
+    sink = _CountingSink()
+    writer.write(sink)
+    return sink.pos
+
+
+def _filters(obj) -> list:
+    f = obj.get("/Filter")
+    if f is None:
+        return []
+    if isinstance(f, ArrayObject):
+        return [str(x) for x in f]
+    return [str(f)]
+
+
+def _colorspace_mode(obj):
+    """Mode PIL untuk colorspace sederhana (RGB/Gray), None jika tidak didukung."""
+    cs = obj.get("/ColorSpace")
+    if isinstance(cs, ArrayObject) and len(cs) > 1 and str(cs[0]) == "/ICCBased":
+        n = cs[1].get_object().get("/N", 3)
+        return {1: "L", 3: "RGB"}.get(int(n))
+    return {"/DeviceRGB": "RGB", "/DeviceGray": "L"}.get(str(cs))
+
+
+def _decode_image(obj):
+    """Decode image XObject ke PIL.Image. None jika format tidak aman untuk diubah."""
+    if obj.get("/ImageMask") or "/Decode" in obj or int(obj.get("/BitsPerComponent", 8)) != 8:
+        return None
+    mode = _colorspace_mode(obj)
+    if mode is None:
+        return None
+    filters = _filters(obj)
+    if filters == ["/DCTDecode"]:
+        img = Image.open(io.BytesIO(obj._data))
+        img.load()
+        return img if img.mode in ("RGB", "L") else None
+    if any(f in ("/DCTDecode", "/JPXDecode", "/CCITTFaxDecode", "/JBIG2Decode") for f in filters):
+        return None
+    w, h = int(obj["/Width"]), int(obj["/Height"])
+    data = obj.get_data()
+    if len(data) < w * h * len(mode):
+        return None
+    return Image.frombytes(mode, (w, h), data[: w * h * len(mode)])
+
+
+def _page_images(writer):
+    """Memetakan idnum image XObject -> (lebar, tinggi) halaman dalam point, termasuk di dalam Form XObject."""
+    sizes = {}
+    for page in writer.pages:
+        box = page.mediabox
+        size = (float(box.width), float(box.height))
+        stack = [page.get("/Resources")]
+        seen = set()
+        while stack:
+            res = stack.pop()
+            res = res.get_object() if res is not None else None
+            if not isinstance(res, DictionaryObject):
+                continue
+            xobjs = res.get("/XObject")
+            xobjs = xobjs.get_object() if xobjs is not None else None
+            if not isinstance(xobjs, DictionaryObject):
+                continue
+            for ref in dict.values(xobjs):
+                if not isinstance(ref, IndirectObject) or ref.idnum in seen:
+                    continue
+                seen.add(ref.idnum)
+                x = ref.get_object()
+                if x.get("/Subtype") == "/Image":
+                    sizes.setdefault(ref.idnum, size)
+                elif x.get("/Subtype") == "/Form":
+                    stack.append(x.get("/Resources"))
+    return sizes
+
+
+def _stage_images(writer, target_dpi: int, quality: int) -> int:
+    """Downsample + re-encode JPEG. Mengembalikan jumlah gambar yang diganti."""
+    changed = 0
+    for idnum, (page_w, page_h) in _page_images(writer).items():
+        obj = writer._objects[idnum - 1]
+        if not isinstance(obj, StreamObject) or len(obj._data) < MIN_IMAGE_BYTES:
+            continue
+        try:
+            img = _decode_image(obj)
+        except Exception:
+            img = None
+        if img is None:
+            continue
+        # Estimasi DPI konservatif: anggap gambar dipakai selebar/setinggi halaman
+        est_dpi = min(img.width / (page_w / 72.0), img.height / (page_h / 72.0))
+        scale = target_dpi / est_dpi if est_dpi > 0 else 1.0
+        if scale < 0.9:
+            img = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality, optimize=True)
+        new = buf.getvalue()
+        if len(new) >= len(obj._data) * 0.95:
+            continue
+        obj._data = new
+        if hasattr(obj, "decoded_self"):
+            obj.decoded_self = None
+        obj[NameObject("/Filter")] = NameObject("/DCTDecode")
+        obj[NameObject("/Width")] = NumberObject(img.width)
+        obj[NameObject("/Height")] = NumberObject(img.height)
+        obj[NameObject("/BitsPerComponent")] = NumberObject(8)
+        obj[NameObject("/ColorSpace")] = NameObject("/DeviceRGB" if img.mode == "RGB" else "/DeviceGray")
+        if "/DecodeParms" in obj:
+            del obj["/DecodeParms"]
+        changed += 1
+    return changed
+
+
+def _remap_refs(obj, mapping: dict, writer):
+    """Ganti referensi objek duplikat ke objek kanonik (rekursif di dalam dict/array)."""
+    if isinstance(obj, DictionaryObject):
+        items = list(dict.items(obj))
+    elif isinstance(obj, ArrayObject):
+        items = list(enumerate(obj))
+    else:
+        return
+    for key, value in items:
+        if isinstance(value, IndirectObject):
+            if value.idnum in mapping:
+                value = IndirectObject(mapping[value.idnum], 0, writer)
+                if isinstance(obj, DictionaryObject):
+                    dict.__setitem__(obj, key, value)
+                else:
+                    list.__setitem__(obj, key, value)
+        else:
+            _remap_refs(value, mapping, writer)
+
+
+def _object_digest(obj) -> bytes:
+    buf = io.BytesIO()
+    obj.write_to_stream(buf, None)
+    return hashlib.sha1(buf.getvalue()).digest()
+
+
+def _stage_dedupe(writer) -> int:
+    """Menggabungkan objek identik. Diulang agar font yang identik setelah stream-nya digabung ikut tergabung."""
+    removed = 0
+    for _ in range(3):
+        canonical, mapping = {}, {}
+        for idnum, obj in enumerate(writer._objects, 1):
+            if isinstance(obj, StreamObject):
+                if obj.get("/Type") in ("/XRef", "/ObjStm", "/Metadata"):
+                    continue
+            elif not (isinstance(obj, DictionaryObject) and obj.get("/Type") in DEDUPE_DICT_TYPES):
+                continue
+            key = _object_digest(obj)
+            if key in canonical:
+                mapping[idnum] = canonical[key]
+            else:
+                canonical[key] = idnum
+        if not mapping:
+            break
+        for obj in writer._objects:
+            _remap_refs(obj, mapping, writer)
+        for idnum in mapping:
+            # Nomor objek tetap dipertahankan (xref PyPDF2 butuh urutan utuh), isinya dikosongkan
+            writer._objects[idnum - 1] = NullObject()
+        removed += len(mapping)
+    return removed
+
+
+def _stage_flate(writer) -> int:
+    """FlateDecode untuk stream tanpa filter. Mengembalikan jumlah stream yang dikompres."""
+    changed = 0
+    for obj in writer._objects:
+        if not isinstance(obj, StreamObject) or "/Filter" in obj or obj.get("/Type") == "/Metadata":
+            continue
+        data = obj._data
+        if len(data) < MIN_FLATE_BYTES:
+            continue
+        packed = zlib.compress(data, 9)
+        if len(packed) < len(data):
+            obj._data = packed
+            obj[NameObject("/Filter")] = NameObject("/FlateDecode")
+            changed += 1
+    return changed
+
+
+def _stage_objstm(pdf_bytes: bytes) -> bytes:
+    """Mengemas objek ke object streams lewat pikepdf (qpdf)."""
+    out = io.BytesIO()
+    with pikepdf.open(io.BytesIO(pdf_bytes)) as pdf:
+        pdf.save(out, object_stream_mode=pikepdf.ObjectStreamMode.generate, compress_streams=True)
+    return out.getvalue()
+
+
+def compress_pdf(source, target_dpi: int = 150, quality: int = 70, stages=COMPRESS_STAGES, progress=None):
+    """
+    Mengompres PDF (path/bytes/file-like).
+    Mengembalikan (bytes_pdf, laporan) dengan laporan berupa list dict:
+    {"stage", "size", "saved", "detail"} untuk setiap tahap.
+    """
+    if PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+    reader = PdfReader(open_source(source))
+    writer = PdfWriter()
+    for p in reader.pages:
+        writer.add_page(p)
+
+    size = _written_size(writer)
+    report = [{"stage": "rewrite", "size": size, "saved": 0, "detail": f"{len(writer.pages)} halaman"}]
+
+    def record(stage, detail):
+        nonlocal size
+        new_size = _written_size(writer)
+        report.append({"stage": stage, "size": new_size, "saved": size - new_size, "detail": detail})
+        size = new_size
+
+    if "images" in stages:
+        if progress: progress("images")
+        n = _stage_images(writer, target_dpi, quality)
+        record("images", f"{n} gambar di-downsample/re-encode ({target_dpi} DPI, q{quality})")
+    if "dedupe" in stages:
+        if progress: progress("dedupe")
+        n = _stage_dedupe(writer)
+        record("dedupe", f"{n} objek duplikat digabung")
+    if "flate" in stages:
+        if progress: progress("flate")
+        n = _stage_flate(writer)
+        record("flate", f"{n} stream dikompres")
+
+    buf = io.BytesIO(); writer.write(buf)
+    data = buf.getvalue()
+
+    if "objstm" in stages:
+        if progress: progress("objstm")
+        if pikepdf is None:
+            report.append({"stage": "objstm", "size": len(data), "saved": 0, "detail": "dilewati (pikepdf tidak terinstall)"})
+        else:
+            packed = _stage_objstm(data)
+            if len(packed) < len(data):
+                report.append({"stage": "objstm", "size": len(packed), "saved": len(data) - len(packed), "detail": "object streams dibuat"})
+                data = packed
+            else:
+                report.append({"stage": "objstm", "size": len(data), "saved": 0, "detail": "tidak lebih kecil, dilewati"})
+    return data, report
@@ -0,0 +1,127 @@
+"""
+Profil data MCU untuk dashboard, dihitung sekali per upload.
+Setiap kolom di-factorize satu kali: normalisasi (strip + huruf besar) hanya dilakukan pada
+nilai unik, kardinalitas dan jumlah per nilai dihitung dari kode (bincount), lalu kolom disimpan
+sebagai dtype category. Grafik, filter dan export memakai profil yang sama; filter berupa
+perbandingan kode integer, bukan perbandingan string.
+"""
+
+import numpy as np
+
+from .cache import content_hash
+from .columnar import PYARROW_AVAILABLE
+from .ingest import read_table, read_table_columnar
+from .parsed import parsed_cache
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+# Kolom kategorikal untuk filter: 2..PROFILE_MAX_CATEGORIES nilai unik (setelah normalisasi)
+PROFILE_MAX_CATEGORIES = 50
+
+# Kolom yang namanya mengandung kata ini dianggap kolom status/hasil MCU
+STATUS_KEYWORDS = ("status", "fit", "hasil")
+
+MISSING_LABEL = "TIDAK DIKETAHUI"
+COUNT_COLUMN = "Jumlah"
+
+
+def normalize_column_names(columns) -> list:
+    """Hapus karakter selain huruf/angka/underscore dan jadikan huruf kecil."""
+    return pd.Index([str(c) for c in columns]).str.replace("[^A-Za-z0-9_]+", "", regex=True).str.lower().tolist()
+
+
+def _encode(series) -> tuple:
+    """(Categorical ternormalisasi, jumlah per kategori, ada_nilai_kosong) dalam satu kali factorize kolom."""
+    codes, uniques = pd.factorize(series)
+    labels = pd.Index(uniques).astype(str).str.strip().str.upper()
+    label_codes, categories = pd.factorize(labels)
+    missing = codes < 0
+    has_missing = bool(missing.any())
+    # Kode -1 (kosong) tidak boleh dipakai sebagai indeks (akan menunjuk label terakhir)
+    codes = label_codes[np.where(missing, 0, codes)] if len(uniques) else codes.copy()
+    categories = list(categories)
+    if has_missing:
+        codes[missing] = len(categories)
+        categories.append(MISSING_LABEL)
+    counts = np.bincount(codes, minlength=len(categories))
+    return pd.Categorical.from_codes(codes, categories=categories), counts, has_missing
+
+
+class TableProfile:
+    """
+    DataFrame yang sudah dinormalisasi beserta hasil profiling per kolom.
+    - df: kolom status/kategorikal bertipe category, kolom lain apa adanya
+    - status_columns / filter_columns: kandidat untuk analisis status dan filter
+    - cardinality: {kolom: jumlah nilai unik} untuk kolom yang di-encode
+    """
+
+    def __init__(self, df, status_columns: list, filter_columns: list, counts: dict):
+        self.df = df
+        self.status_columns = status_columns
+        self.filter_columns = filter_columns
+        self._counts = counts
+        self.cardinality = {col: len(c) for col, c in counts.items()}
+        self.doc_key = None  # hash isi file sumber (diisi cached_profile)
+
+    def counts(self, column: str):
+        """DataFrame [kolom, Jumlah] terurut dari jumlah terbesar."""
+        return self._counts[column].copy()
+
+    def categories(self, column: str) -> list:
+        return self._counts[column][column].tolist()
+
+    def filter(self, column: str, value):
+        """Baris dengan `column` == value, lewat perbandingan kode kategori."""
+        cat = self.df[column].cat
+        try:
+            code = cat.categories.get_loc(value)
+        except KeyError:
+            return self.df.iloc[0:0]
+        return self.df[cat.codes.to_numpy() == code]
+
+
+def profile_table(df, max_categories: int = PROFILE_MAX_CATEGORIES, status_keywords=STATUS_KEYWORDS) -> TableProfile:
+    """Normalisasi nama kolom, encode kolom status/kategorikal ke category, dan hitung jumlah per nilai."""
+    df = df.copy()
+    df.columns = normalize_column_names(df.columns)
+    status_columns = [c for c in df.columns if any(k in c for k in status_keywords)]
+    filter_columns = []
+    counts = {}
+    for col in df.columns:
+        series = df[col]
+        is_text = pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+        if col not in status_columns and not is_text:
+            continue
+        categorical, col_counts, has_missing = _encode(series)
+        # Seperti nunique(): nilai kosong tidak dihitung sebagai nilai unik
+        n_values = len(col_counts) - has_missing
+        is_filter = is_text and 1 < n_values <= max_categories
+        if col not in status_columns and not is_filter:
+            continue
+        df[col] = categorical
+        order = np.argsort(-col_counts, kind="stable")
+        counts[col] = pd.DataFrame({
+            col: pd.Index(categorical.categories)[order],
+            COUNT_COLUMN: col_counts[order],
+        })
+        if is_filter:
+            filter_columns.append(col)
+    return TableProfile(df, status_columns, filter_columns, counts)
+
+
+def cached_profile(source, name: str = None, doc_key: str = None,
+                   max_categories: int = PROFILE_MAX_CATEGORIES) -> TableProfile:
+    """Profil upload (Excel/CSV) dengan cache per isi file; dihitung ulang hanya untuk file baru."""
+    doc_key = doc_key or content_hash(source)
+    key = (doc_key, "profile", max_categories)
+    cache = parsed_cache()
+    profile = cache.get(key)
+    if profile is None:
+        loader = read_table_columnar if PYARROW_AVAILABLE else read_table
+        profile = profile_table(loader(source, name, doc_key), max_categories)
+        profile.doc_key = doc_key
+        cache.put(key, profile, int(profile.df.memory_usage(deep=True).sum()) + 1024)
+    return profile
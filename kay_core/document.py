@@ -0,0 +1,137 @@
+"""
+Teks PDF per halaman -> dokumen: .txt, tabel (page, text), Word (.docx), dan alur terjemahan
+(perapian tata letak -> terjemahan per paragraf -> Word dengan page break per halaman).
+Input berupa hasil extract_page_texts()/cached_extraction(): list (halaman, teks, detik).
+"""
+
+from .spool import new_spool
+from .translate import make_backend, translate_segments
+
+Document = None
+try:
+    from docx import Document
+except Exception:
+    pass
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+DOCX_AVAILABLE = Document is not None
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Penanda pergantian halaman di antara paragraf hasil layout_paragraphs()
+PAGE_BREAK_MARKER = "---HALAMAN BARU---"
+
+# Baris yang lebih pendek dari ini (dan tidak diakhiri titik) dianggap label/sel tabel dan digabung
+LAYOUT_MAX_LINE_LENGTH = 100
+
+
+def _require_docx():
+    if Document is None:
+        raise RuntimeError("python-docx tidak terinstall (pip install python-docx)")
+
+
+def _save_docx(doc, out=None):
+    out = out if out is not None else new_spool()
+    doc.save(out)
+    out.seek(0)
+    return out
+
+
+def page_texts_to_text(results: list) -> str:
+    """Format unduhan .txt: blok '--- Page N ---' per halaman."""
+    return "\n".join(f"--- Page {p} ---\n" + t for p, t, _ in results)
+
+
+def page_texts_frame(results: list):
+    """DataFrame [page, text] satu baris per halaman."""
+    return pd.DataFrame([{"page": p, "text": t} for p, t, _ in results], columns=["page", "text"])
+
+
+def page_texts_to_docx(results: list, out=None):
+    """Word dengan satu paragraf per halaman. Mengembalikan file output (posisi di awal)."""
+    _require_docx()
+    doc = Document()
+    for _, text, _ in results:
+        doc.add_paragraph(text)
+    return _save_docx(doc, out)
+
+
+def _merge_short_lines(lines: list) -> list:
+    """Menggabungkan baris-baris pendek yang berdekatan, mengasumsikan itu adalah item daftar atau sel tabel."""
+    blocks = []
+    current = ""
+    for line in lines:
+        stripped = line.strip()
+        if stripped == "":
+            # Baris kosong yang sebenarnya menandakan akhir paragraf
+            if current:
+                blocks.append(current)
+            blocks.append("")  # Jaga pemisah yang jelas
+            current = ""
+            continue
+        if len(stripped) < LAYOUT_MAX_LINE_LENGTH and not stripped.endswith("."):
+            # Baris pendek (mungkin label/nilai): gabungkan ke blok saat ini dengan pemisah "|"
+            current = f"{current} | {stripped}" if current else stripped
+        else:
+            # Baris panjang (paragraf utuh)
+            if current:
+                blocks.append(current)
+            blocks.append(stripped)
+            current = ""
+    if current:
+        blocks.append(current)
+    # Hapus spasi ganda yang berlebihan setelah penggabungan
+    return [b.replace("  ", " ").strip() for b in blocks if b.strip() or b == ""]
+
+
+def layout_paragraphs(page_texts) -> list:
+    """
+    Teks per halaman -> paragraf yang dirapikan (baris pendek berdekatan digabung dengan ' | ').
+    Tiap halaman diakhiri PAGE_BREAK_MARKER; string kosong menandai batas paragraf asli.
+    """
+    lines = []
+    for text in page_texts:
+        lines.extend(text.split("\n"))
+        lines.append(PAGE_BREAK_MARKER)
+    return _merge_short_lines(lines)
+
+
+def is_content_paragraph(paragraph: str) -> bool:
+    return paragraph not in (PAGE_BREAK_MARKER, "") and paragraph.strip() != ""
+
+
+def paragraphs_text(paragraphs: list) -> str:
+    """Paragraf berisi (tanpa penanda halaman/pemisah) digabung dengan baris kosong."""
+    return "\n\n".join(p for p in paragraphs if is_content_paragraph(p))
+
+
+def translate_paragraphs(paragraphs: list, backend: str = "google", source: str = "auto", target: str = "en",
+                         memory=None, chunk_size: int = 4500, progress=None, **schedule) -> tuple:
+    """
+    Menerjemahkan hasil layout_paragraphs() per paragraf (penanda halaman dan pemisah tidak dikirim).
+    Paragraf yang gagal setelah semua retry memakai teks asli. `schedule`: workers, rate, max_retries, timeout, ...
+    Mengembalikan (paragraf_terjemahan, stats) dengan urutan sama seperti input.
+    """
+    translated, stats = translate_segments(
+        paragraphs, make_backend(backend, source=source, target=target),
+        memory=memory, engine=backend, source=source, target=target, chunk_size=chunk_size,
+        should_translate=is_content_paragraph, on_fail="keep", progress=progress, **schedule,
+    )
+    return [p if p in (PAGE_BREAK_MARKER, "") else p.strip() for p in translated], stats
+
+
+def paragraphs_to_docx(paragraphs: list, out=None):
+    """Word dari paragraf: PAGE_BREAK_MARKER menjadi page break. Mengembalikan file output (posisi di awal)."""
+    _require_docx()
+    doc = Document()
+    for item in "\n\n".join(paragraphs).split("\n\n"):
+        item = item.strip()
+        if item == PAGE_BREAK_MARKER:
+            doc.add_page_break()
+        elif item:
+            doc.add_paragraph(item)
+    return _save_docx(doc, out)
@@ -0,0 +1,111 @@
+"""
+Export DataFrame ke Excel/CSV/Parquet dengan memori konstan.
+Excel ditulis dengan workbook openpyxl write-only (baris di-stream ke XML sementara, tanpa
+object tree per sel) per potongan baris, ke spooled temp file. CSV dan Parquet jauh lebih cepat
+dan kecil untuk frame besar.
+"""
+
+from .columnar import arrow_safe
+from .spool import new_spool
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+Workbook = ILLEGAL_CHARACTERS_RE = None
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+except Exception:
+    pass
+
+pa = pq = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pass
+
+# format -> (ekstensi, MIME type)
+EXPORT_FORMATS = {
+    "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": (".csv", "text/csv"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# Jumlah baris yang dikonversi ke nilai Python sekaligus saat menulis Excel
+EXPORT_CHUNK_ROWS = 20_000
+
+# Batas baris satu sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def available_export_formats() -> list:
+    formats = ["xlsx", "csv"]
+    if pq is not None:
+        formats.append("parquet")
+    return formats
+
+
+def _excel_values(series) -> list:
+    """Nilai kolom sebagai list Python yang aman untuk openpyxl (NaN/NaT -> None, karakter kontrol dibuang)."""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        # Excel tidak mendukung zona waktu
+        series = series.dt.tz_localize(None)
+    if pd.api.types.is_string_dtype(series.dtype) and not pd.api.types.is_object_dtype(series.dtype):
+        series = series.str.replace(ILLEGAL_CHARACTERS_RE.pattern, "", regex=True)
+        return series.astype(object).where(series.notna(), None).tolist()
+    values = series.astype(object).where(series.notna(), None).tolist()
+    if pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype):
+        values = [ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v for v in values]
+    return values
+
+
+def write_excel(df, out=None, sheet_name: str = "Sheet1"):
+    """DataFrame -> xlsx (tanpa index) secara streaming. Mengembalikan file output (posisi di awal)."""
+    if Workbook is None:
+        raise RuntimeError("openpyxl tidak terinstall (pip install openpyxl)")
+    if len(df) + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df)} baris melebihi batas satu sheet Excel ({EXCEL_MAX_ROWS - 1}); gunakan CSV/Parquet.")
+    out = out if out is not None else new_spool()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append([str(c) for c in df.columns])
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        columns = [_excel_values(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        for row in zip(*columns):
+            ws.append(row)
+    wb.save(out)
+    out.seek(0)
+    return out
+
+
+def write_csv(df, out=None):
+    """DataFrame -> CSV UTF-8 dengan BOM (agar Excel membaca huruf non-ASCII dengan benar)."""
+    out = out if out is not None else new_spool()
+    df.to_csv(out, index=False, encoding="utf-8-sig")
+    out.seek(0)
+    return out
+
+
+def write_parquet(df, out=None):
+    """DataFrame -> Parquet (kompresi zstd). Kolom object campuran disimpan sebagai teks."""
+    if pq is None:
+        raise RuntimeError("pyarrow tidak terinstall (pip install pyarrow)")
+    out = out if out is not None else new_spool()
+    table = pa.Table.from_pandas(arrow_safe(df.copy(deep=False)), preserve_index=False)
+    pq.write_table(table, out, compression="zstd")
+    out.seek(0)
+    return out
+
+
+_WRITERS = {"xlsx": write_excel, "csv": write_csv, "parquet": write_parquet}
+
+
+def export_dataframe(df, fmt: str = "xlsx", out=None):
+    """Export ke format `fmt` (lihat EXPORT_FORMATS). Mengembalikan spool output (posisi di awal)."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format export tidak dikenal: {fmt} (pilihan: {', '.join(EXPORT_FORMATS)})")
+    return _WRITERS[fmt](df, out)
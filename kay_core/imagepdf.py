@@ -0,0 +1,156 @@
+"""
+Gambar -> PDF secara streaming.
+Gambar ditambahkan satu per satu dan langsung ditulis ke output. JPEG disisipkan apa adanya
+sebagai stream /DCTDecode (tanpa decode/encode ulang); hanya format lain yang di-decode
+dan disimpan sebagai stream /FlateDecode (lossless). Pemakaian RAM tidak bertambah seiring jumlah gambar.
+"""
+
+import io
+import zlib
+
+from .merge import StreamingPdfMerger
+from .spool import source_bytes
+
+Image = None
+try:
+    from PIL import Image
+except Exception:
+    pass
+
+try:
+    from PyPDF2.generic import (
+        ArrayObject,
+        DictionaryObject,
+        FloatObject,
+        IndirectObject,
+        NameObject,
+        NumberObject,
+        StreamObject,
+    )
+except Exception:
+    pass
+
+# Ukuran halaman dalam point (1/72 inci); "image" = mengikuti ukuran gambar pada DPI yang dipilih
+PAGE_SIZES = {"image": None, "A4": (595.28, 841.89), "Letter": (612.0, 792.0), "Legal": (612.0, 1008.0)}
+
+# fit: muat utuh di halaman; fill: penuhi halaman (kelebihan dipotong); original: ukuran asli pada DPI
+FIT_MODES = ("fit", "fill", "original")
+
+_JPEG_COLORSPACES = {"L": "/DeviceGray", "RGB": "/DeviceRGB", "CMYK": "/DeviceCMYK"}
+
+
+def _layout(img_w: float, img_h: float, page_size: str, fit: str) -> tuple:
+    """(lebar_halaman, tinggi_halaman, x, y, lebar_gambar, tinggi_gambar) dalam point."""
+    size = PAGE_SIZES[page_size]
+    if size is None:
+        return img_w, img_h, 0.0, 0.0, img_w, img_h
+    page_w, page_h = size
+    if (img_w > img_h) != (page_w > page_h):
+        # Orientasi halaman mengikuti gambar (landscape/portrait)
+        page_w, page_h = page_h, page_w
+    if fit == "original":
+        scale = 1.0
+    elif fit == "fill":
+        scale = max(page_w / img_w, page_h / img_h)
+    else:
+        scale = min(page_w / img_w, page_h / img_h)
+    w, h = img_w * scale, img_h * scale
+    return page_w, page_h, (page_w - w) / 2, (page_h - h) / 2, w, h
+
+
+def _image_stream(data: bytes) -> tuple:
+    """
+    (StreamObject XObject, lebar_px, tinggi_px, passthrough).
+    JPEG L/RGB/CMYK -> data asli sebagai /DCTDecode; lainnya -> RGB/L mentah dikompres Flate.
+    """
+    im = Image.open(io.BytesIO(data))  # hanya membaca header
+    obj = StreamObject()
+    passthrough = im.format == "JPEG" and im.mode in _JPEG_COLORSPACES
+    if passthrough:
+        mode = im.mode
+        obj._data = data
+        obj[NameObject("/Filter")] = NameObject("/DCTDecode")
+        if mode == "CMYK":
+            # JPEG CMYK umumnya disimpan terbalik (Adobe); sama seperti PdfImagePlugin Pillow
+            obj[NameObject("/Decode")] = ArrayObject([NumberObject(1), NumberObject(0)] * 4)
+    else:
+        mode = "L" if im.mode in ("1", "L") else "RGB"
+        im = im.convert(mode)
+        obj._data = zlib.compress(im.tobytes(), 6)
+        obj[NameObject("/Filter")] = NameObject("/FlateDecode")
+    obj.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Image"),
+        NameObject("/Width"): NumberObject(im.width),
+        NameObject("/Height"): NumberObject(im.height),
+        NameObject("/ColorSpace"): NameObject(_JPEG_COLORSPACES[mode]),
+        NameObject("/BitsPerComponent"): NumberObject(8),
+    })
+    return obj, im.width, im.height, passthrough
+
+
+class ImagePdfBuilder:
+    """Penulis PDF dari gambar, satu halaman per gambar, ditulis bertahap ke `out`."""
+
+    def __init__(self, out=None, page_size: str = "image", fit: str = "fit", dpi: int = 72):
+        if Image is None:
+            raise RuntimeError("Pillow tidak terinstall (pip install Pillow)")
+        if page_size not in PAGE_SIZES:
+            raise ValueError(f"Ukuran halaman tidak dikenal: {page_size} (pilihan: {', '.join(PAGE_SIZES)})")
+        if fit not in FIT_MODES:
+            raise ValueError(f"Mode fit tidak dikenal: {fit} (pilihan: {', '.join(FIT_MODES)})")
+        self._pdf = StreamingPdfMerger(out)
+        self.page_size = page_size
+        self.fit = fit
+        self.dpi = max(1, int(dpi))
+        self.passthrough_count = 0
+
+    @property
+    def page_count(self) -> int:
+        return self._pdf.page_count
+
+    def add_image(self, source) -> bool:
+        """Menambahkan satu gambar (path/bytes/file-like) sebagai halaman baru. True jika JPEG disisipkan tanpa decode."""
+        xobj, px_w, px_h, passthrough = _image_stream(source_bytes(source))
+        img_id = self._pdf.add_object(xobj)
+        del xobj
+        pt_w, pt_h = px_w * 72.0 / self.dpi, px_h * 72.0 / self.dpi
+        page_w, page_h, x, y, w, h = _layout(pt_w, pt_h, self.page_size, self.fit)
+        # Clip ke halaman agar mode fill/original tidak menggambar di luar MediaBox
+        content = StreamObject()
+        content._data = (
+            f"q 0 0 {page_w:.2f} {page_h:.2f} re W n "
+            f"{w:.4f} 0 0 {h:.4f} {x:.4f} {y:.4f} cm /Im0 Do Q"
+        ).encode()
+        content_id = self._pdf.add_object(content)
+
+        page = DictionaryObject()
+        page.update({
+            NameObject("/Type"): NameObject("/Page"),
+            NameObject("/MediaBox"): ArrayObject([FloatObject(0), FloatObject(0), FloatObject(round(page_w, 2)), FloatObject(round(page_h, 2))]),
+            NameObject("/Resources"): DictionaryObject({
+                NameObject("/XObject"): DictionaryObject({NameObject("/Im0"): IndirectObject(img_id, 0, None)}),
+            }),
+            NameObject("/Contents"): IndirectObject(content_id, 0, None),
+        })
+        self._pdf.add_page_object(page)
+        self.passthrough_count += passthrough
+        return passthrough
+
+    def finish(self):
+        """Menulis page tree, xref dan trailer. Mengembalikan file output (posisi di awal)."""
+        return self._pdf.finish()
+
+
+def images_to_pdf(sources, out=None, page_size: str = "image", fit: str = "fit", dpi: int = 72, progress=None):
+    """
+    Gambar (list path/bytes/file-like) -> satu PDF, satu halaman per gambar.
+    `progress(selesai, total)` per gambar. Mengembalikan (file_pdf, jumlah_halaman, jumlah_jpeg_passthrough).
+    """
+    sources = list(sources)
+    builder = ImagePdfBuilder(out, page_size, fit, dpi)
+    for i, src in enumerate(sources, 1):
+        builder.add_image(src)
+        if progress:
+            progress(i, len(sources))
+    return builder.finish(), builder.page_count, builder.passthrough_count
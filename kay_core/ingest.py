@@ -0,0 +1,135 @@
+"""
+Pembacaan upload Excel/CSV/JSON untuk semua tool.
+- Excel: engine calamine (Rust, python-calamine) jika terinstall, jika tidak openpyxl (read-only).
+- CSV/TXT: engine pyarrow (multi-thread) jika tersedia, fallback ke parser C pandas.
+- `columns`: tool yang tahu kolom yang dibutuhkan hanya memuat kolom tersebut.
+- Cache per hash isi file: di memori (LRU bersama) dan, untuk tabel lengkap, file Arrow
+  di disk yang di-memory-map (lihat columnar.py).
+"""
+
+import io
+import os
+import threading
+
+from .cache import content_hash
+from .columnar import (
+    PYARROW_AVAILABLE, columnar_path, evict_columnar_cache, frame_to_arrow, open_columnar, write_columnar,
+)
+from .parsed import parsed_cache
+from .spool import source_bytes
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+CALAMINE_AVAILABLE = False
+try:
+    import python_calamine  # noqa: F401  (engine="calamine" di pandas >= 2.2)
+    CALAMINE_AVAILABLE = True
+except Exception:
+    pass
+
+EXCEL_ENGINE = "calamine" if CALAMINE_AVAILABLE else "openpyxl"
+CSV_ENGINE = "pyarrow" if PYARROW_AVAILABLE else "c"
+
+_WRITE_LOCK = threading.Lock()
+
+
+def table_ext(source, name: str = None) -> str:
+    if name is None:
+        name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    return os.path.splitext(name.lower())[1]
+
+
+def _excel_engine(ext: str):
+    # openpyxl hanya untuk xlsx/xlsm; format lain (xls, ods) dipilih otomatis oleh pandas
+    if CALAMINE_AVAILABLE or ext in (".xlsx", ".xlsm"):
+        return EXCEL_ENGINE
+    return None
+
+
+def _read_csv(data: bytes, columns: list = None):
+    usecols = None
+    if columns is not None:
+        # pyarrow menolak nama kolom yang tidak ada; cocokkan dengan header dulu (hanya baris pertama)
+        header = pd.read_csv(io.BytesIO(data), nrows=0).columns
+        usecols = [c for c in header if c in columns]
+    if CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(io.BytesIO(data), engine="pyarrow", usecols=usecols)
+        except Exception:
+            pass  # CSV tidak rapi (jumlah kolom beda per baris, dsb): parser C lebih toleran
+    return pd.read_csv(io.BytesIO(data), usecols=usecols)
+
+
+def parse_table(source, ext: str, columns=None):
+    """Parsing upload ke DataFrame tanpa cache. `columns`: daftar kolom yang dimuat (yang tidak ada diabaikan)."""
+    data = source_bytes(source)
+    wanted = set(columns) if columns is not None else None
+    if ext in (".csv", ".txt"):
+        return _read_csv(data, wanted)
+    if ext == ".json":
+        df = pd.read_json(io.BytesIO(data))
+        return df[[c for c in df.columns if c in wanted]] if wanted is not None else df
+    usecols = (lambda c: c in wanted) if wanted is not None else None
+    return pd.read_excel(io.BytesIO(data), engine=_excel_engine(ext), usecols=usecols)
+
+
+def columnar_table(source, name: str = None, doc_key: str = None):
+    """
+    pyarrow.Table (memory-mapped) untuk upload Excel/CSV/JSON.
+    Parsing hanya terjadi saat file .arrow untuk hash isi ini belum ada.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow tidak terinstall (pip install pyarrow)")
+    ext = table_ext(source, name)
+    doc_key = doc_key or content_hash(source)
+    path = columnar_path(doc_key, ext)
+    table = open_columnar(path)
+    if table is None:
+        df = parse_table(source, ext)
+        with _WRITE_LOCK:
+            if not os.path.exists(path):
+                write_columnar(df, path)
+        evict_columnar_cache()
+        table = open_columnar(path)
+    return table
+
+
+def read_table_columnar(source, name: str = None, doc_key: str = None, columns: list = None):
+    """
+    DataFrame dari cache kolumnar; `columns` membatasi kolom yang dimuat.
+    Kolom teks tetap berbasis buffer Arrow yang di-memory-map, sehingga murah dibuat ulang tiap rerun.
+    """
+    table = columnar_table(source, name, doc_key)
+    if columns is not None:
+        table = table.select([c for c in table.column_names if c in set(columns)])
+    return table.to_pandas()
+
+
+def read_table(source, name: str = None, doc_key: str = None, columns: list = None):
+    """
+    Membaca Excel/CSV/JSON ke DataFrame dengan cache per isi file.
+    Jika tabel ini sudah ada di cache Arrow (mis. pernah dibuka di dashboard), diambil dari sana.
+    Mengembalikan salinan, sehingga pemanggil bebas mengubah kolom/nilai.
+    Dengan pyarrow, hasil parsing baru dilewatkan konversi yang sama dengan cache Arrow (nama kolom teks,
+    kolom campuran jadi teks), sehingga dtype tidak bergantung pada tool mana yang membaca file lebih dulu.
+    """
+    ext = table_ext(source, name)
+    doc_key = doc_key or content_hash(source)
+    table = open_columnar(columnar_path(doc_key, ext)) if PYARROW_AVAILABLE else None
+    if table is not None:
+        if columns is not None:
+            table = table.select([c for c in table.column_names if c in set(columns)])
+        return table.to_pandas()
+
+    key = (doc_key, "table", ext, tuple(columns) if columns is not None else None)
+    cache = parsed_cache()
+    df = cache.get(key)
+    if df is None:
+        df = parse_table(source, ext, columns)
+        if PYARROW_AVAILABLE:
+            df = frame_to_arrow(df).to_pandas()
+        cache.put(key, df, int(df.memory_usage(deep=True).sum()) + 1024)
+    return df.copy()
@@ -0,0 +1,368 @@
+"""
+Job latar belakang untuk operasi panjang (terjemahan, PDF -> gambar, batch lock, gabung PDF).
+Job dijalankan di thread pool milik proses server (engine di dalamnya tetap memakai process pool),
+sehingga rerun Streamlit / refresh browser tidak membatalkan pekerjaan. Status, progress dan file
+hasil disimpan di job store pada disk (cache_dir("jobs")/<job_id>/), jadi hasil job yang sudah
+selesai bisa diunduh ulang tanpa menghitung ulang, juga setelah server restart.
+
+Parameter job hanya disimpan di memori (bisa berisi password); job.json hanya berisi metadata.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import cache_dir, content_hash
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+ACTIVE_STATES = ("queued", "running")
+
+# Jumlah job yang berjalan bersamaan (tiap job bisa memakai semua core lewat process pool engine)
+JOB_WORKERS = 2
+
+# Job selesai dibuang setelah umur ini atau saat total ukuran job store melewati batas (tertua dulu)
+JOB_MAX_AGE = 7 * 24 * 3600
+JOB_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Progress ditulis ke disk paling sering sekali per interval ini (status di memori selalu terbaru)
+PROGRESS_FLUSH_SECONDS = 1.0
+
+_RECORD_FILE = "job.json"
+
+
+class JobCancelled(Exception):
+    """Dilempar dari JobContext.progress() saat job diminta berhenti."""
+
+
+def _folder_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def job_fingerprint(kind: str, sources=(), secret: str = None, **params) -> str:
+    """
+    Hash jenis job + isi semua input + parameter: job dengan fingerprint sama menghasilkan file yang sama.
+    Dengan `secret` (token owner) dipakai HMAC, sehingga parameter rahasia (mis. password batch lock)
+    tidak bisa ditebak dari fingerprint yang tersimpan di job.json.
+    """
+    h = hmac.new(secret.encode(), kind.encode(), hashlib.sha256) if secret else hashlib.sha256(kind.encode())
+    for src in sources:
+        h.update(content_hash(src).encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _owner_id(owner: str):
+    # Record hanya menyimpan hash token owner: isi job store tidak cukup untuk membuka riwayat atau menjadi kunci HMAC
+    return hashlib.sha256(owner.encode()).hexdigest() if owner is not None else None
+
+
+class JobStore:
+    """Penyimpanan job di disk: satu folder per job berisi job.json, in/ (input sementara) dan out/ (hasil)."""
+
+    def __init__(self, root: str = None):
+        self.root = root or cache_dir("jobs")
+        os.makedirs(self.root, exist_ok=True)
+
+    def folder(self, job_id: str, *parts: str) -> str:
+        return os.path.join(self.root, job_id, *parts)
+
+    def save(self, record: dict):
+        """Menulis job.json secara atomik (temp file + rename)."""
+        path = self.folder(record["id"], _RECORD_FILE)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+
+    def load(self, job_id: str) -> dict:
+        """Record job, atau None jika tidak ada/rusak."""
+        if not job_id or os.sep in job_id or job_id.startswith("."):
+            return None
+        try:
+            with open(self.folder(job_id, _RECORD_FILE), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def records(self) -> list:
+        """Semua record job, terbaru dulu."""
+        out = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                record = self.load(entry.name)
+                if record:
+                    out.append(record)
+        return sorted(out, key=lambda r: r.get("created", 0), reverse=True)
+
+    def delete(self, job_id: str):
+        shutil.rmtree(self.folder(job_id), ignore_errors=True)
+
+    def cleanup(self, max_age: float = JOB_MAX_AGE, max_bytes: int = JOB_MAX_BYTES) -> int:
+        """Membuang job selesai yang kedaluwarsa, lalu yang tertua sampai total <= max_bytes. Mengembalikan jumlah job dibuang."""
+        now = time.time()
+        removed = 0
+        finished = []
+        for record in self.records():
+            if record.get("state") in ACTIVE_STATES:
+                continue
+            if now - (record.get("finished") or record.get("created", now)) > max_age:
+                self.delete(record["id"])
+                removed += 1
+            else:
+                finished.append(record)
+        sizes = {r["id"]: _folder_size(self.folder(r["id"])) for r in finished}
+        total = sum(sizes.values())
+        for record in sorted(finished, key=lambda r: r.get("finished") or 0):
+            if total <= max_bytes:
+                break
+            self.delete(record["id"])
+            total -= sizes[record["id"]]
+            removed += 1
+        return removed
+
+
+class JobContext:
+    """Diberikan ke fungsi job: daftar input, pelaporan progress, dan pembuatan file hasil."""
+
+    def __init__(self, runner, job_id: str, inputs: list):
+        self._runner = runner
+        self.job_id = job_id
+        self.inputs = inputs  # list (nama_asli, path)
+
+    def progress(self, done: int, total: int = None, message: str = None):
+        """Memperbarui progress; melempar JobCancelled jika job dibatalkan."""
+        self._runner._update(self.job_id, done=done, total=total, message=message)
+
+    def output(self, name: str, mime: str = "application/octet-stream"):
+        """File hasil baru (mode w+b) di folder out/ job ini; dicatat di record untuk diunduh."""
+        name = os.path.basename(name.replace("\\", "/")) or "hasil"
+        path = self._runner.store.folder(self.job_id, "out", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._runner._add_result(self.job_id, name, mime)
+        return open(path, "w+b")
+
+
+class JobRunner:
+    """
+    Menjalankan fungsi job `func(ctx, **params)` di thread pool. Fungsi boleh mengembalikan dict
+    ringkasan (disimpan di record, harus bisa di-JSON-kan). Job milik owner yang sama dengan `fingerprint`
+    yang sama dan sudah selesai (hasilnya masih ada) tidak dijalankan ulang: id job lama dikembalikan.
+    """
+
+    def __init__(self, store: JobStore = None, workers: int = JOB_WORKERS):
+        self.store = store or JobStore()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kay-job")
+        self._lock = threading.Lock()
+        self._live = {}  # job_id -> record untuk job di proses ini yang belum selesai
+        self._cancel = set()
+        self._flushed = {}
+        self._mark_interrupted()
+        self.store.cleanup()
+
+    def _mark_interrupted(self):
+        # Job aktif milik proses yang sudah tidak hidup (server restart) tidak akan pernah selesai
+        for record in self.store.records():
+            if record.get("state") in ACTIVE_STATES and record.get("pid") != os.getpid() and not _pid_alive(record.get("pid", 0)):
+                record.update(state="failed", error="Server berhenti sebelum job selesai.", finished=time.time())
+                self.store.save(record)
+
+    def submit(self, kind: str, func, inputs=(), title: str = "", owner: str = None,
+               fingerprint: str = None, **params) -> str:
+        """
+        Mendaftarkan job dan mengembalikan job_id. `inputs`: list (nama, path/bytes/file-like);
+        selain path string, isinya disalin ke folder job sebelum fungsi berjalan (upload boleh dilepas UI).
+        Upload yang sudah di disk (StoredUpload) di-hardlink, bukan disalin.
+        `owner`: token rahasia pemilik (dibuat server, bukan dari input pengguna); job hanya bisa dilihat,
+        dipakai ulang, dibatalkan dan dihapus dengan owner yang sama.
+        """
+        if fingerprint:
+            previous = self.find(fingerprint, owner)
+            if previous:
+                return previous["id"]
+        job_id = uuid.uuid4().hex[:16]
+        in_dir = self.store.folder(job_id, "in")
+        os.makedirs(in_dir, exist_ok=True)
+        staged = []
+        for i, (name, src) in enumerate(inputs):
+            if isinstance(src, str):
+                staged.append((name, src))
+                continue
+            path = os.path.join(in_dir, f"{i:05d}{os.path.splitext(name)[1]}")
+            if isinstance(src, os.PathLike):
+                try:
+                    os.link(os.fspath(src), path)
+                except OSError:
+                    shutil.copyfile(os.fspath(src), path)
+                staged.append((name, path))
+                continue
+            with open(path, "wb") as fh:
+                if isinstance(src, (bytes, bytearray)):
+                    fh.write(src)
+                else:
+                    if hasattr(src, "seek"):
+                        src.seek(0)
+                    shutil.copyfileobj(src, fh, 1024 * 1024)
+            staged.append((name, path))
+        record = {
+            "id": job_id, "kind": kind, "title": title or kind, "owner": _owner_id(owner), "fingerprint": fingerprint,
+            "state": "queued", "done": 0, "total": None, "message": "", "error": None,
+            "created": time.time(), "started": None, "finished": None,
+            "results": [], "summary": {}, "pid": os.getpid(),
+        }
+        with self._lock:
+            self._live[job_id] = record
+        self.store.save(record)
+        self._pool.submit(self._run, job_id, func, staged, params)
+        return job_id
+
+    def _run(self, job_id: str, func, inputs: list, params: dict):
+        ctx = JobContext(self, job_id, inputs)
+        try:
+            self._set(job_id, state="running", started=time.time())
+            if job_id in self._cancel:
+                raise JobCancelled()
+            summary = func(ctx, **params) or {}
+            self._set(job_id, state="done", summary=summary, finished=time.time())
+        except JobCancelled:
+            self._discard_results(job_id)
+            self._set(job_id, state="cancelled", finished=time.time())
+        except Exception as e:
+            self._discard_results(job_id)
+            self._set(job_id, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+        finally:
+            shutil.rmtree(self.store.folder(job_id, "in"), ignore_errors=True)
+            with self._lock:
+                self._live.pop(job_id, None)
+                self._cancel.discard(job_id)
+                self._flushed.pop(job_id, None)
+            self.store.cleanup()
+
+    def _discard_results(self, job_id: str):
+        # Hasil parsial dari job yang gagal/dibatalkan tidak boleh bisa diunduh
+        shutil.rmtree(self.store.folder(job_id, "out"), ignore_errors=True)
+        with self._lock:
+            self._live[job_id]["results"] = []
+
+    def _set(self, job_id: str, **values):
+        with self._lock:
+            record = self._live[job_id]
+            record.update(values)
+            snapshot = dict(record)
+            self._flushed[job_id] = time.monotonic()
+        self.store.save(snapshot)
+
+    def _update(self, job_id: str, done: int, total: int = None, message: str = None):
+        if job_id in self._cancel:
+            raise JobCancelled()
+        with self._lock:
+            record = self._live[job_id]
+            record["done"] = done
+            if total is not None:
+                record["total"] = total
+            if message is not None:
+                record["message"] = message
+            due = time.monotonic() - self._flushed.get(job_id, 0) >= PROGRESS_FLUSH_SECONDS
+            if due:
+                self._flushed[job_id] = time.monotonic()
+                snapshot = dict(record)
+        if due:
+            self.store.save(snapshot)
+
+    def _add_result(self, job_id: str, name: str, mime: str):
+        with self._lock:
+            results = self._live[job_id]["results"]
+            results[:] = [r for r in results if r["name"] != name] + [{"name": name, "mime": mime}]
+
+    def status(self, job_id: str, owner: str = None) -> dict:
+        """
+        Salinan record job (dari memori jika masih berjalan di proses ini), atau None.
+        Jika `owner` diberikan, job milik owner lain dianggap tidak ada.
+        """
+        with self._lock:
+            record = self._live.get(job_id)
+            if record is not None:
+                record = json.loads(json.dumps(record, default=str))
+        if record is None:
+            record = self.store.load(job_id)
+        if record is not None and owner is not None and record.get("owner") != _owner_id(owner):
+            return None
+        return record
+
+    def jobs(self, owner: str = None, limit: int = 20) -> list:
+        """Job terbaru (opsional hanya milik `owner`), status aktif diambil dari memori."""
+        owner_id = _owner_id(owner)
+        records = [r for r in self.store.records() if owner is None or r.get("owner") == owner_id][:limit]
+        return [self.status(r["id"]) or r for r in records]
+
+    def find(self, fingerprint: str, owner: str = None) -> dict:
+        """Job selesai terbaru milik `owner` dengan fingerprint ini yang file hasilnya masih lengkap, atau None."""
+        owner_id = _owner_id(owner)
+        for record in self.store.records():
+            if record.get("owner") != owner_id:
+                continue
+            if record.get("fingerprint") == fingerprint and record.get("state") == "done":
+                if all(os.path.exists(self.result_path(record["id"], r["name"])) for r in record["results"]):
+                    return record
+        return None
+
+    def result_path(self, job_id: str, name: str) -> str:
+        return self.store.folder(job_id, "out", os.path.basename(name))
+
+    def cancel(self, job_id: str, owner: str = None) -> bool:
+        """Meminta job berhenti (berlaku di pemanggilan progress berikutnya). False jika job tidak aktif."""
+        if owner is not None and self.status(job_id, owner) is None:
+            return False
+        with self._lock:
+            if job_id not in self._live:
+                return False
+            self._cancel.add(job_id)
+            return True
+
+    def delete(self, job_id: str, owner: str = None) -> bool:
+        """Menghapus job selesai beserta hasilnya. False jika job masih berjalan (atau milik owner lain)."""
+        if owner is not None and self.status(job_id, owner) is None:
+            return False
+        with self._lock:
+            if job_id in self._live:
+                return False
+        self.store.delete(job_id)
+        return True
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+_RUNNER = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def job_runner() -> JobRunner:
+    """Job runner bersama untuk proses ini (dibuat saat pertama dipakai)."""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            _RUNNER = JobRunner()
+        return _RUNNER
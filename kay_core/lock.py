@@ -0,0 +1,128 @@
+"""
+Batch Lock PDF berdasarkan daftar Excel/CSV.
+Kolom nama file dan password dicari sekali, pencocokan file memakai lookup dict,
+lalu enkripsi dijalankan di process pool dan hasilnya langsung ditulis ke ZipSink.
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import default_workers, imap_unordered_bounded
+from .spool import source_bytes, source_payload
+from .zipsink import as_sink
+
+PdfReader = PdfWriter = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+except Exception:
+    pass
+
+FILENAME_COLUMNS = ("filename", "nama_file")
+PASSWORD_COLUMNS = ("password", "kata_sandi")
+
+# Di bawah jumlah file ini, overhead process pool lebih besar dari manfaatnya
+LOCK_PARALLEL_MIN_FILES = 8
+
+
+def try_encrypt(writer, password: str):
+    """Fungsi untuk enkripsi PDF, menampung try/except"""
+    try:
+        writer.encrypt(password)
+    except TypeError:
+        try:
+            writer.encrypt(user_pwd=password, owner_pwd=None)
+        except Exception:
+            writer.encrypt(user_pwd=password, owner_pwd=password)
+
+
+def encrypt_pdf_bytes(data: bytes, password: str) -> bytes:
+    """PDF (bytes) -> PDF terkunci (bytes)."""
+    reader = PdfReader(io.BytesIO(data))
+    writer = PdfWriter()
+    for p in reader.pages:
+        writer.add_page(p)
+    try_encrypt(writer, password)
+    out = io.BytesIO(); writer.write(out)
+    return out.getvalue()
+
+
+def resolve_lock_columns(columns) -> tuple:
+    """
+    (kolom_nama_file, kolom_password) dari header: 'filename'/'nama_file' dan 'password'/'kata_sandi'
+    (tanpa beda huruf besar/kecil). Jika tidak ada, kolom pertama dan kedua dipakai.
+    """
+    columns = list(columns)
+    target_col = next((c for c in columns if str(c).lower() in FILENAME_COLUMNS), None)
+    pwd_col = next((c for c in columns if str(c).lower() in PASSWORD_COLUMNS), None)
+    if target_col is not None and pwd_col is not None:
+        return target_col, pwd_col
+    if len(columns) < 2:
+        raise ValueError("Excel/CSV butuh kolom filename dan password.")
+    return columns[0], columns[1]
+
+
+def plan_lock_jobs(df, available_names) -> tuple:
+    """
+    Mencocokkan baris Excel dengan file yang diunggah (exact match nama file).
+    Mengembalikan (jobs, not_found): jobs = list (nama_file, password), not_found = list nama di Excel
+    yang tidak ada filenya. Baris dengan nama/password kosong dilewati.
+    """
+    target_col, pwd_col = resolve_lock_columns(df.columns)
+    sub = df[[target_col, pwd_col]].dropna()
+    targets = sub[target_col].astype(str).str.strip()
+    passwords = sub[pwd_col].astype(str).str.strip()
+    names = set(available_names)
+    jobs, not_found = [], []
+    for target, pwd in zip(targets, passwords):
+        if not target or not pwd:
+            continue
+        if target in names:
+            jobs.append((target, pwd))
+        else:
+            not_found.append(target)
+    return jobs, not_found
+
+
+def _lock_job(job: tuple) -> tuple:
+    name, data, password = job
+    try:
+        return name, encrypt_pdf_bytes(source_bytes(data), password), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def iter_locked(jobs: list, sources: dict, workers: int = None):
+    """
+    Generator (nama_file, bytes_terkunci atau None, error atau None) sesuai urutan selesai.
+    `sources`: nama_file -> path/bytes/file-like. Isi file dibaca saat tugas dikirim (path dibaca oleh worker),
+    dengan jumlah tugas yang antre dibatasi.
+    """
+    workers = workers or default_workers()
+    # Upload yang sudah di disk dikirim sebagai path: worker membaca sendiri, proses utama tidak memuatnya
+    payloads = ((name, source_payload(sources[name]), pwd) for name, pwd in jobs)
+    if workers <= 1 or len(jobs) < LOCK_PARALLEL_MIN_FILES:
+        for job in payloads:
+            yield _lock_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from imap_unordered_bounded(ex, _lock_job, payloads, workers * 4)
+
+
+def lock_pdfs_to_zip(jobs: list, sources: dict, out=None, workers: int = None, progress=None):
+    """
+    Mengunci semua PDF dalam `jobs` dan menulis locked_<nama> ke ZipSink.
+    `progress(selesai, total)` per file; `out` boleh berupa DirSink. Mengembalikan (file_zip, jumlah_file, errors)
+    dengan errors = list (nama_file, pesan).
+    """
+    if PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+    errors = []
+    with as_sink(out) as sink:
+        for done, (name, data, err) in enumerate(iter_locked(jobs, sources, workers), 1):
+            if err:
+                errors.append((name, err))
+            else:
+                sink.add(f"locked_{name}", data)
+            if progress:
+                progress(done, len(jobs))
+    return sink.close(), sink.count, errors
@@ -0,0 +1,225 @@
+"""
+Gabung PDF secara streaming (hemat memori).
+Setiap input dibuka satu per satu, halamannya disalin, objeknya langsung ditulis
+ke file output, lalu reader dilepas. Pemakaian RAM tidak bertambah seiring jumlah file.
+"""
+
+import shutil
+
+from .parsed import open_pdf_reader
+from .spool import new_spool, open_source
+
+PdfReader = PdfWriter = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import (
+        ArrayObject,
+        DictionaryObject,
+        IndirectObject,
+        NameObject,
+        NullObject,
+        NumberObject,
+    )
+except Exception:
+    pass
+
+
+def _remap_value(value, mapping: dict):
+    """Ganti referensi IndirectObject sesuai nomor objek baru di file output."""
+    if isinstance(value, IndirectObject):
+        new_id = mapping.get(value.idnum)
+        if new_id is None:
+            return NullObject()
+        return IndirectObject(new_id, 0, None)
+    _remap_refs(value, mapping)
+    return value
+
+
+def _remap_refs(obj, mapping: dict):
+    """Menelusuri objek langsung (dict/array) dan memperbarui semua referensi di dalamnya."""
+    if isinstance(obj, DictionaryObject):  # termasuk StreamObject
+        for key, value in list(dict.items(obj)):
+            dict.__setitem__(obj, key, _remap_value(value, mapping))
+    elif isinstance(obj, ArrayObject):
+        for i, value in enumerate(list(obj)):
+            list.__setitem__(obj, i, _remap_value(value, mapping))
+
+
+def _write_indirect(out, idnum: int, obj):
+    out.write(f"{idnum} 0 obj\n".encode())
+    obj.write_to_stream(out, None)
+    out.write(b"\nendobj\n")
+
+
+def _writer_object_ids(writer) -> list:
+    """Nomor objek milik writer yang perlu ditulis (tanpa page tree, info dan catalog bawaan)."""
+    skip = {writer._pages.idnum, writer._info.idnum, writer._root.idnum}
+    return [i for i, obj in enumerate(writer._objects, 1) if obj is not None and i not in skip]
+
+
+def count_writer_objects(writer) -> int:
+    """Jumlah nomor objek yang akan dipakai write_writer_objects() untuk writer ini."""
+    return len(_writer_object_ids(writer))
+
+
+def write_writer_objects(writer, out, first_id: int, pages_id: int) -> tuple:
+    """
+    Menulis objek writer ke `out` dengan nomor mulai dari `first_id`; /Parent halaman
+    diarahkan ke `pages_id`. Mengembalikan (kids, offsets, next_id) dengan offset
+    relatif terhadap posisi `out.tell()` saat ditulis.
+    """
+    ids = _writer_object_ids(writer)
+    mapping = {writer._pages.idnum: pages_id}
+    for n, idnum in enumerate(ids):
+        mapping[idnum] = first_id + n
+    kids = [mapping[ref.idnum] for ref in writer.get_object(writer._pages)["/Kids"]]
+    offsets = {}
+    for idnum in ids:
+        obj = writer._objects[idnum - 1]
+        _remap_refs(obj, mapping)
+        offsets[mapping[idnum]] = out.tell()
+        _write_indirect(out, mapping[idnum], obj)
+    return kids, offsets, first_id + len(ids)
+
+
+class StreamingPdfMerger:
+    """
+    Penulis PDF gabungan bertahap.
+    Hanya offset xref dan daftar nomor halaman yang ditahan di memori;
+    isi halaman langsung ditulis ke `out` (default: spooled temp file).
+    """
+
+    PAGES_ID = 1
+    CATALOG_ID = 2
+
+    def __init__(self, out=None):
+        if PdfReader is None:
+            raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+        self.out = out if out is not None else new_spool()
+        self._offsets = {}
+        self._kids = []
+        self._next_id = 3
+        self.file_count = 0
+        self.out.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        return len(self._kids)
+
+    def append(self, source, password: str = None) -> int:
+        """Menambahkan semua halaman dari satu PDF (path atau file-like). Mengembalikan jumlah halaman."""
+        reader = PdfReader(open_source(source))
+        if getattr(reader, "is_encrypted", False):
+            reader.decrypt(password or "")
+        writer = PdfWriter()
+        for p in reader.pages:
+            writer.add_page(p)
+        # Halaman sudah di-clone ke writer; reader (dan buffer sumbernya) bisa dilepas
+        del reader
+        n = self._flush(writer)
+        self.file_count += 1
+        return n
+
+    def _flush(self, writer) -> int:
+        """Menulis semua objek milik writer sementara ke output dengan nomor objek baru."""
+        kids, offsets, self._next_id = write_writer_objects(writer, self.out, self._next_id, self.PAGES_ID)
+        self._offsets.update(offsets)
+        self._kids.extend(kids)
+        return len(kids)
+
+    def reserve_ids(self, count: int) -> int:
+        """Memesan `count` nomor objek berurutan untuk bagian yang ditulis proses lain."""
+        first = self._next_id
+        self._next_id += count
+        return first
+
+    def append_part(self, path: str, kids: list, rel_offsets: dict):
+        """
+        Menyalin bagian yang sudah diserialisasi (lihat write_writer_objects) ke output.
+        `rel_offsets` relatif terhadap awal file bagian.
+        """
+        base = self.out.tell()
+        with open(path, "rb") as fh:
+            shutil.copyfileobj(fh, self.out, 1024 * 1024)
+        for idnum, rel in rel_offsets.items():
+            self._offsets[idnum] = base + rel
+        self._kids.extend(kids)
+
+    def add_object(self, obj) -> int:
+        """Menulis satu objek baru langsung ke output. Mengembalikan nomor objeknya."""
+        idnum = self.reserve_ids(1)
+        self._write_object(idnum, obj)
+        return idnum
+
+    def add_page_object(self, page) -> int:
+        """Menulis dictionary halaman (/Parent diarahkan ke page tree) sebagai halaman berikutnya."""
+        page[NameObject("/Parent")] = IndirectObject(self.PAGES_ID, 0, None)
+        idnum = self.add_object(page)
+        self._kids.append(idnum)
+        return idnum
+
+    def _write_object(self, idnum: int, obj):
+        self._offsets[idnum] = self.out.tell()
+        _write_indirect(self.out, idnum, obj)
+
+    def finish(self):
+        """Menulis page tree, catalog, xref dan trailer. Mengembalikan file output (posisi di awal)."""
+        pages = DictionaryObject()
+        pages.update({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Count"): NumberObject(len(self._kids)),
+            NameObject("/Kids"): ArrayObject(IndirectObject(k, 0, None) for k in self._kids),
+        })
+        self._write_object(self.PAGES_ID, pages)
+
+        catalog = DictionaryObject()
+        catalog.update({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): IndirectObject(self.PAGES_ID, 0, None),
+        })
+        self._write_object(self.CATALOG_ID, catalog)
+
+        size = self._next_id
+        xref_pos = self.out.tell()
+        self.out.write(f"xref\n0 {size}\n".encode())
+        self.out.write(b"0000000000 65535 f \n")
+        for idnum in range(1, size):
+            offset = self._offsets.get(idnum)
+            if offset is None:
+                self.out.write(b"0000000000 00000 f \n")
+            else:
+                self.out.write(f"{offset:010d} 00000 n \n".encode())
+        self.out.write(f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\n".encode())
+        self.out.write(f"startxref\n{xref_pos}\n%%EOF\n".encode())
+        self.out.seek(0)
+        return self.out
+
+
+def merge_pdfs_streaming(sources, out=None, progress=None):
+    """
+    Menggabungkan banyak PDF (path/file-like) satu per satu ke `out`.
+    `progress(i)` dipanggil setelah tiap file selesai. Mengembalikan (file_output, jumlah_halaman).
+    """
+    merger = StreamingPdfMerger(out)
+    for i, src in enumerate(sources):
+        merger.append(src)
+        if progress:
+            progress(i + 1)
+    return merger.finish(), merger.page_count
+
+
+def merge_pdfs_in_memory(sources, out=None, progress=None):
+    """
+    Cara lama: semua halaman disalin ke satu PdfWriter di memori (satu reader per file).
+    Lebih cepat untuk sedikit file kecil; untuk ratusan file gunakan merge_pdfs_streaming().
+    """
+    writer = PdfWriter()
+    for i, src in enumerate(sources):
+        for p in open_pdf_reader(src).pages:
+            writer.add_page(p)
+        if progress:
+            progress(i + 1)
+    out = out if out is not None else new_spool()
+    writer.write(out)
+    out.seek(0)
+    return out, len(writer.pages)
@@ -0,0 +1,106 @@
+"""
+Organise by Excel (MCU): rencana struktur folder ZIP dari Excel + PDF yang diunggah.
+Pencocokan No_MCU memakai indeks prefix (list nama terurut + bisect), sehingga tiap baris
+hanya menyentuh nama yang memang diawali No_MCU tersebut, bukan seluruh daftar file.
+"""
+
+from bisect import bisect_left
+
+from .zipsink import as_sink
+
+MCU_COLUMNS = ("No_MCU", "Nama", "Departemen", "JABATAN")
+FOLDER_COLUMNS = ("filename", "target_folder")
+
+
+class PrefixIndex:
+    """Indeks prefix atas nama file. Hasil pencocokan diurutkan sesuai urutan upload."""
+
+    def __init__(self, names):
+        self._order = {}
+        for i, name in enumerate(names):
+            self._order.setdefault(name, i)
+        self._sorted = sorted(self._order)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def matches(self, prefix: str) -> list:
+        """Semua nama yang diawali `prefix` (O(log n + jumlah_hasil))."""
+        i = bisect_left(self._sorted, prefix)
+        found = []
+        while i < len(self._sorted) and self._sorted[i].startswith(prefix):
+            found.append(self._sorted[i])
+            i += 1
+        if len(found) > 1:
+            found.sort(key=self._order.__getitem__)
+        return found
+
+
+def _folder_names(series, default: str = None):
+    """Nama folder aman untuk path ZIP ('/' dan '\\' diganti '_'); NaN -> default (jika diberikan)."""
+    cleaned = series.astype(str).str.strip().str.replace("/", "_", regex=False).str.replace("\\", "_", regex=False)
+    return cleaned if default is None else cleaned.where(series.notna(), default)
+
+
+def plan_organise_by_mcu(df, names) -> tuple:
+    """
+    Mode No_MCU/Departemen/JABATAN: file yang namanya diawali No_MCU -> Dept/Jabatan/file.pdf.
+    Mengembalikan (plan, not_found, ambiguous): plan = list (path_zip, nama_file),
+    ambiguous = {No_MCU: [nama_file, ...]} untuk ID yang cocok dengan lebih dari satu file
+    (file pertama sesuai urutan upload tetap dipakai).
+    """
+    index = PrefixIndex(names)
+    ids = df["No_MCU"].astype(str).str.strip().where(df["No_MCU"].notna(), "")
+    depts = _folder_names(df["Departemen"], "Unknown_Dept")
+    jabs = _folder_names(df["JABATAN"], "Unknown_JABATAN")
+    plan, not_found, ambiguous = [], [], {}
+    for no, dept, jab in zip(ids, depts, jabs):
+        matches = index.matches(no) if no else []
+        if not matches:
+            not_found.append(no)
+            continue
+        if len(matches) > 1:
+            ambiguous[no] = matches
+        plan.append((f"{dept}/{jab}/{matches[0]}", matches[0]))
+    return plan, not_found, ambiguous
+
+
+def plan_organise_by_folder(df, names) -> tuple:
+    """Mode filename/target_folder: exact match nama file -> Folder/file.pdf. Mengembalikan (plan, not_found)."""
+    available = set(names)
+    files = df["filename"].astype(str).str.strip()
+    folders = _folder_names(df["target_folder"])
+    plan, not_found = [], []
+    for fn, tgt in zip(files, folders):
+        if fn in available:
+            plan.append((f"{tgt}/{fn}", fn))
+        else:
+            not_found.append(fn)
+    return plan, not_found
+
+
+def plan_organise(df, names) -> tuple:
+    """
+    Memilih mode dari kolom Excel (MCU_COLUMNS lebih dulu, lalu FOLDER_COLUMNS) dan membuat rencananya.
+    Mengembalikan (mode "mcu"/"folder", plan, not_found, ambiguous). ValueError jika kolom tidak cocok.
+    """
+    if all(c in df.columns for c in MCU_COLUMNS):
+        plan, not_found, ambiguous = plan_organise_by_mcu(df, names)
+        return "mcu", plan, not_found, ambiguous
+    if all(c in df.columns for c in FOLDER_COLUMNS):
+        plan, not_found = plan_organise_by_folder(df, names)
+        return "folder", plan, not_found, {}
+    raise ValueError(f"Diperlukan kolom: {', '.join(MCU_COLUMNS)} ATAU {', '.join(FOLDER_COLUMNS)}")
+
+
+def write_organised(plan: list, sources: dict, out=None, progress=None) -> tuple:
+    """
+    Menyalin file sesuai rencana (path_tujuan, nama_file) ke ZipSink (atau DirSink).
+    `sources`: nama_file -> path/file-like. Mengembalikan (output, jumlah_file).
+    """
+    sink = as_sink(out)
+    for i, (arcname, name) in enumerate(plan, 1):
+        sink.add_file(arcname, sources[name])
+        if progress:
+            progress(i, len(plan))
+    return sink.close(), sink.count
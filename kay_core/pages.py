@@ -0,0 +1,110 @@
+"""
+Operasi halaman untuk satu PDF: urut ulang/hapus, hapus satu halaman, putar, kunci dan buka kunci.
+Tiap operasi membuka satu PdfReader sendiri (open_pdf_reader: stream terpisah di atas buffer yang
+dibagi), jumlah halaman untuk validasi UI diambil dari cache parsing; hasil ditulis ke spooled temp file.
+"""
+
+from .lock import try_encrypt
+from .parsed import open_pdf_reader
+from .spool import new_spool
+
+PdfReader = PdfWriter = None
+NameObject = NumberObject = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import NameObject, NumberObject
+except Exception:
+    pass
+
+ROTATE_ANGLES = (90, 180, 270)
+
+
+def _require_pypdf():
+    if PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+
+
+def _write(writer, out=None):
+    out = out if out is not None else new_spool()
+    writer.write(out)
+    out.seek(0)
+    return out
+
+
+def rotate_page_safe(page, angle):
+    """Fungsi untuk rotasi halaman PDF."""
+    try:
+        page.rotate(angle)
+    except Exception:
+        try:
+            page.__setitem__(NameObject("/Rotate"), NumberObject(angle))
+        except Exception:
+            pass
+
+
+def parse_page_order(text: str, num_pages: int) -> list:
+    """'3, 1, 2' -> [3, 1, 2] (1-based, urutan dan duplikat dipertahankan). ValueError jika di luar 1..num_pages."""
+    order = [int(x.strip()) for x in (text or "").split(",") if x.strip().isdigit()]
+    if any(n < 1 or n > num_pages for n in order):
+        raise ValueError(f"Nomor halaman harus antara 1 sampai {num_pages}.")
+    if not order:
+        raise ValueError("Urutan halaman kosong.")
+    return order
+
+
+def _copy_pages(reader, order: list, out=None) -> tuple:
+    writer = PdfWriter()
+    for page_no in order:
+        writer.add_page(reader.pages[page_no - 1])
+    return _write(writer, out), len(order)
+
+
+def reorder_pages(source, order: list, out=None) -> tuple:
+    """PDF dengan halaman sesuai `order` (1-based; halaman yang tidak disebut terhapus). Mengembalikan (file, jumlah_halaman)."""
+    _require_pypdf()
+    return _copy_pages(open_pdf_reader(source), order, out)
+
+
+def remove_pages(source, pages, out=None) -> tuple:
+    """PDF tanpa halaman `pages` (1-based). Mengembalikan (file, jumlah_halaman)."""
+    _require_pypdf()
+    reader = open_pdf_reader(source)
+    drop = set(pages)
+    return _copy_pages(reader, [i for i in range(1, len(reader.pages) + 1) if i not in drop], out)
+
+
+def rotate_pages(source, angle: int, pages=None, out=None) -> tuple:
+    """Memutar halaman `pages` (1-based, None = semua) sebesar `angle` derajat. Mengembalikan (file, jumlah_halaman)."""
+    _require_pypdf()
+    reader = open_pdf_reader(source)
+    targets = set(pages) if pages is not None else None
+    writer = PdfWriter()
+    for i, p in enumerate(reader.pages, 1):
+        # Putar salinan milik writer, bukan halaman reader
+        page = writer.add_page(p)
+        if targets is None or i in targets:
+            rotate_page_safe(page, angle)
+    return _write(writer, out), len(reader.pages)
+
+
+def encrypt_pdf(source, password: str, out=None) -> tuple:
+    """PDF terkunci password. Mengembalikan (file, jumlah_halaman)."""
+    _require_pypdf()
+    reader = open_pdf_reader(source)
+    writer = PdfWriter()
+    for p in reader.pages:
+        writer.add_page(p)
+    try_encrypt(writer, password)
+    return _write(writer, out), len(reader.pages)
+
+
+def decrypt_pdf(source, password: str, out=None) -> tuple:
+    """PDF tanpa password (jika terkunci). Mengembalikan (file, jumlah_halaman)."""
+    _require_pypdf()
+    reader = open_pdf_reader(source)
+    if getattr(reader, "is_encrypted", False):
+        reader.decrypt(password)
+    writer = PdfWriter()
+    for p in reader.pages:
+        writer.add_page(p)
+    return _write(writer, out), len(reader.pages)
@@ -0,0 +1,40 @@
+"""
+Helper bersama untuk pemrosesan paralel (process pool).
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+def default_workers() -> int:
+    """Jumlah worker default: semua core kecuali satu (untuk server Streamlit)."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def chunked(seq, size: int):
+    """Memecah list menjadi potongan berukuran `size`."""
+    size = max(1, int(size))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+def batch_size(total: int, workers: int, per_worker: int = 4) -> int:
+    """Ukuran batch agar tiap worker mendapat beberapa tugas (seimbang tanpa overhead IPC berlebih)."""
+    return max(1, total // max(1, workers * per_worker))
+
+
+def imap_unordered_bounded(executor, fn, items, inflight: int):
+    """
+    Seperti executor.map tetapi hasil dikembalikan sesuai urutan selesai, dengan maksimal
+    `inflight` tugas yang sedang berjalan/antre (argumen besar tidak menumpuk di memori).
+    """
+    pending = set()
+    for item in items:
+        if len(pending) >= inflight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+        pending.add(executor.submit(fn, item))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            yield fut.result()
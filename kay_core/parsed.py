@@ -0,0 +1,69 @@
+"""
+Cache hasil parsing (jumlah halaman, teks per halaman, DataFrame — lihat ingest.py).
+Kunci berbasis hash isi upload, sehingga rerun Streamlit (ganti widget, ketik di text input)
+pada file yang sama tidak mem-parsing ulang. Budget memori dibatasi dengan eviksi LRU.
+"""
+
+from .cache import LRUCache, content_hash
+from .spool import open_source
+from .text import extract_page_texts, resolve_engine
+
+PdfReader = None
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    pass
+
+# Budget memori untuk semua objek hasil parsing (bersama untuk semua sesi di proses ini)
+PARSED_CACHE_BYTES = 256 * 1024 * 1024
+
+_PARSED_CACHE = LRUCache(PARSED_CACHE_BYTES)
+
+
+def parsed_cache() -> LRUCache:
+    return _PARSED_CACHE
+
+
+def _memo(key, build, sizeof):
+    value = _PARSED_CACHE.get(key)
+    if value is None:
+        value = build()
+        _PARSED_CACHE.put(key, value, sizeof(value))
+    return value
+
+
+def open_pdf_reader(source):
+    """
+    PdfReader baru dengan stream sendiri (PdfReader tidak thread-safe, jadi tidak dibagi antar thread
+    Streamlit/JobRunner). Yang dibagi hanya buffer yang tidak berubah: memory map file atau bytes upload.
+    Data per dokumen yang aman dibagi (jumlah halaman, teks) di-cache lewat fungsi cached_* di bawah.
+    """
+    # Upload di disk dibaca lewat memory map (dimuat OS per halaman), bukan disalin ke heap
+    return PdfReader(open_source(source))
+
+
+def cached_page_count(source, doc_key: str = None) -> int:
+    doc_key = doc_key or content_hash(source)
+    return _memo((doc_key, "pages"), lambda: len(open_pdf_reader(source).pages), lambda n: 64)
+
+
+def cached_extraction(source, engine: str = "auto", pages: list = None, doc_key: str = None, progress=None) -> list:
+    """
+    Hasil extract_page_texts() (list (halaman, teks, detik)) di-cache per isi file, engine dan pilihan halaman.
+    `progress` hanya dipanggil jika ekstraksi benar-benar dijalankan (cache miss).
+    """
+    engine = resolve_engine(engine)
+    doc_key = doc_key or content_hash(source)
+    return _memo(
+        (doc_key, "text", engine, tuple(pages) if pages else None),
+        lambda: extract_page_texts(source, engine, pages, progress=progress),
+        lambda items: sum(len(t) for _, t, _ in items) * 2 + 64 * len(items) + 64,
+    )
+
+
+def cached_page_texts(source, engine: str = "auto", pages: list = None, doc_key: str = None) -> list:
+    """
+    Teks per halaman (list string sesuai urutan `pages`, default semua halaman).
+    `engine`: "pdfplumber", "pypdf", atau "auto" (pdfplumber jika terinstall).
+    """
+    return [text for _, text, _ in cached_extraction(source, engine, pages, doc_key)]
@@ -0,0 +1,124 @@
+"""
+Kompres foto batch multi-core.
+JPEG dibuka dengan mode draft (decoder libjpeg langsung men-decode pada skala 1/2, 1/4, 1/8
+yang masih >= ukuran target), sisanya diperkecil dengan reduce() + resample. Tiap gambar
+diproses di process pool dan hasilnya langsung ditulis ke ZipSink begitu selesai.
+Rename berurutan + konversi format gambar (JPG/PNG/WEBP) juga ada di sini.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import default_workers, imap_unordered_bounded
+from .spool import source_bytes, source_payload
+from .zipsink import as_sink
+
+Image = None
+try:
+    from PIL import Image
+except Exception:
+    pass
+
+# Di bawah jumlah file ini, overhead process pool lebih besar dari manfaatnya
+PHOTO_PARALLEL_MIN_FILES = 4
+
+# thumbnail(): reduce() bilangan bulat dulu sampai ~3x target, lalu resample halus
+PHOTO_REDUCING_GAP = 3.0
+
+
+def compress_image_bytes(data: bytes, max_side: int = 1200, quality: int = 75) -> bytes:
+    """Gambar (bytes) -> JPEG (bytes) dengan sisi terpanjang maksimal `max_side`."""
+    im = Image.open(io.BytesIO(data))
+    if im.format == "JPEG":
+        # Decode langsung pada skala DCT terdekat yang masih >= ukuran target
+        im.draft("RGB", (max_side, max_side))
+    im.thumbnail((max_side, max_side), reducing_gap=PHOTO_REDUCING_GAP)
+    if im.mode != "RGB":
+        im = im.convert("RGB")
+    buf = io.BytesIO()
+    im.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def _compress_job(job: tuple) -> tuple:
+    name, data, max_side, quality = job
+    try:
+        return name, compress_image_bytes(source_bytes(data), max_side, quality), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def iter_compressed(sources: list, max_side: int = 1200, quality: int = 75, workers: int = None):
+    """
+    Generator (nama, jpeg_bytes atau None, error atau None) sesuai urutan selesai.
+    `sources`: list (nama, path/bytes/file-like). Isi file dibaca saat tugas dikirim (path dibaca oleh worker).
+    """
+    workers = workers or default_workers()
+    payloads = ((name, source_payload(src), max_side, quality) for name, src in sources)
+    if workers <= 1 or len(sources) < PHOTO_PARALLEL_MIN_FILES:
+        for job in payloads:
+            yield _compress_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from imap_unordered_bounded(ex, _compress_job, payloads, workers * 4)
+
+
+def compress_images_to_zip(sources: list, max_side: int = 1200, quality: int = 75, out=None, workers: int = None, progress=None):
+    """
+    Mengompres semua gambar ke ZipSink sebagai compressed_<nama>.
+    `progress(selesai, total)` per file; `out` boleh berupa DirSink. Mengembalikan (file_zip, jumlah_file, errors)
+    dengan errors = list (nama, pesan).
+    """
+    if Image is None:
+        raise RuntimeError("Pillow tidak terinstall (pip install Pillow)")
+    sink = as_sink(out)
+    errors = []
+    for done, (name, data, err) in enumerate(iter_compressed(sources, max_side, quality, workers), 1):
+        if err:
+            errors.append((name, err))
+        else:
+            sink.add(f"compressed_{name}", data)
+        if progress:
+            progress(done, len(sources))
+    return sink.close(), sink.count, errors
+
+
+# Format output rename/konversi gambar -> (format Pillow, ekstensi)
+IMAGE_FORMATS = {"JPG": ("JPEG", ".jpg"), "PNG": ("PNG", ".png"), "WEBP": ("WEBP", ".webp")}
+
+
+def convert_image_bytes(data: bytes, fmt: str = None) -> tuple:
+    """
+    Gambar (bytes) -> (bytes, ekstensi) dalam format `fmt` (kunci IMAGE_FORMATS).
+    Tanpa `fmt` format asli dipertahankan (ekstensi kosong = pakai ekstensi nama asli). JPEG disimpan kualitas 95.
+    """
+    img = Image.open(io.BytesIO(data))
+    if fmt:
+        pil_format, ext = IMAGE_FORMATS[fmt.upper()]
+    else:
+        pil_format, ext = img.format or "JPEG", ""
+    buf = io.BytesIO()
+    if pil_format in ("JPEG", "JPG"):
+        img.convert("RGB").save(buf, format="JPEG", quality=95)
+    else:
+        img.save(buf, format=pil_format)
+    return buf.getvalue(), ext
+
+
+def convert_images_to_zip(sources: list, prefix: str, fmt: str = None, start: int = 1, out=None, progress=None):
+    """
+    Rename berurutan + konversi format: gambar ke-i menjadi '{prefix}_{nomor:03d}.{ext}'.
+    `sources`: list (nama, path/bytes/file-like). Mengembalikan (file_zip, jumlah_file).
+    """
+    if Image is None:
+        raise RuntimeError("Pillow tidak terinstall (pip install Pillow)")
+    if not prefix:
+        raise ValueError("Prefix nama file tidak boleh kosong.")
+    sink = as_sink(out)
+    for i, (name, src) in enumerate(sources, start):
+        data, ext = convert_image_bytes(source_bytes(src), fmt)
+        sink.add(f"{prefix}_{i:03d}{ext or os.path.splitext(name)[1]}", data)
+        if progress:
+            progress(i - start + 1, len(sources))
+    return sink.close(), sink.count
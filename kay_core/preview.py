@@ -0,0 +1,87 @@
+"""
+Preview PDF per halaman dengan cache render.
+Hanya halaman pada jendela yang sedang dilihat yang dirender (DPI rendah); hasil PNG
+disimpan di cache LRU berkunci (hash isi dokumen, halaman, dpi), jadi pindah halaman
+atau rerun Streamlit tidak merender ulang halaman yang sama.
+"""
+
+import os
+import shutil
+import tempfile
+
+from .cache import LRUCache, content_hash
+from .parsed import open_pdf_reader
+from .raster import PDF2IMAGE_AVAILABLE, render_window
+from .spool import remove_quietly, source_to_path
+
+# Budget memori cache thumbnail (bersama untuk semua sesi di proses ini)
+PREVIEW_CACHE_BYTES = 64 * 1024 * 1024
+PREVIEW_DPI = 50
+PREVIEW_PAGE_SIZE = 6
+
+_RENDER_CACHE = LRUCache(PREVIEW_CACHE_BYTES)
+
+
+def render_cache() -> LRUCache:
+    return _RENDER_CACHE
+
+
+def _runs(pages: list) -> list:
+    """Mengelompokkan nomor halaman terurut menjadi rentang berurutan [(awal, akhir), ...]."""
+    runs = []
+    for p in sorted(set(pages)):
+        if runs and p == runs[-1][1] + 1:
+            runs[-1][1] = p
+        else:
+            runs.append([p, p])
+    return runs
+
+
+def render_thumbnails(source, pages: list, dpi: int = PREVIEW_DPI, doc_key: str = None) -> list:
+    """
+    Thumbnail PNG untuk `pages` (1-based). Halaman yang sudah ada di cache tidak dirender ulang;
+    sisanya dirender per rentang berurutan lewat poppler. Mengembalikan list (halaman, png_bytes).
+    """
+    doc_key = doc_key or content_hash(source)
+    found = {}
+    missing = []
+    for p in pages:
+        data = _RENDER_CACHE.get((doc_key, p, dpi))
+        if data is None:
+            missing.append(p)
+        else:
+            found[p] = data
+    if missing:
+        if not PDF2IMAGE_AVAILABLE:
+            raise RuntimeError("pdf2image not installed or poppler missing.")
+        path, cleanup = source_to_path(source)
+        workdir = tempfile.mkdtemp(prefix="kay_preview_")
+        try:
+            for first, last in _runs(missing):
+                for page_no, img_path in render_window(path, first, last, dpi, "PNG", workdir=workdir):
+                    with open(img_path, "rb") as fh:
+                        data = fh.read()
+                    os.unlink(img_path)
+                    _RENDER_CACHE.put((doc_key, page_no, dpi), data, len(data))
+                    found[page_no] = data
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            if cleanup:
+                remove_quietly(path)
+    return [(p, found[p]) for p in pages]
+
+
+def page_texts(source, pages: list, doc_key: str = None) -> list:
+    """Fallback tanpa poppler: teks per halaman (1-based), juga di-cache. Mengembalikan list (halaman, teks)."""
+    doc_key = doc_key or content_hash(source)
+    result, reader = [], None
+    for p in pages:
+        key = (doc_key, p, "text")
+        text = _RENDER_CACHE.get(key)
+        if text is None:
+            # Satu reader untuk semua halaman yang belum di-cache pada panggilan ini
+            reader = reader or open_pdf_reader(source)
+            text = reader.pages[p - 1].extract_text() or ""
+            _RENDER_CACHE.put(key, text, len(text.encode()) + 64)
+        result.append((p, text))
+    return result
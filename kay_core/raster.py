@@ -0,0 +1,94 @@
+"""
+Rasterisasi PDF -> gambar per jendela halaman (memori terbatas).
+Poppler (pdftoppm) dipanggil per jendela `first_page..last_page` dengan beberapa thread,
+menulis file gambar langsung ke folder sementara; file tersebut langsung dimasukkan
+ke ZIP lalu dihapus. Tidak ada PIL.Image untuk seluruh dokumen yang ditahan di memori.
+"""
+
+import shutil
+import tempfile
+
+from .parallel import default_workers
+from .spool import remove_quietly, source_to_path
+from .zipsink import ZipSink
+
+PDF2IMAGE_AVAILABLE = False
+convert_from_path = pdfinfo_from_path = None
+try:
+    from pdf2image import convert_from_path, pdfinfo_from_path
+    PDF2IMAGE_AVAILABLE = True
+except Exception:
+    pass
+
+PdfReader = None
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    pass
+
+# Jumlah halaman per panggilan poppler; batas atas file gambar yang ada di disk sekaligus
+RASTER_WINDOW = 8
+
+# Ekstensi file hasil pdftoppm per format
+RASTER_FORMATS = {"PNG": "png", "JPEG": "jpeg"}
+
+
+def pdf_page_count(path: str) -> int:
+    """Jumlah halaman PDF (PyPDF2 jika ada, jika tidak lewat pdfinfo milik poppler)."""
+    if PdfReader is not None:
+        return len(PdfReader(path).pages)
+    return int(pdfinfo_from_path(path)["Pages"])
+
+
+def render_window(path: str, first_page: int, last_page: int, dpi: int = 150, fmt: str = "PNG", threads: int = None, workdir: str = None) -> list:
+    """
+    Render halaman first_page..last_page (1-based) ke file di `workdir`.
+    Mengembalikan list (nomor_halaman, path_file) sesuai urutan halaman.
+    """
+    if not PDF2IMAGE_AVAILABLE:
+        raise RuntimeError("pdf2image not installed or poppler missing.")
+    threads = threads or default_workers()
+    paths = convert_from_path(
+        path, dpi=dpi, first_page=first_page, last_page=last_page,
+        fmt=RASTER_FORMATS[fmt], thread_count=min(threads, last_page - first_page + 1),
+        output_folder=workdir, paths_only=True,
+    )
+    return list(zip(range(first_page, last_page + 1), paths))
+
+
+def iter_rendered_pages(path: str, dpi: int = 150, fmt: str = "PNG", window: int = RASTER_WINDOW, threads: int = None, first_page: int = 1, last_page: int = None):
+    """
+    Generator (nomor_halaman, path_file) per jendela halaman.
+    File milik jendela sebelumnya dihapus sebelum jendela berikutnya dirender.
+    """
+    last_page = last_page or pdf_page_count(path)
+    workdir = tempfile.mkdtemp(prefix="kay_raster_")
+    try:
+        for start in range(first_page, last_page + 1, window):
+            end = min(start + window - 1, last_page)
+            rendered = render_window(path, start, end, dpi, fmt, threads, workdir)
+            for page_no, img_path in rendered:
+                yield page_no, img_path
+                remove_quietly(img_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def rasterize_to_zip(source, dpi: int = 150, fmt: str = "PNG", window: int = RASTER_WINDOW, threads: int = None, out=None, progress=None):
+    """
+    PDF (path/bytes/file-like) -> ZIP berisi page_N.png/jpeg.
+    `progress(selesai, total)` dipanggil per halaman. Mengembalikan (file_zip, jumlah_halaman).
+    """
+    path, cleanup = source_to_path(source)
+    try:
+        total = pdf_page_count(path)
+        # Arsip tetap ditutup jika render gagal/dibatalkan di tengah jalan
+        with ZipSink(out) as sink:
+            for page_no, img_path in iter_rendered_pages(path, dpi, fmt, window, threads, last_page=total):
+                sink.add_file(f"page_{page_no}.{fmt.lower()}", img_path)
+                if progress:
+                    progress(sink.count, total)
+        return sink.close(), sink.count
+    finally:
+        if cleanup:
+            remove_quietly(path)
@@ -0,0 +1,103 @@
+"""
+Perencana rename berbasis Excel (nama_lama -> nama_baru) dengan operasi pandas tervektorisasi.
+Rencana (RenamePlan) dibuat sekali — merge dengan daftar upload, perbaikan ekstensi,
+deteksi nama tujuan ganda — lalu dieksekusi ke ZipSink oleh tool PDF maupun gambar.
+"""
+
+import os
+
+from .zipsink import as_sink
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+RENAME_COLUMNS = ("nama_lama", "nama_baru")
+
+# Ekstensi terakhir dari nama file (semantik os.path.splitext: titik di awal nama bukan ekstensi)
+_EXT_RE = r"[^/\\.][^/\\]*?(\.[^./\\]*)$"
+
+
+class RenamePlan:
+    """
+    Hasil perencanaan rename.
+    - pairs: list (nama_lama, nama_baru) sesuai urutan baris Excel
+    - not_found: nama_lama di Excel yang tidak ada di file upload
+    - duplicates: {nama_baru: [nama_lama, ...]} untuk tujuan yang dipakai lebih dari satu baris
+      (ZipSink tetap memberi akhiran _2, _3, ... agar tidak saling menimpa)
+    """
+
+    def __init__(self, pairs: list, not_found: list, duplicates: dict):
+        self.pairs = pairs
+        self.not_found = not_found
+        self.duplicates = duplicates
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def execute(self, sources: dict, out=None, progress=None):
+        """
+        Menulis file hasil rename ke ZipSink. `sources`: nama_lama -> path/file-like.
+        `progress(selesai, total)` per file; `out` boleh berupa DirSink. Mengembalikan (file_zip, jumlah_file).
+        """
+        sink = as_sink(out)
+        for i, (old, new) in enumerate(self.pairs, 1):
+            sink.add_file(new, sources[old])
+            if progress:
+                progress(i, len(self.pairs))
+        return sink.close(), sink.count
+
+
+def plan_rename(df, available_names, force_ext: str = None) -> RenamePlan:
+    """
+    Membuat RenamePlan dari DataFrame berkolom nama_lama/nama_baru dan daftar nama file upload.
+    - force_ext (mis. ".pdf"): ditambahkan jika nama_baru belum berakhiran ekstensi tersebut.
+    - tanpa force_ext: nama_baru tanpa ekstensi memakai ekstensi nama_lama.
+    ValueError jika kolom wajib tidak ada.
+    """
+    missing = [c for c in RENAME_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Excel/CSV wajib memiliki kolom: {', '.join(RENAME_COLUMNS)}")
+    rows = pd.DataFrame({
+        "old": df["nama_lama"].astype(str).str.strip(),
+        "new": df["nama_baru"].astype(str).str.strip(),
+    })
+    uploads = pd.DataFrame({"old": pd.unique(pd.Series(list(available_names), dtype=object)), "_found": True})
+    merged = rows.merge(uploads, on="old", how="left")
+    found = merged["_found"].notna()
+    hit = merged.loc[found, ["old", "new"]]
+
+    new = hit["new"]
+    if force_ext:
+        needs_ext = ~new.str.lower().str.endswith(force_ext.lower())
+        new = new.where(~needs_ext, new + force_ext)
+    else:
+        old_ext = hit["old"].str.extract(_EXT_RE, expand=False).fillna("")
+        needs_ext = new.str.extract(_EXT_RE, expand=False).isna()
+        new = new.where(~needs_ext, new + old_ext)
+
+    dup_mask = new.duplicated(keep=False)
+    duplicates = {}
+    # Hanya baris yang bentrok yang dikelompokkan (groupby per grup jauh lebih lambat)
+    for old, target in zip(hit.loc[dup_mask, "old"].tolist(), new[dup_mask].tolist()):
+        duplicates.setdefault(target, []).append(old)
+    return RenamePlan(
+        list(zip(hit["old"].tolist(), new.tolist())),
+        merged.loc[~found, "old"].tolist(),
+        duplicates,
+    )
+
+
+def plan_sequential_rename(names: list, prefix: str, start: int = 1, ext: str = None) -> RenamePlan:
+    """
+    Rename berurutan: nama ke-i menjadi '{prefix}_{nomor:03d}{ext}' mulai dari `start`.
+    Tanpa `ext`, ekstensi nama asli dipakai. ValueError jika prefix kosong.
+    """
+    if not prefix:
+        raise ValueError("Prefix nama file tidak boleh kosong.")
+    pairs = []
+    for i, name in enumerate(names, start):
+        suffix = ext if ext is not None else os.path.splitext(name)[1]
+        pairs.append((name, f"{prefix}_{i:03d}{suffix}"))
+    return RenamePlan(pairs, [], {})
@@ -0,0 +1,122 @@
+"""
+Pisah PDF paralel.
+Sumber ditulis sekali ke temp file; tiap worker di process pool membuka sumber
+satu kali (initializer), lalu membuat PDF keluaran per tugas. Hasil langsung
+ditulis ke ZIP begitu selesai, tanpa menahan semua halaman di memori.
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import batch_size, chunked, default_workers, imap_unordered_bounded
+from .spool import remove_quietly, source_to_path
+from .zipsink import as_sink
+
+PdfReader = PdfWriter = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+except Exception:
+    pass
+
+SPLIT_MODES = ("page", "every", "ranges")
+
+# Di bawah jumlah halaman ini, overhead process pool lebih besar dari manfaatnya
+PARALLEL_MIN_PAGES = 16
+
+_worker_reader = None
+
+
+def parse_page_ranges(text: str, num_pages: int) -> list:
+    """Parsing '1-3, 5, 8-10' menjadi daftar (awal, akhir) 1-based. ValueError jika tidak valid."""
+    ranges = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = (x.strip() for x in part.split("-", 1))
+            start, end = int(a), int(b)
+        else:
+            start = end = int(part)
+        if start < 1 or end > num_pages or start > end:
+            raise ValueError(f"Rentang halaman tidak valid: '{part}' (1-{num_pages})")
+        ranges.append((start, end))
+    if not ranges:
+        raise ValueError("Rentang halaman kosong.")
+    return ranges
+
+
+def plan_split(num_pages: int, mode: str = "page", every: int = 1, ranges: str = "") -> list:
+    """Membuat rencana output: daftar (nama_file, [indeks halaman 0-based])."""
+    if mode == "page":
+        spans = [(i, i) for i in range(1, num_pages + 1)]
+    elif mode == "every":
+        every = max(1, int(every))
+        spans = [(i, min(i + every - 1, num_pages)) for i in range(1, num_pages + 1, every)]
+    elif mode == "ranges":
+        spans = parse_page_ranges(ranges, num_pages)
+    else:
+        raise ValueError(f"Mode split tidak dikenal: {mode} (pilihan: {', '.join(SPLIT_MODES)})")
+    plan = []
+    for start, end in spans:
+        name = f"page_{start}.pdf" if start == end else f"pages_{start}-{end}.pdf"
+        plan.append((name, list(range(start - 1, end))))
+    return plan
+
+
+def _init_worker(path: str):
+    global _worker_reader
+    _worker_reader = PdfReader(path)
+
+
+def _render_parts(reader, parts: list) -> list:
+    results = []
+    for name, indices in parts:
+        w = PdfWriter()
+        for i in indices:
+            w.add_page(reader.pages[i])
+        buf = io.BytesIO(); w.write(buf)
+        results.append((name, buf.getvalue()))
+    return results
+
+
+def _worker_render(parts: list) -> list:
+    return _render_parts(_worker_reader, parts)
+
+
+def iter_split(path: str, plan: list, workers: int = None):
+    """Generator (nama_file, bytes_pdf) sesuai urutan selesai, untuk rencana dari plan_split()."""
+    workers = workers or default_workers()
+    total_pages = sum(len(idx) for _, idx in plan)
+    if workers <= 1 or total_pages < PARALLEL_MIN_PAGES:
+        reader = PdfReader(path)
+        for part in plan:
+            yield from _render_parts(reader, [part])
+        return
+    batches = chunked(plan, batch_size(len(plan), workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as ex:
+        # Batch dikirim bertahap dan hasilnya dilepas setelah ditulis: output tidak menumpuk di proses utama
+        for parts in imap_unordered_bounded(ex, _worker_render, batches, workers * 2):
+            yield from parts
+
+
+def split_pdf_to_zip(source, mode: str = "page", every: int = 1, ranges: str = "", out=None, workers: int = None, progress=None):
+    """
+    Memisah PDF (path, bytes, atau file-like) dan menulis hasilnya langsung ke ZipSink.
+    `progress(selesai, total)` dipanggil per file; `out` boleh berupa DirSink untuk menulis ke folder.
+    Mengembalikan (file_zip, jumlah_file).
+    """
+    if PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+    path, cleanup = source_to_path(source)
+    try:
+        plan = plan_split(len(PdfReader(path).pages), mode, every, ranges)
+        sink = as_sink(out)
+        for name, data in iter_split(path, plan, workers):
+            sink.add(name, data)
+            if progress:
+                progress(sink.count, len(plan))
+        return sink.close(), sink.count
+    finally:
+        if cleanup:
+            remove_quietly(path)
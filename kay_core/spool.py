@@ -0,0 +1,105 @@
+"""
+Helper file sementara (spooled) untuk output besar.
+Data disimpan di RAM selama kecil, lalu otomatis dipindah ke disk saat melewati batas.
+Input berupa path (termasuk upload yang sudah di-spool ke disk, lihat uploads.py) dibaca lewat
+memory map atau langsung dari file, bukan disalin ke bytes baru.
+"""
+
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+
+# Batas data yang ditahan di RAM sebelum dipindah ke file di disk
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+
+def new_spool(max_size: int = SPOOL_MAX_BYTES):
+    """Membuat SpooledTemporaryFile biner (RAM -> disk otomatis)."""
+    return tempfile.SpooledTemporaryFile(max_size=max_size, mode="w+b")
+
+
+def spool_to_bytes(f) -> bytes:
+    """Membaca seluruh isi spool dari awal (untuk st.download_button)."""
+    f.seek(0)
+    return f.read()
+
+
+def spool_reader(f):
+    """
+    Callable untuk st.download_button(data=...): isi spool baru dibaca saat tombol diklik (deferred),
+    sehingga salinan bytes tidak ditahan di session_state/setiap rerun. Spool harus tetap terbuka.
+    """
+    lock = threading.Lock()  # klik berulang dilayani thread server: posisi baca spool dipakai bersama
+
+    def read() -> bytes:
+        with lock:
+            return spool_to_bytes(f)
+    return read
+
+
+def source_bytes(source) -> bytes:
+    """Isi lengkap path/bytes/file-like sebagai bytes (UploadedFile/BytesIO tanpa mengubah posisi baca)."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            return fh.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def open_source(source):
+    """
+    Stream baca (seekable, posisi di awal) untuk path/bytes/file-like tanpa salinan baru di heap:
+    path dibuka sebagai memory map read-only, BytesIO/UploadedFile memakai buffer yang sama.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return io.BytesIO()
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(source, "getvalue"):
+        # getvalue() dari BytesIO yang belum diubah mengembalikan objek bytes yang sama (tanpa salinan)
+        return io.BytesIO(source.getvalue())
+    source.seek(0)
+    return source
+
+
+def source_payload(source):
+    """Argumen untuk worker process: path dikirim sebagai string (worker membaca sendiri), selain itu bytes."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return source_bytes(source)
+
+
+def source_to_path(source, suffix: str = ".pdf") -> tuple:
+    """
+    Mengembalikan (path, perlu_dihapus) untuk path/bytes/file-like.
+    Bytes dan file-like disalin sekali ke temp file agar bisa dibuka ulang oleh proses worker.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), False
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    with tmp:
+        if isinstance(source, (bytes, bytearray)):
+            tmp.write(source)
+        else:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            shutil.copyfileobj(source, tmp)
+    return tmp.name, True
+
+
+def remove_quietly(path: str):
+    """Menghapus file sementara tanpa melempar error."""
+    try:
+        os.unlink(path)
+    except Exception:
+        pass
@@ -0,0 +1,179 @@
+"""
+Ekstraksi tabel PDF paralel -> Excel (openpyxl write-only).
+Tiap worker membuka dokumen sekali dengan pdfplumber dan mengekstrak tabel per halaman
+dengan table settings yang bisa diatur. Baris tabel langsung ditulis ke workbook streaming
+(atau ke spool sementara untuk mode satu sheet), jadi memori tidak bergantung pada jumlah tabel.
+"""
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import batch_size, chunked, default_workers
+from .spool import new_spool, remove_quietly, source_to_path
+
+try:
+    import pdfplumber
+except Exception:
+    pdfplumber = None
+
+Workbook = ILLEGAL_CHARACTERS_RE = None
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+except Exception:
+    pass
+
+# Pilihan strategi pdfplumber untuk pencarian garis tabel
+TABLE_STRATEGIES = ("lines", "lines_strict", "text")
+
+DEFAULT_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 3,
+    "intersection_tolerance": 3,
+}
+
+# Di bawah jumlah halaman ini, overhead process pool lebih besar dari manfaatnya
+TABLE_PARALLEL_MIN_PAGES = 4
+
+_worker_doc = None
+_worker_settings = None
+
+
+def _page_tables(doc, page_no: int, settings: dict) -> list:
+    page = doc.pages[page_no - 1]
+    tables = [t for t in page.extract_tables(settings) if t and len(t) > 1]
+    if hasattr(page, "close"):
+        page.close()
+    return tables
+
+
+def _init_worker(path: str, settings: dict):
+    global _worker_doc, _worker_settings
+    _worker_doc = pdfplumber.open(path)
+    _worker_settings = settings
+
+
+def _worker_tables(pages: list) -> list:
+    return [(p, _page_tables(_worker_doc, p, _worker_settings)) for p in pages]
+
+
+def iter_page_tables(source, settings: dict = None, pages: list = None, workers: int = None):
+    """
+    Generator (halaman, [tabel, ...]) sesuai urutan halaman; tabel = list baris (baris pertama = header).
+    Tabel dengan kurang dari 2 baris dilewati.
+    """
+    if pdfplumber is None:
+        raise RuntimeError("pdfplumber is required for table extraction (pip install pdfplumber)")
+    settings = {**DEFAULT_TABLE_SETTINGS, **(settings or {})}
+    path, cleanup = source_to_path(source)
+    try:
+        workers = workers or default_workers()
+        with pdfplumber.open(path) as doc:
+            if pages is None:
+                pages = list(range(1, len(doc.pages) + 1))
+            if workers <= 1 or len(pages) < TABLE_PARALLEL_MIN_PAGES:
+                for p in pages:
+                    yield p, _page_tables(doc, p, settings)
+                return
+        batches = chunked(pages, batch_size(len(pages), workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path, settings)) as ex:
+            for batch in ex.map(_worker_tables, batches):
+                yield from batch
+    finally:
+        if cleanup:
+            remove_quietly(path)
+
+
+def _clean(value):
+    """Nilai sel yang aman untuk openpyxl (karakter kontrol dibuang)."""
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def _header_keys(header: list) -> list:
+    """Kunci kolom (nama, kemunculan ke-n) agar header dengan nama ganda tetap terpisah."""
+    seen = {}
+    keys = []
+    for name in header:
+        n = seen.get(name, 0)
+        seen[name] = n + 1
+        keys.append((name, n))
+    return keys
+
+
+def tables_to_xlsx(source, settings: dict = None, pages: list = None, sheet_per_page: bool = False, out=None, workers: int = None, progress=None):
+    """
+    Mengekstrak semua tabel dan menulis workbook .xlsx ke `out` (default: spool).
+    - sheet_per_page=False: satu sheet, kolom digabung berdasarkan nama header (seperti pd.concat).
+    - sheet_per_page=True: satu sheet per halaman bertabel, tiap tabel dipisah satu baris kosong.
+    `progress(selesai, total)` per halaman. Mengembalikan (file_xlsx, info) dengan
+    info = {"tables", "rows", "preview"} (preview: header + maksimal 5 baris tabel pertama).
+    """
+    if Workbook is None:
+        raise RuntimeError("openpyxl tidak terinstall (pip install openpyxl)")
+    if pdfplumber is None:
+        raise RuntimeError("pdfplumber is required for table extraction (pip install pdfplumber)")
+    path, cleanup = source_to_path(source)
+    try:
+        if pages is None:
+            with pdfplumber.open(path) as doc:
+                pages = list(range(1, len(doc.pages) + 1))
+        return _write_tables(path, settings, pages, sheet_per_page, out, workers, progress)
+    finally:
+        if cleanup:
+            remove_quietly(path)
+
+
+def _write_tables(path: str, settings: dict, pages: list, sheet_per_page: bool, out, workers: int, progress):
+    out = out if out is not None else new_spool()
+    wb = Workbook(write_only=True)
+    info = {"tables": 0, "rows": 0, "preview": None}
+    # Mode satu sheet: tabel ditampung di spool dulu karena union header baru diketahui di akhir
+    pending = None if sheet_per_page else new_spool()
+    columns, col_index = [], {}
+    for done, (page_no, tables) in enumerate(iter_page_tables(path, settings, pages, workers), 1):
+        if tables and sheet_per_page:
+            ws = wb.create_sheet(f"page_{page_no}")
+        for i, tbl in enumerate(tables):
+            if info["preview"] is None:
+                info["preview"] = tbl[:6]
+            info["tables"] += 1
+            info["rows"] += len(tbl) - 1
+            if sheet_per_page:
+                if i:
+                    ws.append([])
+                for row in tbl:
+                    ws.append([_clean(v) for v in row])
+            else:
+                for key in _header_keys(tbl[0]):
+                    if key not in col_index:
+                        col_index[key] = len(columns)
+                        columns.append(key)
+                pickle.dump(tbl, pending, pickle.HIGHEST_PROTOCOL)
+        if progress:
+            progress(done, len(pages))
+    if sheet_per_page:
+        if not info["tables"]:
+            wb.create_sheet("tables")
+    else:
+        ws = wb.create_sheet("tables")
+        if columns:
+            ws.append([_clean(name) for name, _ in columns])
+        pending.seek(0)
+        while True:
+            try:
+                tbl = pickle.load(pending)
+            except EOFError:
+                break
+            positions = [col_index[k] for k in _header_keys(tbl[0])]
+            for row in tbl[1:]:
+                cells = [None] * len(columns)
+                for pos, value in zip(positions, row):
+                    cells[pos] = _clean(value)
+                ws.append(cells)
+        pending.close()
+    wb.save(out)
+    out.seek(0)
+    return out, info
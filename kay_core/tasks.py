@@ -0,0 +1,60 @@
+"""
+Fungsi job untuk JobRunner (kay_core.jobs): gabung PDF, PDF -> gambar, batch lock, dan terjemahan PDF.
+Tiap fungsi menerima JobContext (input sudah berupa path di disk), menulis hasil lewat ctx.output()
+dan mengembalikan ringkasan kecil yang bisa di-JSON-kan.
+"""
+
+from .document import DOCX_MIME, layout_paragraphs, paragraphs_text, paragraphs_to_docx, translate_paragraphs
+from .lock import lock_pdfs_to_zip
+from .merge import merge_pdfs_in_memory, merge_pdfs_streaming
+from .parsed import cached_extraction, cached_page_count
+from .raster import rasterize_to_zip
+from .text import select_pages
+from .translation_memory import translation_memory
+
+# Panjang teks preview (asli/terjemahan) yang disimpan di ringkasan job terjemahan
+PREVIEW_CHARS = 5000
+
+
+def merge_task(ctx, streaming: bool = True) -> dict:
+    paths = [path for _, path in ctx.inputs]
+    merge = merge_pdfs_streaming if streaming else merge_pdfs_in_memory
+    with ctx.output("merged.pdf", "application/pdf") as fh:
+        _, n_pages = merge(paths, fh, progress=lambda i: ctx.progress(i, len(paths)))
+    return {"files": len(paths), "pages": n_pages}
+
+
+def rasterize_task(ctx, dpi: int = 150, fmt: str = "PNG", window: int = None) -> dict:
+    _, path = ctx.inputs[0]
+    options = {"window": window} if window else {}
+    with ctx.output("pdf_images.zip", "application/zip") as fh:
+        _, n_pages = rasterize_to_zip(path, dpi=dpi, fmt=fmt, out=fh, progress=ctx.progress, **options)
+    return {"pages": n_pages}
+
+
+def lock_task(ctx, jobs: list, not_found: list = ()) -> dict:
+    """`jobs`: list (nama_file, password) dari plan_lock_jobs(); hanya dipegang di memori."""
+    sources = dict(ctx.inputs)
+    with ctx.output("locked_pdfs.zip", "application/zip") as fh:
+        _, n_locked, errors = lock_pdfs_to_zip(jobs, sources, out=fh, progress=ctx.progress)
+    return {"locked": n_locked, "errors": [list(e) for e in errors[:20]], "n_errors": len(errors),
+            "not_found": list(not_found)[:20], "n_not_found": len(not_found)}
+
+
+def translate_task(ctx, backend: str = "google", source: str = "auto", target: str = "en", ranges: str = "",
+                   use_memory: bool = True, **schedule) -> dict:
+    _, path = ctx.inputs[0]
+    pages = select_pages(ranges, cached_page_count(path)) if ranges.strip() else None
+    results = cached_extraction(path, "auto", pages, progress=lambda i, total: ctx.progress(i, total, "Ekstraksi teks"))
+    paragraphs = layout_paragraphs(t for _, t, _ in results)
+    if not paragraphs_text(paragraphs).strip():
+        raise ValueError("Teks kosong atau tidak dapat diekstrak dari PDF.")
+    translated, stats = translate_paragraphs(
+        paragraphs, backend, source, target, memory=translation_memory() if use_memory else None,
+        progress=lambda done, total: ctx.progress(done, total, "Terjemahan"), **schedule,
+    )
+    with ctx.output(f"translated_to_{target}_rapi.docx", DOCX_MIME) as fh:
+        paragraphs_to_docx(translated, fh)
+    stats = dict(stats, failed=len(stats["failed"]))
+    return {"stats": stats, "original": "\n\n".join(paragraphs)[:PREVIEW_CHARS],
+            "translated": "\n\n".join(translated)[:PREVIEW_CHARS]}
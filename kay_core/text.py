@@ -0,0 +1,138 @@
+"""
+Ekstraksi teks per halaman secara paralel.
+Sumber ditulis sekali ke temp file; tiap worker membuka dokumen satu kali (initializer)
+lalu mengekstrak potongan halaman berurutan. Hasil dikirim kembali sesuai urutan halaman
+(executor.map), lengkap dengan waktu ekstraksi per halaman.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import batch_size, chunked, default_workers
+from .spool import remove_quietly, source_to_path
+from .split import parse_page_ranges
+
+PdfReader = None
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    pass
+
+try:
+    import pdfplumber
+except Exception:
+    pdfplumber = None
+
+TEXT_ENGINES = ("pdfplumber", "pypdf")
+
+# Di bawah jumlah halaman ini, overhead process pool lebih besar dari manfaatnya
+TEXT_PARALLEL_MIN_PAGES = 8
+
+_worker_doc = None
+_worker_engine = None
+
+
+def resolve_engine(engine: str = "auto") -> str:
+    """'auto' -> pdfplumber jika terinstall, jika tidak PyPDF2."""
+    if engine == "auto":
+        engine = "pdfplumber" if pdfplumber is not None else "pypdf"
+    if engine not in TEXT_ENGINES:
+        raise ValueError(f"Engine teks tidak dikenal: {engine} (pilihan: {', '.join(TEXT_ENGINES)})")
+    if engine == "pdfplumber" and pdfplumber is None:
+        raise RuntimeError("pdfplumber tidak terinstall (pip install pdfplumber)")
+    if engine == "pypdf" and PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+    return engine
+
+
+def select_pages(ranges: str, num_pages: int) -> list:
+    """'1-3, 5' -> [1, 2, 3, 5] (1-based, urut, tanpa duplikat). Teks kosong = semua halaman."""
+    if not (ranges or "").strip():
+        return list(range(1, num_pages + 1))
+    pages = set()
+    for start, end in parse_page_ranges(ranges, num_pages):
+        pages.update(range(start, end + 1))
+    return sorted(pages)
+
+
+def _open_doc(path: str, engine: str):
+    return pdfplumber.open(path) if engine == "pdfplumber" else PdfReader(path)
+
+
+def _extract_pages(doc, engine: str, pages: list) -> list:
+    results = []
+    for page_no in pages:
+        t0 = time.perf_counter()
+        page = doc.pages[page_no - 1]
+        text = page.extract_text() or ""
+        if engine == "pdfplumber" and hasattr(page, "close"):
+            # Lepas cache objek halaman pdfplumber agar memori worker tidak terus bertambah
+            page.close()
+        results.append((page_no, text, time.perf_counter() - t0))
+    return results
+
+
+def _init_worker(path: str, engine: str):
+    global _worker_doc, _worker_engine
+    _worker_doc = _open_doc(path, engine)
+    _worker_engine = engine
+
+
+def _worker_extract(pages: list) -> list:
+    return _extract_pages(_worker_doc, _worker_engine, pages)
+
+
+def page_count(path: str) -> int:
+    if PdfReader is not None:
+        return len(PdfReader(path).pages)
+    with pdfplumber.open(path) as doc:
+        return len(doc.pages)
+
+
+def iter_page_texts(source, engine: str = "auto", pages: list = None, workers: int = None):
+    """
+    Generator (halaman, teks, detik) sesuai urutan halaman.
+    `pages`: daftar nomor halaman 1-based (default semua). Dokumen kecil atau 1 worker diproses serial.
+    """
+    engine = resolve_engine(engine)
+    path, cleanup = source_to_path(source)
+    try:
+        if pages is None:
+            pages = list(range(1, page_count(path) + 1))
+        workers = workers or default_workers()
+        if workers <= 1 or len(pages) < TEXT_PARALLEL_MIN_PAGES:
+            doc = _open_doc(path, engine)
+            try:
+                for page_no in pages:
+                    yield from _extract_pages(doc, engine, [page_no])
+            finally:
+                if hasattr(doc, "close"):
+                    doc.close()
+            return
+        batches = chunked(pages, batch_size(len(pages), workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path, engine)) as ex:
+            for batch in ex.map(_worker_extract, batches):
+                yield from batch
+    finally:
+        if cleanup:
+            remove_quietly(path)
+
+
+def extract_page_texts(source, engine: str = "auto", pages: list = None, workers: int = None, progress=None) -> list:
+    """
+    Seperti iter_page_texts() tetapi mengembalikan list (halaman, teks, detik).
+    `progress(selesai, total)` dipanggil per halaman.
+    """
+    path, cleanup = source_to_path(source)
+    try:
+        if pages is None:
+            pages = list(range(1, page_count(path) + 1))
+        results = []
+        for item in iter_page_texts(path, engine, pages, workers):
+            results.append(item)
+            if progress:
+                progress(len(results), len(pages))
+        return results
+    finally:
+        if cleanup:
+            remove_quietly(path)
@@ -0,0 +1,321 @@
+"""
+Penjadwal terjemahan per chunk secara konkuren.
+Chunk dikirim ke backend lewat satu thread pool berukuran tetap (`workers`), dengan rate limit
+token bucket adaptif (rate dipotong setengah saat server membalas 429 lalu naik perlahan lagi
+setiap sukses), retry exponential backoff + jitter, dan timeout per percobaan. Percobaan yang
+melewati timeout tetap memegang slot worker sampai benar-benar selesai, sehingga jumlah thread dan
+permintaan yang berjalan ke backend tidak pernah melebihi `workers`; jika semua slot tertahan
+percobaan yang menggantung, chunk yang tersisa dianggap gagal setelah satu `timeout` lagi.
+Hasil dikembalikan sesuai urutan chunk. Semua callback progress dipanggil dari thread pemanggil
+(aman untuk Streamlit).
+
+Backend bersifat pluggable: `backend` adalah factory tanpa argumen yang mengembalikan objek
+dengan method translate(text). make_backend() menyediakan "google" (deep-translator).
+"""
+
+import heapq
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .translation_memory import normalize_segment
+
+GoogleTranslator = None
+try:
+    from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import (
+        InvalidSourceOrTargetLanguage,
+        LanguageNotSupportedException,
+        NotValidLength,
+        NotValidPayload,
+    )
+    # Kesalahan input/konfigurasi: percobaan ulang tidak akan menolong
+    NON_RETRYABLE = (InvalidSourceOrTargetLanguage, LanguageNotSupportedException, NotValidLength, NotValidPayload)
+except Exception:
+    NON_RETRYABLE = ()
+
+TRANSLATE_BACKENDS = ("google",)
+
+
+class TranslationError(RuntimeError):
+    """Chunk gagal diterjemahkan setelah semua percobaan."""
+
+
+class ThrottledError(RuntimeError):
+    """Dilempar backend saat server menolak karena batas permintaan terlampaui (HTTP 429)."""
+
+
+class TokenBucket:
+    """Rate limiter token bucket: rata-rata `rate` permintaan/detik, lonjakan maksimal `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = self.max_rate = float(rate)
+        self.capacity = float(capacity or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Mengambil satu token jika tersedia (mengembalikan 0), jika tidak detik sampai token berikutnya."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def slow_down(self, factor: float = 0.5, min_rate: float = 0.2):
+        """Menurunkan rate (mis. setelah HTTP 429) dan mengosongkan token yang tersisa."""
+        with self._lock:
+            self.rate = max(min_rate, self.rate * factor)
+            self._tokens = 0.0
+
+    def speed_up(self, step: float = 0.1):
+        """Menaikkan rate sedikit demi sedikit kembali ke rate awal (additive increase)."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + step)
+
+
+def make_backend(name: str, source: str = "auto", target: str = "en"):
+    """
+    Factory backend untuk translate_chunks(). GoogleTranslator tidak thread-safe (menyimpan parameter
+    request di instance), jadi tiap percobaan mendapat instance baru.
+    """
+    if name == "google":
+        if GoogleTranslator is None:
+            raise RuntimeError("Library `deep-translator` tidak ditemukan (pip install deep-translator)")
+        GoogleTranslator(source=source, target=target)  # validasi kode bahasa sekali di depan
+        return lambda: GoogleTranslator(source=source, target=target)
+    raise ValueError(f"Backend terjemahan tidak dikenal: {name} (pilihan: {', '.join(TRANSLATE_BACKENDS)})")
+
+
+def _attempt(backend, text: str) -> str:
+    return backend().translate(text)
+
+
+def translate_chunks(chunks: list, backend, workers: int = 4, rate: float = 5.0, burst: int = None,
+                     max_retries: int = 4, timeout: float = 30.0, backoff: float = 0.5, max_backoff: float = 16.0,
+                     should_translate=None, on_fail: str = "raise", progress=None) -> tuple:
+    """
+    Menerjemahkan `chunks` secara konkuren dan mengembalikan (hasil, stats) sesuai urutan input.
+    - should_translate(chunk): False -> chunk diteruskan apa adanya (default: chunk kosong dilewati)
+    - timeout: batas detik per percobaan; percobaan yang lewat batas dihitung gagal lalu diulang
+      (thread-nya tetap dihitung sebagai worker sibuk sampai backend mengembalikan hasil). Jika semua
+      slot tertahan percobaan yang ditinggalkan dan tidak ada yang selesai dalam `timeout` berikutnya,
+      chunk yang tersisa langsung gagal, sehingga lama pemanggilan tetap terbatas walau backend menggantung
+    - on_fail: "raise" (TranslationError) atau "keep" (teks asli dipakai, indeks dicatat di stats["failed"])
+    - progress(selesai, total) per chunk, dipanggil dari thread pemanggil.
+    stats: calls, retries, timeouts, throttled, failed, elapsed, final_rate.
+    """
+    should_translate = should_translate or (lambda c: bool(c.strip()))
+    bucket = TokenBucket(rate, burst)
+    out = list(chunks)
+    total = len(out)
+    stats = {"calls": 0, "retries": 0, "timeouts": 0, "throttled": 0, "failed": [], "elapsed": 0.0}
+    t_start = time.monotonic()
+
+    ready = []  # heap (waktu_siap, indeks, percobaan_ke)
+    done = 0
+    for i, chunk in enumerate(out):
+        if should_translate(chunk):
+            ready.append((0.0, i, 0))
+        else:
+            done += 1
+    heapq.heapify(ready)
+    if progress and done:
+        progress(done, total)
+
+    results = queue.Queue()
+    active = {}  # indeks -> (attempt_id, deadline, percobaan_ke)
+    running = set()  # attempt_id yang thread-nya masih berjalan (termasuk yang sudah ditinggalkan karena timeout)
+    next_attempt_id = 0
+    stalled_since = None  # waktu sejak semua slot dipegang percobaan yang ditinggalkan
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kay-translate")
+
+    def fail(idx: int, tries: int, err):
+        nonlocal done
+        if on_fail != "keep":
+            raise TranslationError(f"Chunk {idx + 1} gagal setelah {tries + 1} percobaan: {err}") from (err if isinstance(err, BaseException) else None)
+        stats["failed"].append(idx)
+        done += 1
+        if progress:
+            progress(done, total)
+
+    def retry_or_fail(idx: int, tries: int, err):
+        if tries < max_retries and not isinstance(err, NON_RETRYABLE):
+            stats["retries"] += 1
+            delay = min(max_backoff, backoff * (2 ** tries)) * random.uniform(0.5, 1.0)
+            heapq.heappush(ready, (time.monotonic() + delay, idx, tries + 1))
+            return
+        fail(idx, tries, err)
+
+    def submit(idx: int, attempt_id: int):
+        fut = pool.submit(_attempt, backend, out[idx])
+        # Dipanggil setelah future selesai: slot worker baru dilepas saat thread benar-benar bebas
+        fut.add_done_callback(lambda f: results.put((idx, attempt_id, f)))
+
+    try:
+        while ready or active:
+            now = time.monotonic()
+            # Mulai percobaan baru selama slot worker dan token rate limit tersedia
+            wait_for = None
+            while ready and len(running) < workers and ready[0][0] <= now:
+                wait_token = bucket.reserve()
+                if wait_token > 0:
+                    wait_for = wait_token
+                    break
+                _, idx, tries = heapq.heappop(ready)
+                next_attempt_id += 1
+                active[idx] = (next_attempt_id, now + timeout, tries)
+                running.add(next_attempt_id)
+                stats["calls"] += 1
+                submit(idx, next_attempt_id)
+
+            # Semua slot dipegang percobaan yang ditinggalkan: tunggu paling lama satu `timeout` lagi,
+            # setelah itu chunk yang tersisa digagalkan (backend dianggap menggantung)
+            if ready and not active and len(running) >= workers:
+                stalled_since = stalled_since or now
+                if now - stalled_since >= timeout:
+                    while ready:
+                        _, idx, tries = heapq.heappop(ready)
+                        fail(idx, tries, TimeoutError(f"semua {workers} worker menggantung lebih dari {timeout:.0f} s"))
+                    break
+            else:
+                stalled_since = None
+            deadlines = [d for _, d, _ in active.values()]
+            if stalled_since is not None:
+                deadlines.append(stalled_since + timeout)
+            if ready and len(running) < workers and wait_for is None:
+                deadlines.append(ready[0][0])
+            if wait_for is not None:
+                deadlines.append(now + wait_for)
+            block = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+            try:
+                idx, attempt_id, fut = results.get(timeout=block)
+                running.discard(attempt_id)
+            except queue.Empty:
+                idx = None
+            if idx is not None and idx in active and active[idx][0] == attempt_id:
+                _, _, tries = active.pop(idx)
+                value = fut.exception()
+                if value is None:
+                    out[idx] = fut.result()
+                    bucket.speed_up()
+                    done += 1
+                    if progress:
+                        progress(done, total)
+                else:
+                    if isinstance(value, ThrottledError) or type(value).__name__ == "TooManyRequests":
+                        stats["throttled"] += 1
+                        bucket.slow_down()
+                    retry_or_fail(idx, tries, value)
+
+            # Percobaan yang melewati timeout ditinggalkan (hasilnya diabaikan), tetapi tetap di `running`
+            now = time.monotonic()
+            for idx in [i for i, (_, deadline, _) in active.items() if deadline <= now]:
+                _, _, tries = active.pop(idx)
+                stats["timeouts"] += 1
+                retry_or_fail(idx, tries, TimeoutError(f"timeout {timeout:.0f} s"))
+    finally:
+        # Thread yang masih menunggu backend dibiarkan selesai sendiri; tugas yang belum mulai dibatalkan
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    stats["elapsed"] = time.monotonic() - t_start
+    stats["final_rate"] = bucket.rate
+    return out, stats
+
+
+# Pemisah antar segmen di dalam satu chunk (baris kosong dipertahankan oleh penerjemah)
+SEGMENT_SEPARATOR = "\n\n"
+_SEGMENT_SPLIT_RE = re.compile(r"\n\s*\n")
+
+
+def _pack_segments(texts: list, chunk_size: int) -> list:
+    """Mengelompokkan indeks segmen menjadi chunk dengan panjang total <= chunk_size."""
+    groups, current, size = [], [], 0
+    for k, text in enumerate(texts):
+        if current and size + len(text) + len(SEGMENT_SEPARATOR) > chunk_size:
+            groups.append(current)
+            current, size = [], 0
+        current.append(k)
+        size += len(text) + len(SEGMENT_SEPARATOR)
+    if current:
+        groups.append(current)
+    return groups
+
+
+def translate_segments(segments: list, backend, memory=None, engine: str = "", source: str = "auto",
+                       target: str = "en", chunk_size: int = 4500, should_translate=None, on_fail: str = "raise",
+                       progress=None, **schedule) -> tuple:
+    """
+    Menerjemahkan segmen (paragraf) dengan translation memory di depan jaringan.
+    1. Segmen dicari di `memory` (TranslationMemory) dengan kunci (engine, source, target, hash).
+    2. Sisanya dideduplikasi, dikemas ke chunk <= chunk_size, dikirim lewat translate_chunks(**schedule).
+    3. Hasil chunk dipecah kembali per segmen dan disimpan ke memory. Jika jumlah segmen hasil
+       tidak cocok, segmen chunk tersebut diterjemahkan ulang satu per satu.
+    Mengembalikan (hasil_sesuai_urutan, stats) dengan stats translate_chunks ditambah
+    segments, tm_hits, sent_segments.
+    """
+    should_translate = should_translate or (lambda s: bool(s.strip()))
+    out = list(segments)
+    todo = [i for i, s in enumerate(out) if should_translate(s)]
+    cached = memory.lookup(engine, source, target, [out[i] for i in todo]) if memory is not None else {}
+    for k, translation in cached.items():
+        out[todo[k]] = translation
+
+    # Segmen identik (mis. disclaimer di tiap halaman) cukup dikirim sekali
+    pending = {}
+    for k, i in enumerate(todo):
+        if k not in cached:
+            pending.setdefault(normalize_segment(out[i]), []).append(i)
+    texts = [out[idxs[0]] for idxs in pending.values()]
+    targets = list(pending.values())
+    translated = [None] * len(texts)
+
+    def run(groups: list, stats: dict = None) -> tuple:
+        chunks = [SEGMENT_SEPARATOR.join(texts[k] for k in g) for g in groups]
+        # Putaran ulang (stats sudah ada) tidak melaporkan progress: bar tetap penuh, tidak mundur ke 0
+        results, run_stats = translate_chunks(chunks, backend, on_fail=on_fail,
+                                              progress=progress if stats is None else None, **schedule)
+        if stats is not None:
+            for key in ("calls", "retries", "timeouts", "throttled"):
+                run_stats[key] += stats[key]
+            run_stats["elapsed"] += stats["elapsed"]
+        failed = set(run_stats["failed"])
+        retry = []
+        for n, (group, result) in enumerate(zip(groups, results)):
+            if n in failed:
+                continue
+            parts = [p.strip() for p in _SEGMENT_SPLIT_RE.split(result.strip())] if len(group) > 1 else [result.strip()]
+            if len(parts) == len(group):
+                for k, part in zip(group, parts):
+                    translated[k] = part
+            else:
+                retry.extend([k] for k in group)
+        return retry, run_stats
+
+    retry, stats = run(_pack_segments(texts, chunk_size)) if texts else ([], {
+        "calls": 0, "retries": 0, "timeouts": 0, "throttled": 0, "failed": [], "elapsed": 0.0,
+    })
+    if retry:
+        _, stats = run(retry, stats)
+
+    done = []
+    for k, idxs in enumerate(targets):
+        if translated[k] is None:
+            continue
+        done.append((texts[k], translated[k]))
+        for i in idxs:
+            out[i] = translated[k]
+    if memory is not None and done:
+        memory.store(engine, source, target, done)
+
+    stats["failed"] = [i for k, idxs in enumerate(targets) if translated[k] is None for i in idxs]
+    stats.update(segments=len(todo), tm_hits=len(cached), sent_segments=len(texts))
+    return out, stats
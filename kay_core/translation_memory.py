@@ -0,0 +1,158 @@
+"""
+Translation memory persisten (SQLite) tingkat segmen/paragraf.
+Laporan MCU sebagian besar berisi teks template yang sama (header, nama pemeriksaan, nilai rujukan,
+disclaimer); segmen yang pernah diterjemahkan diambil dari disk tanpa request jaringan.
+Kunci: (backend, bahasa sumber, bahasa tujuan, hash segmen yang dinormalisasi). Entri yang paling
+lama tidak dipakai dibuang saat ukuran total melewati `max_bytes`.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from .cache import cache_dir
+
+TM_MAX_BYTES = 256 * 1024 * 1024
+
+# Batas jumlah parameter per query IN (...) (SQLite lama: 999)
+_SQL_BATCH = 500
+
+_WS_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    engine TEXT NOT NULL,
+    src TEXT NOT NULL,
+    tgt TEXT NOT NULL,
+    seg_hash BLOB NOT NULL,
+    translation TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (engine, src, tgt, seg_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used);
+"""
+
+
+def normalize_segment(text: str) -> str:
+    """Normalisasi untuk pencocokan: Unicode NFC, spasi berturut-turut jadi satu, tanpa spasi tepi."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def segment_hash(text: str) -> bytes:
+    return hashlib.blake2b(normalize_segment(text).encode("utf-8"), digest_size=16).digest()
+
+
+class TranslationMemory:
+    """
+    Penyimpanan terjemahan per segmen di SQLite (aman dipakai lintas thread dan proses).
+    Statistik hits/misses/stores/evictions dihitung per instance; kolom `hits` per entri
+    menyimpan total pemakaian sepanjang umur file.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = TM_MAX_BYTES):
+        self.path = path or os.path.join(cache_dir(), "translation_memory.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def lookup(self, engine: str, src: str, tgt: str, segments: list) -> dict:
+        """Mengembalikan {indeks: terjemahan} untuk segmen yang sudah ada di memory."""
+        hashes = [segment_hash(s) for s in segments]
+        found = {}
+        with self._lock, self._conn:
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), _SQL_BATCH):
+                batch = unique[start:start + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                params = (engine, src, tgt, *batch)
+                found.update(self._conn.execute(
+                    f"SELECT seg_hash, translation FROM segments WHERE engine=? AND src=? AND tgt=? AND seg_hash IN ({marks})",
+                    params,
+                ).fetchall())
+                self._conn.execute(
+                    f"UPDATE segments SET last_used=?, hits=hits+1 WHERE engine=? AND src=? AND tgt=? AND seg_hash IN ({marks})",
+                    (time.time(), *params),
+                )
+        result = {i: found[h] for i, h in enumerate(hashes) if h in found}
+        self.hits += len(result)
+        self.misses += len(hashes) - len(result)
+        return result
+
+    def store(self, engine: str, src: str, tgt: str, pairs: list):
+        """Menyimpan list (segmen_sumber, terjemahan), lalu membuang entri lama jika melewati batas ukuran."""
+        now = time.time()
+        rows = [
+            (engine, src, tgt, segment_hash(seg), tr, len(seg.encode("utf-8")) + len(tr.encode("utf-8")) + 64, now)
+            for seg, tr in pairs
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments (engine, src, tgt, seg_hash, translation, nbytes, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.stores += len(rows)
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM segments").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Buang sampai 90% batas agar eviction tidak terjadi di setiap store berikutnya
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for engine, src, tgt, seg_hash, nbytes in self._conn.execute(
+            "SELECT engine, src, tgt, seg_hash, nbytes FROM segments ORDER BY last_used"
+        ):
+            victims.append((engine, src, tgt, seg_hash))
+            excess -= nbytes
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM segments WHERE engine=? AND src=? AND tgt=? AND seg_hash=?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, nbytes, lifetime_hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0), COALESCE(SUM(hits), 0) FROM segments"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries, "bytes": nbytes, "max_bytes": self.max_bytes,
+            "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores, "evictions": self.evictions, "lifetime_hits": lifetime_hits,
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM segments")
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_TM = None
+_TM_LOCK = threading.Lock()
+
+
+def translation_memory() -> TranslationMemory:
+    """Translation memory bersama untuk proses ini (dibuka saat pertama dipakai)."""
+    global _TM
+    with _TM_LOCK:
+        if _TM is None:
+            _TM = TranslationMemory()
+        return _TM
@@ -0,0 +1,186 @@
+"""
+Lapisan upload per sesi. Upload besar disalin sekali ke file di disk (cache_dir("uploads")/<sesi>/)
+dan tool menerima StoredUpload: objek path (os.PathLike) yang dibaca engine lewat memory map/file,
+sehingga tidak ada salinan bytes baru per operasi (temp file per panggilan, buffer reader, payload
+worker). Upload kecil tetap dipakai langsung dari memori. Total byte upload per sesi dibatasi kuota.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import weakref
+
+from .cache import cache_dir
+
+# Upload dengan ukuran >= batas ini di-spool ke disk; yang lebih kecil tetap di memori
+UPLOAD_SPOOL_MIN_BYTES = 8 * 1024 * 1024
+
+# Kuota total upload yang dipegang satu sesi (semua widget upload), bisa diubah lewat env
+UPLOAD_SESSION_QUOTA = int(os.environ.get("KAY_UPLOAD_QUOTA_MB", "1024")) * 1024 * 1024
+
+# Folder sesi yang tertinggal (server mati sebelum sesi ditutup) dibuang setelah umur ini
+UPLOAD_MAX_AGE = 24 * 3600
+
+
+class UploadQuotaError(ValueError):
+    """Upload baru membuat total upload sesi melewati kuota."""
+
+
+class StoredUpload(os.PathLike):
+    """Upload yang sudah di disk. Dipakai engine sebagai path; `name`/`size` seperti UploadedFile Streamlit."""
+
+    def __init__(self, name: str, path: str, size: int):
+        self.name = name
+        self.path = path
+        self.size = size
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self):
+        return f"StoredUpload({self.name!r}, {self.size} bytes)"
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def getvalue(self) -> bytes:
+        """Isi lengkap sebagai bytes (hanya untuk kode yang memang butuh bytes)."""
+        with self.open() as fh:
+            return fh.read()
+
+
+def _upload_size(upload) -> int:
+    size = getattr(upload, "size", None)
+    if size is None:
+        size = len(upload.getbuffer()) if hasattr(upload, "getbuffer") else os.fstat(upload.fileno()).st_size
+    return size
+
+
+def _upload_id(upload, size: int):
+    # file_id Streamlit berubah untuk setiap upload baru; tanpa itu dipakai nama + ukuran
+    return getattr(upload, "file_id", None) or (upload.name, size)
+
+
+def _write_upload(upload, path: str):
+    with open(path, "wb") as fh:
+        if hasattr(upload, "getbuffer"):
+            with upload.getbuffer() as view:
+                fh.write(view)
+        else:
+            upload.seek(0)
+            shutil.copyfileobj(upload, fh, 1024 * 1024)
+
+
+class UploadStore:
+    """
+    Upload milik satu sesi, dikelompokkan per widget. bind() dipanggil setiap rerun dengan isi widget:
+    file yang sama tidak disalin ulang, file yang sudah dilepas dari widget dihapus dari disk.
+    Folder sesi dihapus saat store ditutup atau objeknya dibuang (sesi berakhir).
+    """
+
+    def __init__(self, root: str = None, quota: int = UPLOAD_SESSION_QUOTA, spool_min: int = UPLOAD_SPOOL_MIN_BYTES):
+        base = root or cache_dir("uploads")
+        cleanup_stale_uploads(base)
+        self.root = tempfile.mkdtemp(prefix="session_", dir=base)
+        self.quota = quota
+        self.spool_min = spool_min
+        self._slots = {}  # widget -> {upload_id: (objek untuk tool, ukuran)}
+        self._bound = set()
+        self._run_open = False
+        self._counter = 0
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.root, True)
+
+    @property
+    def used(self) -> int:
+        return sum(size for slot in self._slots.values() for _, size in slot.values())
+
+    def bind(self, key: str, files):
+        """
+        Mendaftarkan isi widget upload `key` (None, satu file, atau list) dan mengembalikan bentuk yang sama
+        dengan upload besar diganti StoredUpload. UploadQuotaError jika total sesi melewati kuota
+        (isi widget sebelumnya tetap terdaftar).
+        """
+        self._bound.add(key)
+        if not files:
+            self.release(key)
+            return files
+        single = not isinstance(files, (list, tuple))
+        uploads = [files] if single else list(files)
+        previous = self._slots.get(key, {})
+        sizes = [_upload_size(u) for u in uploads]
+        ids = [_upload_id(u, size) for u, size in zip(uploads, sizes)]
+        total = self.used - sum(size for _, size in previous.values()) + sum(sizes)
+        if total > self.quota:
+            raise UploadQuotaError(
+                f"Total upload sesi ini {total / 1024 / 1024:.1f} MB melebihi kuota {self.quota / 1024 / 1024:.1f} MB. "
+                "Kurangi jumlah/ukuran file atau hapus upload di tool lain."
+            )
+        slot = {}
+        for upload, size, upload_id in zip(uploads, sizes, ids):
+            if upload_id in previous:
+                slot[upload_id] = previous.pop(upload_id)
+            elif size >= self.spool_min:
+                os.makedirs(self.root, exist_ok=True)
+                self._counter += 1
+                path = os.path.join(self.root, f"{self._counter:06d}{os.path.splitext(upload.name)[1]}")
+                _write_upload(upload, path)
+                slot[upload_id] = (StoredUpload(upload.name, path, size), size)
+            else:
+                slot[upload_id] = (upload, size)
+        self._drop(previous)
+        self._slots[key] = slot
+        items = [slot[upload_id][0] for upload_id in ids]
+        return items[0] if single else items
+
+    def _drop(self, entries: dict):
+        for item, _ in entries.values():
+            if isinstance(item, StoredUpload):
+                # File yang masih dibuka (mmap reader di cache, job) tetap terbaca sampai ditutup
+                try:
+                    os.unlink(item.path)
+                except OSError:
+                    pass
+
+    def release(self, key: str):
+        """Melepas semua upload milik widget `key`."""
+        self._drop(self._slots.pop(key, {}))
+
+    def begin_run(self):
+        """
+        Dipanggil di awal run script, sebelum kode yang bisa memanggil st.stop()/st.rerun().
+        Jika run sebelumnya berhenti sebelum release_unbound(), pelepasannya dilakukan di sini.
+        """
+        if self._run_open:
+            self.release_unbound()
+        self._bound = set()
+        self._run_open = True
+
+    def release_unbound(self):
+        """Melepas upload widget yang tidak di-bind sejak pemanggilan terakhir (tool lain sedang dibuka)."""
+        for key in list(self._slots):
+            if key not in self._bound:
+                self.release(key)
+        self._bound = set()
+        self._run_open = False
+
+    def stats(self) -> dict:
+        items = [item for slot in self._slots.values() for item, _ in slot.values()]
+        return {"used": self.used, "quota": self.quota, "files": len(items),
+                "spooled": sum(isinstance(item, StoredUpload) for item in items)}
+
+    def close(self):
+        self._slots = {}
+        self._finalizer()
+
+
+def cleanup_stale_uploads(root: str = None, max_age: float = UPLOAD_MAX_AGE) -> int:
+    """Menghapus folder sesi upload yang lebih tua dari `max_age` detik. Mengembalikan jumlah folder dihapus."""
+    root = root or cache_dir("uploads")
+    removed = 0
+    now = time.time()
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.name.startswith("session_") and now - entry.stat().st_mtime > max_age:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
@@ -0,0 +1,216 @@
+"""
+Watermark PDF dengan satu Form XObject bersama.
+Halaman watermark diubah sekali menjadi Form XObject, lalu setiap halaman hanya
+mendapat referensi ke objek yang sama (tanpa menyalin/mem-parse ulang content stream).
+Dokumen besar dipecah menjadi potongan halaman yang diproses paralel (satu proses
+per potongan); tiap potongan ditulis langsung dengan nomor objek final lalu disambung
+berurutan oleh StreamingPdfMerger.
+"""
+
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import traceback
+
+from .merge import StreamingPdfMerger, count_writer_objects, write_writer_objects
+from .parallel import default_workers
+from .spool import new_spool, remove_quietly, source_to_path
+
+PdfReader = PdfWriter = None
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        IndirectObject,
+        NameObject,
+        NumberObject,
+        RectangleObject,
+    )
+except Exception:
+    pass
+
+# Ukuran potongan minimum; dokumen yang muat dalam satu potongan diproses di satu proses saja
+WATERMARK_CHUNK_PAGES = 500
+
+WATERMARK_NAME = "/KayWM"
+
+
+def _stream(data: bytes):
+    s = DecodedStreamObject()
+    s._data = data
+    return s
+
+
+def _content_bytes(page) -> bytes:
+    """Isi content stream halaman (tunggal atau array) sebagai bytes yang sudah di-decode."""
+    contents = page.get_contents()
+    if contents is None:
+        return b""
+    if isinstance(contents, ArrayObject):
+        return b"\n".join(c.get_object().get_data() for c in contents)
+    return contents.get_data()
+
+
+class _WatermarkStamper:
+    """Menyimpan objek watermark bersama (Form XObject + operator q/Q) di satu PdfWriter."""
+
+    def __init__(self, writer, wm_page):
+        self.writer = writer
+        form = _stream(_content_bytes(wm_page)).flate_encode()
+        form.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/FormType"): NumberObject(1),
+            NameObject("/BBox"): RectangleObject(wm_page.mediabox),
+        })
+        res = wm_page.get("/Resources")
+        if res is not None:
+            form[NameObject("/Resources")] = res.get_object().clone(writer)
+        self.form_ref = writer._add_object(form)
+        # Isi halaman asli dibungkus q ... Q agar state grafisnya tidak bocor ke watermark
+        self.push_ref = writer._add_object(_stream(b"q\n"))
+        self._do_refs = {}
+
+    def _do_ref(self, name: str):
+        if name not in self._do_refs:
+            self._do_refs[name] = self.writer._add_object(_stream(f"\nQ\nq {name} Do Q\n".encode()))
+        return self._do_refs[name]
+
+    def stamp(self, page):
+        """Menambahkan watermark ke halaman (yang sudah berada di writer)."""
+        res = page.get("/Resources")
+        if res is None:
+            res = DictionaryObject()
+            page[NameObject("/Resources")] = res
+        res = res.get_object()
+        xobjs = res.get("/XObject")
+        if xobjs is None:
+            xobjs = DictionaryObject()
+            res[NameObject("/XObject")] = xobjs
+        xobjs = xobjs.get_object()
+
+        name, n = WATERMARK_NAME, 0
+        while name in xobjs and dict.__getitem__(xobjs, name) != self.form_ref:
+            n += 1
+            name = f"{WATERMARK_NAME}{n}"
+        xobjs[NameObject(name)] = self.form_ref
+
+        contents = page.get(NameObject("/Contents"))
+        raw = dict.get(page, "/Contents")
+        if raw is None:
+            parts = []
+        elif isinstance(raw, IndirectObject) and isinstance(contents, ArrayObject):
+            parts = list(contents)
+        elif isinstance(raw, IndirectObject):
+            parts = [raw]
+        elif isinstance(raw, ArrayObject):
+            parts = list(raw)
+        else:
+            parts = [self.writer._add_object(raw)]
+        page[NameObject("/Contents")] = ArrayObject([self.push_ref] + parts + [self._do_ref(name)])
+
+
+def _watermark_range(base_reader, wm_page, start: int, end: int):
+    writer = PdfWriter()
+    stamper = _WatermarkStamper(writer, wm_page)
+    for i in range(start, end):
+        stamper.stamp(writer.add_page(base_reader.pages[i]))
+    return writer
+
+
+def _chunk_process(conn, base_path: str, wm_path: str, start: int, end: int, part_path: str):
+    """
+    Proses worker untuk satu potongan halaman. Protokol dengan proses induk:
+    kirim jumlah objek -> terima nomor objek awal -> tulis file bagian -> kirim (kids, offset).
+    """
+    try:
+        writer = _watermark_range(PdfReader(base_path), PdfReader(wm_path).pages[0], start, end)
+        conn.send(("count", count_writer_objects(writer)))
+        first_id = conn.recv()
+        with open(part_path, "wb") as fh:
+            kids, offsets, _ = write_writer_objects(writer, fh, first_id, StreamingPdfMerger.PAGES_ID)
+        conn.send(("done", (kids, offsets)))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _expect(conn, kind: str):
+    tag, payload = conn.recv()
+    if tag == "error":
+        raise RuntimeError(f"Worker watermark gagal:\n{payload}")
+    assert tag == kind, tag
+    return payload
+
+
+def _watermark_parallel(base_path: str, wm_path: str, bounds: list, out, progress=None):
+    """
+    Setiap potongan diproses di proses terpisah dan langsung diserialisasi ke file bagian
+    dengan nomor objek yang sudah dipesan, sehingga proses induk cukup menyalin byte-nya.
+    """
+    ctx = mp.get_context()
+    merger = StreamingPdfMerger(out)
+    tmpdir = tempfile.mkdtemp(prefix="kay_wm_")
+    procs = []
+    try:
+        for k, (start, end) in enumerate(bounds):
+            parent, child = ctx.Pipe()
+            part = os.path.join(tmpdir, f"part_{k}.bin")
+            proc = ctx.Process(target=_chunk_process, args=(child, base_path, wm_path, start, end, part), daemon=True)
+            proc.start()
+            child.close()
+            procs.append((proc, parent, part))
+        # Nomor objek dipesan berurutan sesuai urutan potongan
+        for proc, conn, _ in procs:
+            conn.send(merger.reserve_ids(_expect(conn, "count")))
+        for k, (proc, conn, part) in enumerate(procs):
+            kids, offsets = _expect(conn, "done")
+            merger.append_part(part, kids, offsets)
+            remove_quietly(part)
+            if progress:
+                progress(k + 1, len(procs))
+        return merger.finish(), merger.page_count
+    finally:
+        for proc, conn, _ in procs:
+            conn.close()
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def watermark_pdf(base, watermark, out=None, workers: int = None, chunk_pages: int = WATERMARK_CHUNK_PAGES, progress=None):
+    """
+    Menerapkan halaman pertama `watermark` ke semua halaman `base` (path/bytes/file-like).
+    `progress(selesai, total)` dipanggil per potongan. Mengembalikan (file_output, jumlah_halaman).
+    """
+    if PdfReader is None:
+        raise RuntimeError("PyPDF2 tidak terinstall (pip install PyPDF2)")
+    base_path, base_tmp = source_to_path(base)
+    wm_path, wm_tmp = source_to_path(watermark)
+    try:
+        num_pages = len(PdfReader(base_path).pages)
+        workers = workers or default_workers()
+        # Jumlah potongan dibatasi sebanyak worker: tiap potongan membawa satu salinan Form XObject
+        chunk_pages = max(chunk_pages, -(-num_pages // workers))
+        bounds = [(a, min(a + chunk_pages, num_pages)) for a in range(0, num_pages, chunk_pages)]
+        out = out if out is not None else new_spool()
+
+        if workers <= 1 or len(bounds) <= 1:
+            writer = _watermark_range(PdfReader(base_path), PdfReader(wm_path).pages[0], 0, num_pages)
+            writer.write(out)
+            out.seek(0)
+            if progress:
+                progress(1, 1)
+            return out, num_pages
+
+        return _watermark_parallel(base_path, wm_path, bounds, out, progress)
+    finally:
+        if base_tmp:
+            remove_quietly(base_path)
+        if wm_tmp:
+            remove_quietly(wm_path)
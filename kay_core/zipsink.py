@@ -0,0 +1,204 @@
+"""
+ZIP writer bertahap (pengganti make_zip_from_map).
+Entri ditulis langsung ke spooled temp file begitu hasilnya tersedia, mendukung ZIP64,
+dan memilih STORED/DEFLATED per entri: data yang sudah terkompres (PDF, JPEG, PNG, ZIP,
+Office) disimpan apa adanya agar tidak membuang CPU.
+DirSink punya antarmuka yang sama tetapi menulis file biasa ke folder (dipakai CLI batch).
+"""
+
+import os
+import shutil
+import time
+import zipfile
+
+from .spool import new_spool, spool_to_bytes
+
+# Format yang isinya sudah terkompres: DEFLATE hampir tidak mengurangi ukuran
+STORED_EXTENSIONS = {
+    ".pdf", ".jpg", ".jpeg", ".png", ".webp", ".gif", ".heic",
+    ".zip", ".gz", ".7z", ".rar", ".xz", ".bz2",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods",
+    ".mp3", ".mp4", ".mov", ".avi", ".parquet",
+}
+
+# Tanda awal (magic bytes) format terkompres, untuk nama file tanpa ekstensi yang jelas
+STORED_MAGIC = (b"%PDF", b"\xff\xd8\xff", b"\x89PNG", b"PK\x03\x04", b"GIF8", b"RIFF", b"\x1f\x8b")
+
+# Di atas batas ini (mendekati 2 GiB) entri yang ukurannya tidak diketahui memakai ZIP64
+ZIP64_THRESHOLD = int(zipfile.ZIP64_LIMIT * 0.9)
+
+COPY_CHUNK = 1024 * 1024
+
+
+def compression_for(name: str, head: bytes = b"") -> int:
+    """Memilih ZIP_STORED untuk data yang sudah terkompres, ZIP_DEFLATED untuk sisanya."""
+    ext = os.path.splitext(name)[1].lower()
+    if ext in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    if head and head.startswith(STORED_MAGIC):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class ZipSink:
+    """
+    Penampung ZIP inkremental di atas spooled temp file.
+
+    sink = ZipSink()
+    sink.add("a.txt", b"...")          # dari bytes
+    sink.add_file("b.pdf", uploaded)   # dari path / file-like (disalin per blok)
+    data = sink.getvalue()
+    """
+
+    def __init__(self, out=None, compresslevel: int = 6):
+        self.out = out if out is not None else new_spool()
+        self._zip = zipfile.ZipFile(self.out, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel)
+        self._names = set()
+        self.count = 0
+        self.bytes_in = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _unique(self, name: str) -> str:
+        """Nama entri duplikat diberi akhiran _2, _3, ... agar tidak saling menimpa."""
+        if name not in self._names:
+            self._names.add(name)
+            return name
+        base, ext = os.path.splitext(name)
+        n = 2
+        while f"{base}_{n}{ext}" in self._names:
+            n += 1
+        name = f"{base}_{n}{ext}"
+        self._names.add(name)
+        return name
+
+    def _zinfo(self, name: str, head: bytes = b"") -> zipfile.ZipInfo:
+        zinfo = zipfile.ZipInfo(self._unique(name), date_time=time.localtime(time.time())[:6])
+        zinfo.compress_type = compression_for(name, head)
+        zinfo.external_attr = 0o600 << 16
+        return zinfo
+
+    def add(self, name: str, data: bytes) -> str:
+        """Menambahkan entri dari bytes. Mengembalikan nama entri yang dipakai."""
+        zinfo = self._zinfo(name, data[:8])
+        self._zip.writestr(zinfo, data)
+        self.count += 1
+        self.bytes_in += len(data)
+        return zinfo.filename
+
+    def add_file(self, name: str, src) -> str:
+        """Menambahkan entri dari path atau file-like (misal UploadedFile) tanpa membaca semuanya ke RAM."""
+        if isinstance(src, (str, os.PathLike)):
+            with open(src, "rb") as fh:
+                return self.add_file(name, fh)
+        if hasattr(src, "seek"):
+            src.seek(0)
+        size = getattr(src, "size", None)
+        if size is None:
+            try:
+                size = os.fstat(src.fileno()).st_size
+            except Exception:
+                size = None
+        head = src.peek(8)[:8] if hasattr(src, "peek") else b""
+        zinfo = self._zinfo(name, head)
+        force_zip64 = size is None or size > ZIP64_THRESHOLD
+        with self._zip.open(zinfo, "w", force_zip64=force_zip64) as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK)
+        self.count += 1
+        self.bytes_in += zinfo.file_size
+        return zinfo.filename
+
+    def close(self):
+        """Menutup arsip (menulis central directory). Mengembalikan file output di posisi awal."""
+        if self._zip.fp is not None:
+            self._zip.close()
+        self.out.seek(0)
+        return self.out
+
+    def getvalue(self) -> bytes:
+        """Menutup arsip dan mengembalikan isinya sebagai bytes (untuk st.download_button)."""
+        return spool_to_bytes(self.close())
+
+
+class DirSink(ZipSink):
+    """
+    Penampung dengan antarmuka ZipSink yang menulis file langsung ke folder `root`
+    (subfolder dari nama entri dibuat otomatis). close() mengembalikan path folder.
+    """
+
+    def __init__(self, root: str):
+        self.out = os.path.abspath(root)
+        os.makedirs(self.out, exist_ok=True)
+        self._names = set()
+        self.count = 0
+        self.bytes_in = 0
+
+    def _target(self, name: str) -> str:
+        # Nama entri dari Excel tidak boleh keluar dari folder output (../, path absolut)
+        parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+        name = self._unique("/".join(parts) or "file")
+        path = os.path.join(self.out, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def add(self, name: str, data: bytes) -> str:
+        path = self._target(name)
+        with open(path, "wb") as fh:
+            fh.write(data)
+        self.count += 1
+        self.bytes_in += len(data)
+        return path
+
+    def add_file(self, name: str, src) -> str:
+        path = self._target(name)
+        if isinstance(src, (str, os.PathLike)):
+            shutil.copyfile(src, path)
+        else:
+            if hasattr(src, "seek"):
+                src.seek(0)
+            with open(path, "wb") as fh:
+                shutil.copyfileobj(src, fh, COPY_CHUNK)
+        self.count += 1
+        self.bytes_in += os.path.getsize(path)
+        return path
+
+    def close(self):
+        return self.out
+
+    def getvalue(self) -> bytes:
+        raise TypeError("DirSink menulis ke folder; tidak ada isi arsip untuk dikembalikan")
+
+
+def as_sink(out=None):
+    """`out` yang sudah berupa sink (ZipSink/DirSink) dipakai langsung; selain itu dibungkus ZipSink(out)."""
+    return out if isinstance(out, ZipSink) else ZipSink(out)
+
+
+def zip_files(sources: list, out=None, progress=None) -> tuple:
+    """`sources`: list (nama, path/file-like) -> ZIP. Mengembalikan (output, jumlah_file)."""
+    sink = as_sink(out)
+    for i, (name, src) in enumerate(sources, 1):
+        sink.add_file(name, src)
+        if progress:
+            progress(i, len(sources))
+    return sink.close(), sink.count
+
+
+def extract_zip(source, out=None, progress=None) -> tuple:
+    """
+    Isi arsip ZIP (path/file-like) disalin per entri ke sink: DirSink = ekstrak ke folder,
+    ZipSink = arsip baru tanpa entri folder. Mengembalikan (output, jumlah_file).
+    """
+    sink = as_sink(out)
+    with zipfile.ZipFile(source) as z:
+        members = [info for info in z.infolist() if not info.is_dir()]
+        for i, info in enumerate(members, 1):
+            with z.open(info) as member:
+                sink.add_file(info.filename, member)
+            if progress:
+                progress(i, len(members))
+    return sink.close(), sink.count
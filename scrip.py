@@ -7,16 +7,12 @@ KAY App - FINAL SINGLE PAGE APP (SPA) - VERSI DIPERBARUI & TAMPILAN LEBIH MENARI
 """
 
 import os
-import io
-import zipfile
-import shutil
 import traceback
-import tempfile
 import time
+import secrets
 
 import streamlit as st
 import pandas as pd
-from PIL import Image
 
 # PDF libs
 PdfReader = PdfWriter = None
@@ -31,26 +27,6 @@ try:
 except Exception:
     pass
 
-Document = None
-try:
-    from docx import Document
-except Exception:
-    pass
-
-# pdf2image: try both convert_from_bytes and convert_from_path availability
-PDF2IMAGE_AVAILABLE = False
-convert_from_bytes = convert_from_path = None
-try:
-    from pdf2image import convert_from_bytes, convert_from_path 
-    PDF2IMAGE_AVAILABLE = True
-except Exception:
-    try:
-        from pdf2image import convert_from_path
-        PDF2IMAGE_AVAILABLE = True
-        convert_from_bytes = None
-    except Exception:
-        pass # convert_from_path and convert_from_bytes remain None
-
 # New imports for translation
 Translator = None
 try:
@@ -59,44 +35,168 @@ try:
 except Exception:
     pass # Peringatan akan ditampilkan di fitur Translate PDF jika gagal impor
 
+# Mesin pemrosesan tanpa UI (bisa dipakai ulang oleh worker/multiprocessing)
+from kay_core import (
+    DEFAULT_TABLE_SETTINGS, DOCX_AVAILABLE, DOCX_MIME, EXPORT_FORMATS, FIT_MODES, FOLDER_COLUMNS, JOB_MAX_AGE,
+    MCU_COLUMNS, PAGE_SIZES, PDF2IMAGE_AVAILABLE, PIKEPDF_AVAILABLE, PREVIEW_DPI, PREVIEW_PAGE_SIZE,
+    RASTER_WINDOW, RENAME_COLUMNS, ROTATE_ANGLES, TABLE_STRATEGIES, UploadQuotaError, UploadStore, ZipSink,
+    available_export_formats, cached_extraction, cached_page_count, cached_profile, compress_images_to_zip,
+    compress_pdf, content_hash, convert_images_to_zip, decrypt_pdf, encrypt_pdf, export_dataframe,
+    extract_zip, images_to_pdf, job_fingerprint, job_runner, lock_task, merge_task, page_texts,
+    page_texts_frame, page_texts_to_docx, page_texts_to_text, parse_page_order, plan_lock_jobs, plan_organise,
+    plan_rename, plan_sequential_rename, rasterize_task, read_table, remove_pages, render_thumbnails,
+    reorder_pages, rotate_pages, select_pages, split_pdf_to_zip, spool_reader, spool_to_bytes, tables_to_xlsx,
+    translate_task, translation_memory, watermark_pdf, write_organised, zip_files,
+)
+
 # ----------------- Helpers -----------------
-def make_zip_from_map(bytes_map: dict) -> bytes:
-    b = io.BytesIO()
-    with zipfile.ZipFile(b, "w") as z:
-        for name, data in bytes_map.items():
-            z.writestr(name, data)
-    b.seek(0)
-    return b.getvalue()
-
-def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
-    out = io.BytesIO()
-    # Menggunakan openpyxl sebagai engine
-    with pd.ExcelWriter(out, engine="openpyxl") as writer: 
-        df.to_excel(writer, index=False)
-    out.seek(0)
-    return out.getvalue()
-
-def try_encrypt(writer, password: str):
-    """Fungsi untuk enkripsi PDF, menampung try/except"""
-    try:
-        writer.encrypt(password)
-    except TypeError:
-        try:
-            writer.encrypt(user_pwd=password, owner_pwd=None)
-        except Exception:
-            writer.encrypt(user_pwd=password, owner_pwd=password)
-
-def rotate_page_safe(page, angle):
-    """Fungsi untuk rotasi halaman PDF."""
+# Semua output ZIP memakai ZipSink (kay_core): ditulis bertahap ke temp file, bukan dict di RAM.
+def df_to_excel(df: pd.DataFrame):
+    """Data unduhan Excel yang ditunda: workbook baru ditulis saat tombol unduh diklik, bukan di setiap rerun."""
+    def build() -> bytes:
+        # Workbook write-only ke spooled temp file (memori konstan, tanpa object tree openpyxl per sel)
+        with export_dataframe(df, "xlsx") as out:
+            return spool_to_bytes(out)
+    return build
+
+EXPORT_LABELS = {"xlsx": "Excel (.xlsx)", "csv": "CSV (.csv, tercepat)", "parquet": "Parquet (.parquet, paling ringkas)"}
+
+def dataframe_download(df: pd.DataFrame, file_stem: str, key: str, cache_key=None):
+    """
+    Pilihan format (Excel/CSV/Parquet) + tombol unduh untuk frame besar.
+    File hanya dibuat saat tombol 'Siapkan' ditekan (bukan di setiap rerun) dan disimpan
+    di session_state selama data/format yang dipilih tidak berubah.
+    """
+    fmt = st.radio("Format unduhan", available_export_formats(), format_func=EXPORT_LABELS.get, horizontal=True, key=f"{key}_fmt")
+    slot = f"{key}_export"
+    ident = (cache_key, fmt, len(df))
+    if st.button("Siapkan file unduhan", key=f"{key}_prepare"):
+        with st.spinner(f"Menulis {len(df)} baris ke {EXPORT_LABELS[fmt]}..."):
+            old = st.session_state.pop(slot, None)
+            if old:
+                old[1].close()
+            # Spool (RAM -> disk) disimpan apa adanya; isinya baru dibaca saat tombol unduh diklik
+            st.session_state[slot] = (ident, export_dataframe(df, fmt))
+    ready = st.session_state.get(slot)
+    if ready and ready[0] == ident:
+        ext, mime = EXPORT_FORMATS[fmt]
+        st.download_button(f" Unduh {file_stem}{ext}", spool_reader(ready[1]), file_name=f"{file_stem}{ext}", mime=mime, key=f"{key}_download")
+    elif ready:
+        del st.session_state[slot]  # data/format sudah berubah: hapus file lama
+        ready[1].close()
+
+def extract_texts_ui(f, ranges_str: str = "", engine: str = "auto") -> list:
+    """Ekstraksi teks per halaman (paralel, di-cache) dengan progress bar dan ringkasan waktu per halaman."""
     try:
-        page.rotate(angle)
-    except Exception:
-        try:
-            from PyPDF2.generic import NameObject, NumberObject
-            page.__setitem__(NameObject("/Rotate"), NumberObject(angle))
-        except Exception:
-            pass
+        pages = select_pages(ranges_str, cached_page_count(f)) if ranges_str.strip() else None
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    prog = st.progress(0)
+    results = cached_extraction(f, engine, pages, progress=lambda i, total: prog.progress(int(i/total*100)))
+    prog.progress(100)
+    if results:
+        total_s = sum(r[2] for r in results)
+        slowest = max(results, key=lambda r: r[2])
+        with st.expander(f"Waktu ekstraksi: {total_s:.2f} s untuk {len(results)} halaman (terlama: hal. {slowest[0]}, {slowest[2]:.2f} s)"):
+            st.dataframe(pd.DataFrame([(p, round(sec, 3)) for p, _, sec in results], columns=["page", "detik"]), use_container_width=True)
+    return results
           
+# ----------------- Upload -----------------
+# Semua widget upload lewat UploadStore per sesi (kay_core): upload besar disalin sekali ke disk dan
+# tool menerima objek path (dibaca lewat memory map/file), total upload per sesi dibatasi kuota.
+def upload_store() -> UploadStore:
+    if "upload_store" not in st.session_state:
+        st.session_state.upload_store = UploadStore()
+    return st.session_state.upload_store
+
+def file_uploader(label: str, **kwargs):
+    """st.file_uploader + UploadStore: upload besar diganti StoredUpload; melewati kuota -> pesan error dan None."""
+    files = st.file_uploader(label, **kwargs)
+    try:
+        return upload_store().bind(kwargs.get("key") or label, files)
+    except UploadQuotaError as e:
+        st.error(str(e))
+        return None
+
+# ----------------- Job latar belakang -----------------
+# Operasi panjang dijalankan oleh job runner kay_core (thread pool di server); UI hanya menyimpan
+# job_id di session_state dan memantau progress lewat fragment yang diperbarui tiap detik.
+JOB_STATE_LABELS = {"queued": "Menunggu", "running": "Berjalan", "done": "Selesai", "failed": "Gagal", "cancelled": "Dibatalkan"}
+
+JOB_OWNER_COOKIE = "kay_job_owner"
+
+def valid_job_owner(token) -> bool:
+    return isinstance(token, str) and 32 <= len(token) <= 64 and all(c.isalnum() or c in "-_" for c in token)
+
+def job_owner() -> str:
+    """
+    Token pemilik job: acak dan dibuat server (tidak pernah diambil dari URL). Disimpan di cookie browser
+    agar riwayat job tetap bisa dibuka setelah refresh; di browser lain dipakai lewat kode riwayat.
+    """
+    if "job_owner" not in st.session_state:
+        token = st.context.cookies.get(JOB_OWNER_COOKIE)
+        st.session_state.job_owner = token if valid_job_owner(token) else secrets.token_urlsafe(32)
+    return st.session_state.job_owner
+
+def remember_job_owner():
+    """Menulis token pemilik ke cookie browser jika cookie yang terbaca saat sesi dibuka belum sama."""
+    token = job_owner()
+    if st.context.cookies.get(JOB_OWNER_COOKIE) != token:
+        st.html(f"<script>document.cookie = '{JOB_OWNER_COOKIE}={token}; path=/; max-age={JOB_MAX_AGE}; samesite=strict';</script>",
+                unsafe_allow_javascript=True)
+
+def start_job(slot: str, kind: str, task, inputs: list, title: str, **params):
+    """Mengirim job (input + parameter yang sama -> hasil job sebelumnya dipakai ulang) dan menyimpan id-nya di session_state[slot]."""
+    # HMAC dengan token owner: password batch lock tidak bisa ditebak dari fingerprint di job.json
+    fingerprint = job_fingerprint(kind, [src for _, src in inputs], secret=job_owner(), **params)
+    st.session_state[slot] = job_runner().submit(kind, task, inputs, title=title, owner=job_owner(), fingerprint=fingerprint, **params)
+
+def job_downloads(job: dict, key: str):
+    """Tombol unduh untuk file hasil job (dibaca dari job store, tanpa menghitung ulang)."""
+    for i, res in enumerate(job["results"]):
+        path = job_runner().result_path(job["id"], res["name"])
+        if not os.path.exists(path):
+            st.warning(f"File hasil {res['name']} sudah dibersihkan dari server.")
+            continue
+        with open(path, "rb") as fh:
+            st.download_button(f"Download {res['name']}", fh.read(), file_name=res["name"], mime=res["mime"], key=f"{key}_{job['id']}_{i}")
+
+@st.fragment(run_every=1.0)
+def job_progress(job_id: str):
+    """Progress job aktif; hanya fragment ini yang dijalankan ulang tiap detik. Setelah job selesai seluruh halaman di-rerun."""
+    job = job_runner().status(job_id, owner=job_owner())
+    if job is None or job["state"] not in ("queued", "running"):
+        st.rerun()
+    total = job["total"] or 0
+    label = f"{job['title']} — {JOB_STATE_LABELS[job['state']]}"
+    if job["message"]:
+        label += f" ({job['message']})"
+    st.progress(min(job["done"] / total, 1.0) if total else 0.0, text=f"{label}: {job['done']}/{total or '?'}")
+    if st.button("Batalkan job", key=f"cancel_{job_id}"):
+        job_runner().cancel(job_id, owner=job_owner())
+
+def job_panel(slot: str, show_summary=None):
+    """Status job di session_state[slot]: progress saat berjalan, lalu ringkasan + unduhan saat selesai."""
+    job_id = st.session_state.get(slot)
+    job = job_runner().status(job_id, owner=job_owner()) if job_id else None
+    if job is None:
+        st.session_state.pop(slot, None)
+        return
+    remember_job_owner()
+    if job["state"] in ("queued", "running"):
+        st.caption("Job berjalan di latar belakang: halaman boleh ditinggalkan, hasil tersedia di menu Riwayat Job.")
+        job_progress(job_id)
+    elif job["state"] == "done":
+        st.success(f"{job['title']} selesai ({time.strftime('%d-%m-%Y %H:%M', time.localtime(job['finished']))}).")
+        if show_summary:
+            show_summary(job["summary"])
+        job_downloads(job, slot)
+    elif job["state"] == "failed":
+        st.error(f"{job['title']} gagal: {job['error']}")
+    else:
+        st.warning(f"{job['title']} dibatalkan.")
+
 def navigate_to(target_menu):
     """Helper global untuk navigasi antar halaman/menu."""
     st.session_state.menu_selection = target_menu
@@ -231,6 +331,10 @@ with header_col2:
 st.markdown("---")
 
 
+# Dipanggil sebelum halaman mana pun: run yang terhenti st.stop() tidak sampai ke release_unbound() di akhir
+upload_store().begin_run()
+
+
 # -----------------------------------------------------------------------------
 # ----------------- FUNGSI UTAMA -----------------
 # -----------------------------------------------------------------------------
@@ -289,9 +393,12 @@ if menu == "Dashboard":
             if st.button("Lihat Tentang", key="dash_about"):
                 navigate_to("Tentang")
 
-    # Kolom kosong (dibuat 3 kolom agar layout tetap rapi)
+    # Riwayat Job
     with cols2[2]:
-        st.markdown('<div class="feature-card" style="visibility:hidden; height: 100%;">.</div>', unsafe_allow_html=True)
+        with st.container():
+            st.markdown('<div class="feature-card"><b> Riwayat Job</b><br>Progress dan unduhan ulang hasil proses latar belakang (terjemahan, gabung, lock, PDF->gambar).</div>', unsafe_allow_html=True)
+            if st.button("Buka Riwayat Job", key="dash_jobs"):
+                navigate_to("Riwayat Job")
         
     st.markdown('</div>', unsafe_allow_html=True) # Tutup dashboard-container
 
@@ -313,37 +420,30 @@ if menu == "Kompres Foto":
     if img_tool == " Kompres Foto (Batch)":
         st.markdown("---")
         st.markdown("###  Kompres Foto (Batch)")
-        uploaded = st.file_uploader("Unggah gambar (jpg/png) — bisa banyak", type=["jpg","jpeg","png"], accept_multiple_files=True)
+        uploaded = file_uploader("Unggah gambar (jpg/png) — bisa banyak", type=["jpg","jpeg","png"], accept_multiple_files=True)
         quality = st.slider("Kualitas JPEG", 10, 95, 75)
         max_side = st.number_input("Max side (px)", min_value=100, max_value=4000, value=1200)
         if uploaded and st.button("Kompres Semua"):
-            out_map = {}
-            total = len(uploaded)
             prog = st.progress(0)
-            with st.spinner("Mengompres..."):
-                for i, f in enumerate(uploaded):
-                    try:
-                        raw = f.read()
-                        im = Image.open(io.BytesIO(raw))
-                        im.thumbnail((max_side, max_side))
-                        buf = io.BytesIO()
-                        im.convert("RGB").save(buf, format="JPEG", quality=quality, optimize=True)
-                        out_map[f"compressed_{f.name}"] = buf.getvalue()
-                    except Exception as e:
-                        st.warning(f"Gagal: {f.name} — {e}")
-                    prog.progress(int((i+1)/total*100))
-            if out_map:
-                zipb = make_zip_from_map(out_map)
-                st.success(f" {len(out_map)} file berhasil dikompres")
+            with st.spinner("Mengompres (paralel)..."):
+                # JPEG di-decode dalam mode draft, tiap gambar diproses di process pool
+                out, n_done, errors = compress_images_to_zip([(f.name, f) for f in uploaded], max_side, quality,
+                                                             progress=lambda i, total: prog.progress(int(i/total*100)))
+            for name, err in errors[:20]:
+                st.warning(f"Gagal: {name} — {err}")
+            if n_done:
+                zipb = spool_to_bytes(out)
+                st.success(f" {n_done} file berhasil dikompres")
                 st.download_button("Unduh Hasil (ZIP)", zipb, file_name="foto_kompres.zip", mime="application/zip")
             else:
                 st.warning("Tidak ada file berhasil dikompres.")
+            out.close()
 
     # --- FITUR Batch Rename Gambar (Sequential) ---
     elif img_tool == " Batch Rename/Format Gambar (Sequential)": 
         st.markdown("---")
         st.markdown("###  Ganti Nama & Ubah Format Gambar Massal (Sequential)")
-        uploaded_files = st.file_uploader(
+        uploaded_files = file_uploader(
             "Unggah file Gambar (JPG, PNG, dll.):", 
             type=["jpg", "jpeg", "png", "webp"], 
             accept_multiple_files=True,
@@ -359,32 +459,12 @@ if menu == "Kompres Foto":
                     st.error("Prefix nama file tidak boleh kosong.")
                     st.stop()
                 else:
-                    output_zip = io.BytesIO()
                     try:
-                        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zf:
-                            for i, file in enumerate(uploaded_files, 1):
-                                _, original_ext = os.path.splitext(file.name)
-                                img = Image.open(file)
-                                img_io = io.BytesIO()
-                                if new_format == "Sama seperti Asli":
-                                    output_format_pil = img.format if img.format else 'JPEG'
-                                    output_ext = original_ext
-                                else:
-                                    output_ext = "." + new_format.lower()
-                                    output_format_pil = new_format.upper()
-                                new_filename = f"{new_prefix}_{i:03d}{output_ext}"
-                                if output_format_pil in ('JPEG', 'JPG'):
-                                    img.convert("RGB").save(img_io, format='JPEG', quality=95) 
-                                elif output_format_pil == 'PNG':
-                                    img.save(img_io, format='PNG')
-                                elif output_format_pil == 'WEBP':
-                                    img.save(img_io, format='WEBP')
-                                else:
-                                    img.save(img_io, format=output_format_pil) 
-                                img_io.seek(0)
-                                zf.writestr(new_filename, img_io.read())
-                        st.success(f" Berhasil memproses {len(uploaded_files)} file.") 
-                        st.download_button("Unduh File ZIP Hasil Batch", data=output_zip.getvalue(), file_name="hasil_batch_gambar.zip", mime="application/zip")
+                        fmt = None if new_format == "Sama seperti Asli" else new_format
+                        out, n_done = convert_images_to_zip([(f.name, f) for f in uploaded_files], new_prefix, fmt)
+                        st.success(f" Berhasil memproses {n_done} file.")
+                        st.download_button("Unduh File ZIP Hasil Batch", data=spool_to_bytes(out), file_name="hasil_batch_gambar.zip", mime="application/zip")
+                        out.close()
                     except Exception as e: st.error(f"Gagal memproses file: {e}"); traceback.print_exc()
 
     # --- FITUR BARU 1: Batch Rename Gambar Sesuai Excel ---
@@ -393,56 +473,35 @@ if menu == "Kompres Foto":
         st.markdown("###  Ganti Nama Gambar (PNG/JPEG) Berdasarkan Excel")
         st.info("Template Excel/CSV wajib memiliki kolom **`nama_lama`** (termasuk ekstensi, misal: `foto_123.jpg`) dan **`nama_baru`** (termasuk ekstensi, misal: `ID_001.png`).")
         
-        excel_up = st.file_uploader("Unggah Excel/CSV untuk daftar nama:", type=["xlsx", "csv"], key="rename_img_excel_up")
-        files = st.file_uploader("Unggah Gambar (JPG/PNG/JPEG, multiple):", type=["jpg", "jpeg", "png"], accept_multiple_files=True, key="rename_img_files_up")
+        excel_up = file_uploader("Unggah Excel/CSV untuk daftar nama:", type=["xlsx", "csv"], key="rename_img_excel_up")
+        files = file_uploader("Unggah Gambar (JPG/PNG/JPEG, multiple):", type=["jpg", "jpeg", "png"], accept_multiple_files=True, key="rename_img_files_up")
       
         if excel_up and files and st.button("Proses Ganti Nama Gambar (ZIP)", key="process_img_rename_excel"):
             try:
                 with st.spinner("Memproses penggantian nama..."):
-                    # 1. Baca Excel
-                    if excel_up.name.lower().endswith(".csv"):
-                        df = pd.read_csv(io.BytesIO(excel_up.read()))
-                    else:
-                        df = pd.read_excel(io.BytesIO(excel_up.read()))
-                    
-                    # 2. Validasi Kolom
-                    required_cols = ['nama_lama', 'nama_baru']
-                    if not all(col in df.columns for col in required_cols):
-                        st.error(f"Excel/CSV wajib memiliki kolom: {', '.join(required_cols)}")
-                        st.stop() # Mengganti 'return'
+                    # 1. Baca Excel (hanya kolom nama_lama/nama_baru)
+                    df = read_table(excel_up, columns=RENAME_COLUMNS)
                     
-                    # 3. Map File dan Proses Rename
-                    file_map = {f.name: f.read() for f in files}
-                    out_map = {}
-                    not_found = []
-                    df['nama_lama_str'] = df['nama_lama'].astype(str).str.strip() # Gunakan str.strip() untuk membersihkan spasi
-
-                    for _, row in df.iterrows():
-                        old_name = str(row['nama_lama']).strip()
-                        new_name = str(row['nama_baru']).strip()
-                        
-                        # Cek di file yang diupload (case-sensitive)
-                        if old_name in file_map:
-                            # Pastikan nama baru memiliki ekstensi
-                            if not os.path.splitext(new_name)[1]:
-                                # Coba ambil ekstensi dari nama lama jika nama baru tidak ada
-                                _, old_ext = os.path.splitext(old_name)
-                                new_name = new_name + old_ext
-                                
-                            out_map[new_name] = file_map[old_name]
-                        else:
-                            not_found.append(old_name)
+                    # 2-3. Rencana rename (validasi kolom, merge dengan file upload, perbaikan ekstensi)
+                    file_map = {f.name: f for f in files}
+                    plan = plan_rename(df, file_map)
+                    if plan.duplicates:
+                        st.warning(f"{len(plan.duplicates)} nama_baru dipakai lebih dari satu baris (diberi akhiran _2, _3, ...). Contoh: {dict(list(plan.duplicates.items())[:5])}")
+                    out, n_renamed = plan.execute(file_map)
 
                     # 4. Buat ZIP
-                    if out_map:
-                        zipb = make_zip_from_map(out_map)
-                        st.success(f" {len(out_map)} file berhasil diganti namanya dan dikemas.") 
+                    if n_renamed:
+                        zipb = spool_to_bytes(out)
+                        st.success(f" {n_renamed} file berhasil diganti namanya dan dikemas.") 
                         st.download_button("Unduh Hasil (ZIP)", zipb, file_name="gambar_renamed_by_excel.zip", mime="application/zip")
                     else:
                         st.warning("Tidak ada file yang cocok ditemukan atau diproses.")
+                    out.close()
                     
-                    if not_found:
-                        st.info(f"{len(not_found)} file 'nama_lama' di Excel tidak ditemukan di file yang diunggah. Contoh: {not_found[:5]}")
+                    if plan.not_found:
+                        st.info(f"{len(plan.not_found)} file 'nama_lama' di Excel tidak ditemukan di file yang diunggah. Contoh: {plan.not_found[:5]}")
+            except ValueError as e:
+                st.error(str(e))
             except Exception as e:
                 st.error(f"Terjadi kesalahan pemrosesan: {e}")
                 traceback.print_exc()
@@ -494,179 +553,61 @@ if menu == "PDF Tools":
         st.markdown("###  Terjemahan Teks PDF (Optimasi Agar Lebih Rapi)")
         st.info("Fitur ini mencoba membuat hasil Word lebih rapi dengan menggabungkan baris-baris pendek yang berdekatan (*pre-processing*). **Replikasi tata letak kolom/tabel PDF tetap terbatas.**")
         
-        if Translator is None or Document is None:
+        if Translator is None or not DOCX_AVAILABLE:
             if Translator is None: st.error("Library `deep-translator` tidak ditemukan.")
-            if Document is None: st.error("Library `python-docx` tidak ditemukan.")
+            if not DOCX_AVAILABLE: st.error("Library `python-docx` tidak ditemukan.")
             st.stop()
         
-        f = st.file_uploader("Unggah PDF untuk Diterjemahkan:", type="pdf", key="translate_pdf_uploader")
+        f = file_uploader("Unggah PDF untuk Diterjemahkan:", type="pdf", key="translate_pdf_uploader")
         
         col1, col2 = st.columns(2)
         src_lang = col1.text_input("Bahasa Sumber (ISO Code, ex: id)", value="auto", help="Ketik 'auto' jika tidak yakin.")
         target_lang = col2.text_input("Bahasa Tujuan (ISO Code, ex: en, ja, fr)", value="en")
+        ranges_str = st.text_input("Halaman (kosong = semua, contoh: 1-3, 5)", key="translate_pages")
+        with st.expander("Pengaturan terjemahan paralel"):
+            t_col1, t_col2, t_col3, t_col4 = st.columns(4)
+            tr_workers = t_col1.number_input("Permintaan paralel", 1, 16, 4, key="translate_workers")
+            tr_rate = t_col2.number_input("Maks. permintaan/detik", 0.5, 50.0, 5.0, step=0.5, key="translate_rate")
+            tr_retries = t_col3.number_input("Maks. retry per chunk", 0, 10, 4, key="translate_retries")
+            tr_timeout = t_col4.number_input("Timeout per permintaan (detik)", 5, 300, 30, key="translate_timeout")
+            use_tm = st.checkbox(
+                "Gunakan translation memory (paragraf yang pernah diterjemahkan tidak dikirim ulang)",
+                value=True, key="translate_use_tm",
+            )
+            tm_stats = translation_memory().stats()
+            st.caption(f"Translation memory: {tm_stats['entries']} segmen, {tm_stats['bytes'] / 1024 / 1024:.1f} MB")
 
         if f and st.button("Proses Terjemahan dan Buat Word (.docx)", key="translate_pdf_button"):
             try:
-                
-                # --- HELPER: Menggabungkan baris pendek untuk kerapihan ---
-                def preprocess_text_for_layout(text_blocks: list) -> list:
-                    """Menggabungkan baris-baris pendek yang berdekatan, mengasumsikan itu adalah item daftar atau sel tabel."""
-                    processed_blocks = []
-                    current_block = ""
-                    MAX_LINE_LENGTH = 100 # Batas panjang baris agar tidak digabungkan
-                    
-                    for block in text_blocks:
-                        if block.strip() == "":
-                            # Baris kosong yang sebenarnya menandakan akhir paragraf
-                            if current_block:
-                                processed_blocks.append(current_block)
-                            processed_blocks.append("") # Jaga pemisah yang jelas
-                            current_block = ""
-                            continue
-                        
-                        # Baris yang sangat pendek (mungkin label/nilai)
-                        if len(block.strip()) < MAX_LINE_LENGTH and not block.strip().endswith('.'):
-                            # Jika baris pendek, coba gabungkan ke block saat ini dengan spasi
-                            if current_block:
-                                current_block += " | " + block.strip() # Gunakan pemisah "|" 
-                            else:
-                                current_block = block.strip()
-                        else:
-                            # Jika baris panjang (paragraf utuh)
-                            if current_block:
-                                processed_blocks.append(current_block)
-                            current_block = block.strip()
-                            processed_blocks.append(current_block)
-                            current_block = ""
-                            
-                    if current_block:
-                        processed_blocks.append(current_block)
-                    
-                    # Hapus spasi ganda yang berlebihan setelah processing
-                    return [b.replace("  ", " ").strip() for b in processed_blocks if b.strip() or b == ""]
-                # --------------------------------------------------------
-
-                # 1. Ekstraksi Teks (Menggunakan Paragraf sebagai Unit)
-                with st.spinner("1. Mengekstrak dan merapikan teks dari PDF..."):
-                    raw = f.read()
-                    all_text_lines = []
-                    
-                    if pdfplumber:
-                        with pdfplumber.open(io.BytesIO(raw)) as doc:
-                            for p in doc.pages:
-                                page_text = p.extract_text() or ""
-                                # Pisahkan per baris baru tunggal (lebih detail)
-                                all_text_lines.extend(page_text.split('\n'))
-                                all_text_lines.append("---HALAMAN BARU---") # Marker untuk halaman baru
-
-                    else: # Fallback ke PyPDF2
-                        reader = PdfReader(io.BytesIO(raw))
-                        for p in reader.pages:
-                            page_text = p.extract_text() or ""
-                            all_text_lines.extend(page_text.split('\n'))
-                            all_text_lines.append("---HALAMAN BARU---")
-
-                    # Lakukan Pre-processing untuk menggabungkan baris-baris yang berdekatan
-                    preprocessed_paragraphs = preprocess_text_for_layout(all_text_lines)
-                    
-                    full_text_clean = "\n\n".join(p for p in preprocessed_paragraphs if p != "---HALAMAN BARU---" and p != "")
-
-                if not full_text_clean.strip():
-                    st.warning("Teks kosong atau tidak dapat diekstrak dari PDF.")
-                    st.stop()
-
-                # 2. Chunking Berbasis Paragraf dan Terjemahan
-                with st.spinner(f"2. Menerjemahkan teks ke {target_lang} (mempertahankan paragraf)..."):
-                    translator = Translator(source=src_lang, target=target_lang)
-                    CHUNK_SIZE = 4500 # Batas karakter aman
-                    
-                    # Gabungkan paragraf yang sudah diproses menjadi chunks aman untuk terjemahan
-                    current_chunk = ""
-                    text_chunks_for_translation = []
-                    
-                    for p in preprocessed_paragraphs:
-                        # Jika penanda halaman ditemukan
-                        if p == "---HALAMAN BARU---":
-                            if current_chunk:
-                                text_chunks_for_translation.append(current_chunk)
-                            text_chunks_for_translation.append("---HALAMAN BARU---")
-                            current_chunk = ""
-                            continue
-                        
-                        # Jika paragraf yang diproses kosong atau merupakan spasi antar blok
-                        if not p.strip(): 
-                             if current_chunk:
-                                text_chunks_for_translation.append(current_chunk)
-                             text_chunks_for_translation.append("") # Tambahkan marker baris kosong
-                             current_chunk = ""
-                             continue
-
-                        # Logic chunking: tambahkan paragraf ke chunk saat ini
-                        if len(current_chunk) + len(p) + 4 > CHUNK_SIZE: # +4 untuk pemisah \n\n
-                            if current_chunk:
-                                text_chunks_for_translation.append(current_chunk)
-                            current_chunk = p + "\n\n"
-                        else:
-                            current_chunk += p + "\n\n"
-                    
-                    if current_chunk:
-                        text_chunks_for_translation.append(current_chunk.strip())
-                        
-                    translated_parts = []
-                    prog = st.progress(0)
-                    
-                    for i, chunk in enumerate(text_chunks_for_translation):
-                        if chunk in ("---HALAMAN BARU---", ""):
-                            translated_parts.append(chunk) 
-                        else:
-                            if i > 0: time.sleep(0.1) 
-                            # Terjemahkan, dan ganti pemisah "|" kembali ke format yang rapi
-                            translated = translator.translate(chunk)
-                            translated_parts.append(translated.replace(" | ", " | ").strip()) 
-                        
-                        prog.progress(int((i + 1) / len(text_chunks_for_translation) * 100))
-
-                    translated_text_combined = "\n\n".join(translated_parts)
-                    prog.empty()
-
-                # 3. Rekonstruksi ke Word (Memanfaatkan Struktur Lebih Baik)
-                with st.spinner("3. Membuat file Word (.docx) baru..."):
-                    doc = Document()
-                    
-                    # Memecah berdasarkan penanda halaman dan paragraf yang jelas
-                    for item in translated_text_combined.split('\n\n'):
-                        item_stripped = item.strip()
-
-                        if item_stripped == "---HALAMAN BARU---":
-                            # Tambahkan Page Break
-                            doc.add_page_break()
-                        elif item_stripped:
-                            # Gunakan paragraf baru
-                            doc.add_paragraph(item_stripped)
-                    
-                    out = io.BytesIO()
-                    doc.save(out)
-                    out.seek(0)
-                    
-                st.success(" Terjemahan berhasil! Unduh file Word hasil terjemahan.")
-                st.download_button(
-                    f" Unduh Hasil Terjemahan ({target_lang}).docx", 
-                    data=out.getvalue(), 
-                    file_name=f"translated_to_{target_lang}_rapi.docx", 
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
-                
-                st.markdown("---")
-                st.markdown("#### Preview Teks Asli (Sudah Dirapikan) dan Terjemahan")
-                col_preview1, col_preview2 = st.columns(2)
-                with col_preview1:
-                    st.text_area("Teks Asli (Dirapikan)", "\n\n".join(preprocessed_paragraphs)[:5000], height=300)
-                with col_preview2:
-                    st.text_area("Teks Terjemahan", translated_text_combined[:5000], height=300)
-
-            except Exception as e:
-                st.error(f"Terjadi kesalahan saat terjemahan. Cek kode bahasa (ISO 639-1) dan pastikan teks dapat diekstrak. Error: {e}")
-                traceback.print_exc()
+                select_pages(ranges_str, cached_page_count(f))  # validasi rentang sebelum job dikirim
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+            # Ekstraksi (paralel, di-cache) -> perapian paragraf -> terjemahan (translation memory, chunk <= 4500
+            # karakter, paralel dengan rate limit/retry/timeout) -> Word; semuanya di job latar belakang
+            start_job(
+                "translate_job", "translate", translate_task, [(f.name, f)], f"Terjemahan {f.name} ke {target_lang}",
+                backend="google", source=src_lang, target=target_lang, ranges=ranges_str, use_memory=use_tm,
+                workers=int(tr_workers), rate=float(tr_rate), max_retries=int(tr_retries), timeout=float(tr_timeout),
+            )
+
+        def show_translation(summary):
+            tr_stats = summary["stats"]
+            st.caption(
+                f"{tr_stats['segments']} paragraf: {tr_stats['tm_hits']} dari translation memory, "
+                f"{tr_stats['sent_segments']} unik dikirim dalam {tr_stats['calls']} permintaan ({tr_stats['elapsed']:.1f} s; "
+                f"retry {tr_stats['retries']}, timeout {tr_stats['timeouts']}, dibatasi server {tr_stats['throttled']})"
+            )
+            if tr_stats["failed"]:
+                st.warning(f"{tr_stats['failed']} paragraf gagal diterjemahkan setelah semua retry; teks aslinya dipakai.")
+            st.markdown("#### Preview Teks Asli (Sudah Dirapikan) dan Terjemahan")
+            col_preview1, col_preview2 = st.columns(2)
+            with col_preview1:
+                st.text_area("Teks Asli (Dirapikan)", summary["original"], height=300)
+            with col_preview2:
+                st.text_area("Teks Terjemahan", summary["translated"], height=300)
+
+        job_panel("translate_job", show_translation)
 
     # --- FITUR Batch Rename PDF Sesuai Excel ---
     if tool == "Batch Rename PDF Excel":
@@ -675,51 +616,35 @@ if menu == "PDF Tools":
         st.markdown("Unggah banyak file PDF dan ganti namanya sesuai daftar di Excel/CSV.")
         st.info("Template Excel/CSV wajib memiliki kolom **`nama_lama`** (misal: `ID_123.pdf`) dan **`nama_baru`** (misal: `Hasil_123.pdf`).")
 
-        excel_up = st.file_uploader("Unggah Excel/CSV untuk daftar nama:", type=["xlsx", "csv"], key="rename_pdf_excel_up")
-        files = st.file_uploader("Unggah File PDF (multiple):", type=["pdf"], accept_multiple_files=True, key="rename_pdf_files_up")
+        excel_up = file_uploader("Unggah Excel/CSV untuk daftar nama:", type=["xlsx", "csv"], key="rename_pdf_excel_up")
+        files = file_uploader("Unggah File PDF (multiple):", type=["pdf"], accept_multiple_files=True, key="rename_pdf_files_up")
         
         if excel_up and files and st.button("Proses Ganti Nama PDF (ZIP)", key="process_pdf_rename_excel"):
             try:
                 with st.spinner("Memproses penggantian nama..."):
-                    # 1. Baca Excel
-                    if excel_up.name.lower().endswith(".csv"):
-                        df = pd.read_csv(io.BytesIO(excel_up.read()))
-                    else:
-                        df = pd.read_excel(io.BytesIO(excel_up.read()))
-                    
-                    # 2. Validasi Kolom
-                    required_cols = ['nama_lama', 'nama_baru']
-                    if not all(col in df.columns for col in required_cols):
-                        st.error(f"Excel/CSV wajib memiliki kolom: {', '.join(required_cols)}")
-                        st.stop() # Mengganti 'return'
+                    # 1. Baca Excel (hanya kolom nama_lama/nama_baru)
+                    df = read_table(excel_up, columns=RENAME_COLUMNS)
                     
-                    # 3. Map File dan Proses Rename
-                    file_map = {f.name: f.read() for f in files}
-                    out_map = {}
-                    not_found = []
-                    
-                    for _, row in df.iterrows():
-                        old_name = str(row['nama_lama']).strip()
-                        new_name = str(row['nama_baru']).strip()
-                        
-                        if old_name in file_map:
-                            # Tambahkan ekstensi .pdf jika belum ada di nama baru
-                            if not new_name.lower().endswith('.pdf'):
-                                new_name += '.pdf'
-                            out_map[new_name] = file_map[old_name]
-                        else:
-                            not_found.append(old_name)
+                    # 2-3. Rencana rename (validasi kolom, merge dengan file upload, perbaikan ekstensi)
+                    file_map = {f.name: f for f in files}
+                    plan = plan_rename(df, file_map, force_ext=".pdf")
+                    if plan.duplicates:
+                        st.warning(f"{len(plan.duplicates)} nama_baru dipakai lebih dari satu baris (diberi akhiran _2, _3, ...). Contoh: {dict(list(plan.duplicates.items())[:5])}")
+                    out, n_renamed = plan.execute(file_map)
 
                     # 4. Buat ZIP
-                    if out_map:
-                        zipb = make_zip_from_map(out_map)
-                        st.success(f" {len(out_map)} file berhasil diganti namanya dan dikemas.") 
+                    if n_renamed:
+                        zipb = spool_to_bytes(out)
+                        st.success(f" {n_renamed} file berhasil diganti namanya dan dikemas.") 
                         st.download_button("Unduh Hasil (ZIP)", zipb, file_name="pdf_renamed_by_excel.zip", mime="application/zip")
                     else:
                         st.warning("Tidak ada file yang cocok ditemukan atau diproses.")
+                    out.close()
                     
-                    if not_found:
-                        st.info(f"{len(not_found)} file 'nama_lama' di Excel tidak ditemukan di file yang diunggah. Contoh: {not_found[:5]}")
+                    if plan.not_found:
+                        st.info(f"{len(plan.not_found)} file 'nama_lama' di Excel tidak ditemukan di file yang diunggah. Contoh: {plan.not_found[:5]}")
+            except ValueError as e:
+                st.error(str(e))
             except Exception as e:
                 st.error(f"Terjadi kesalahan pemrosesan: {e}")
                 traceback.print_exc()
@@ -728,7 +653,7 @@ if menu == "PDF Tools":
     if tool == "Batch Rename PDF Seq":
         st.markdown("---")
         st.markdown("###  Ganti Nama File PDF Massal (Sequential)") 
-        uploaded_files = st.file_uploader("Unggah file PDF (multiple):", type=["pdf"], accept_multiple_files=True, key="batch_rename_pdf_uploader_seq")
+        uploaded_files = file_uploader("Unggah file PDF (multiple):", type=["pdf"], accept_multiple_files=True, key="batch_rename_pdf_uploader_seq")
     
         if uploaded_files:
             col1, col2 = st.columns(2)
@@ -740,14 +665,12 @@ if menu == "PDF Tools":
                     st.error("Prefix nama file tidak boleh kosong.")
                     st.stop() # Mengganti 'return'
                 else:
-                    output_zip = io.BytesIO()
                     try:
-                        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zf:
-                            for i, file in enumerate(uploaded_files, start_num):
-                                new_filename = f"{new_prefix}_{i:03d}.pdf"
-                                zf.writestr(new_filename, file.read())
-                        st.success(f" Berhasil mengganti nama {len(uploaded_files)} file.") 
-                        st.download_button("Unduh File ZIP Hasil Rename", data=output_zip.getvalue(), file_name="pdf_renamed.zip", mime="application/zip")
+                        plan = plan_sequential_rename([f.name for f in uploaded_files], new_prefix, int(start_num), ext=".pdf")
+                        out, n_renamed = plan.execute({f.name: f for f in uploaded_files})
+                        st.success(f" Berhasil mengganti nama {n_renamed} file.")
+                        st.download_button("Unduh File ZIP Hasil Rename", data=spool_to_bytes(out), file_name="pdf_renamed.zip", mime="application/zip")
+                        out.close()
                     except Exception as e: st.error(f"Gagal memproses file: {e}"); traceback.print_exc()
 
     # --- LOGIKA FITUR PDF LAINNYA (dengan ikon diperbarui) ---
@@ -756,16 +679,15 @@ if menu == "PDF Tools":
         st.markdown("###  Reorder atau Hapus Halaman PDF") 
         st.markdown("Unggah file PDF Anda dan tentukan urutan halaman baru (contoh: `2, 1, 3` untuk membalik, atau `1, 3` untuk menghapus halaman 2).")
 
-        f = st.file_uploader("Unggah 1 file PDF:", type="pdf", key="reorder_pdf_uploader")
+        f = file_uploader("Unggah 1 file PDF:", type="pdf", key="reorder_pdf_uploader")
         
         if f:
             try:
-                raw = f.read()
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
-                reader = PdfReader(io.BytesIO(raw))
-                num_pages = len(reader.pages)
+                # Di-cache per isi file: mengetik di input urutan tidak mem-parsing ulang PDF
+                num_pages = cached_page_count(f)
                 st.info(f"PDF berhasil dimuat. Jumlah total halaman: **{num_pages}**.")
                 
                 default_order = ", ".join(map(str, range(1, num_pages + 1)))
@@ -777,33 +699,22 @@ if menu == "PDF Tools":
                 )
 
                 if st.button("Proses Reorder/Hapus Halaman", key="process_reorder"):
-                    new_order_indices = []
-                    
                     try:
-                        input_list = [int(x.strip()) for x in new_order_str.split(',') if x.strip().isdigit()]
-                        
-                        if any(n < 1 or n > num_pages for n in input_list):
-                            st.error(f"Nomor halaman harus antara 1 sampai {num_pages}.")
-                            # Ganti raise ValueError dengan st.stop()
-                            st.stop() 
-
-                        new_order_indices = [n - 1 for n in input_list]
-                      
-                        writer = PdfWriter()
-                        for index in new_order_indices:
-                            writer.add_page(reader.pages[index])
-                        
-                        pdf_buffer = io.BytesIO()
-                        writer.write(pdf_buffer)
-                        pdf_buffer.seek(0)
+                        new_order = parse_page_order(new_order_str, num_pages)
+                    except ValueError as e:
+                        st.error(str(e))
+                        st.stop()
 
+                    try:
+                        out, n_new = reorder_pages(f, new_order)
                         st.download_button(
                             " Unduh Hasil PDF (Reordered)", 
-                            data=pdf_buffer,
+                            data=spool_to_bytes(out),
                             file_name="pdf_reordered.pdf",
                             mime="application/pdf"
                         )
-                        st.success(f"Pemrosesan selesai. Total halaman baru: {len(new_order_indices)}.")
+                        out.close()
+                        st.success(f"Pemrosesan selesai. Total halaman baru: {n_new}.")
 
                     except Exception as e:
                         st.error(f"Format urutan halaman tidak valid atau terjadi kesalahan pemrosesan: {e}")
@@ -815,49 +726,48 @@ if menu == "PDF Tools":
     if tool == "Gabung PDF":
         st.markdown("---")
         st.markdown("###  Gabung PDF")
-        files = st.file_uploader("Upload PDFs (multiple):", type="pdf", accept_multiple_files=True)
+        files = file_uploader("Upload PDFs (multiple):", type="pdf", accept_multiple_files=True)
+        streaming = st.checkbox("Mode hemat memori (streaming, disarankan untuk ratusan file)", value=True, key="merge_streaming")
         if files and st.button("Gabung"):
-            try:
-                if PdfWriter is None:
-                    st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
-                    st.stop()
-                with st.spinner("Menggabungkan..."):
-                    writer = PdfWriter()
-                    for f in files:
-                        reader = PdfReader(io.BytesIO(f.read()))
-                        for p in reader.pages:
-                            writer.add_page(p)
-                    out = io.BytesIO(); writer.write(out); out.seek(0)
-                st.download_button("Download merged.pdf", out.getvalue(), file_name="merged.pdf", mime="application/pdf")
-                st.success("Selesai")
-            except Exception:
-                st.error(traceback.format_exc())
+            if PdfWriter is None:
+                st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
+                st.stop()
+            # Streaming: file diproses satu per satu, output ditulis bertahap ke file hasil job di disk
+            start_job("merge_job", "merge", merge_task, [(p.name, p) for p in files], f"Gabung {len(files)} PDF", streaming=streaming)
+        job_panel("merge_job", lambda summary: st.caption(f"{summary['files']} file, {summary['pages']} halaman"))
 
     if tool == "Pisah PDF":
         st.markdown("---")
         st.markdown("###  Pisah PDF")
-        f = st.file_uploader("Upload single PDF:", type="pdf")
+        f = file_uploader("Upload single PDF:", type="pdf")
+        split_mode = st.radio("Mode pisah", ["Per halaman", "Setiap N halaman", "Rentang halaman"], horizontal=True)
+        every_n, ranges_str = 1, ""
+        if split_mode == "Setiap N halaman":
+            every_n = st.number_input("Jumlah halaman per file", min_value=1, value=2, step=1)
+        elif split_mode == "Rentang halaman":
+            ranges_str = st.text_input("Rentang halaman (contoh: 1-3, 5, 8-10)", value="1")
         if f and st.button("Split to pages (ZIP)"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
-                with st.spinner("Memisahkan..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    out_map = {}
-                    for i, p in enumerate(reader.pages):
-                        w = PdfWriter(); w.add_page(p)
-                        buf = io.BytesIO(); w.write(buf); buf.seek(0)
-                        out_map[f"page_{i+1}.pdf"] = buf.getvalue()
-                    zipb = make_zip_from_map(out_map)
+                mode_key = {"Per halaman": "page", "Setiap N halaman": "every", "Rentang halaman": "ranges"}[split_mode]
+                with st.spinner("Memisahkan (paralel)..."):
+                    prog = st.progress(0)
+                    out, n_files = split_pdf_to_zip(f, mode_key, every=every_n, ranges=ranges_str,
+                                                    progress=lambda i, total: prog.progress(int(i/total*100)))
+                    zipb = spool_to_bytes(out); out.close()
+                st.success(f"{n_files} file PDF dibuat.")
                 st.download_button("Download pages.zip", zipb, file_name="pages.zip", mime="application/zip")
+            except ValueError as e:
+                st.error(str(e))
             except Exception:
                 st.error(traceback.format_exc())
                 
     if tool == "Hapus Halaman":
         st.markdown("---")
         st.markdown("###  Hapus Halaman dari PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
+        f = file_uploader("Upload PDF", type="pdf")
         page_no = st.number_input("Halaman yang dihapus (1-based)", min_value=1, value=1)
         if f and st.button("Hapus Halaman"):
             try:
@@ -865,82 +775,70 @@ if menu == "PDF Tools":
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Menghapus..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    writer = PdfWriter()
-                    for i, p in enumerate(reader.pages):
-                        if i+1 != page_no:
-                            writer.add_page(p)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download result", buf.getvalue(), file_name="removed_page.pdf", mime="application/pdf")
+                    out, _ = remove_pages(f, [page_no])
+                    data = spool_to_bytes(out); out.close()
+                st.download_button("Download result", data, file_name="removed_page.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Rotate PDF":
         st.markdown("---")
         st.markdown("###  Putar Halaman PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
-        angle = st.selectbox("Rotate degrees", [90, 180, 270])
+        f = file_uploader("Upload PDF", type="pdf")
+        angle = st.selectbox("Rotate degrees", ROTATE_ANGLES)
         if f and st.button("Rotate"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Memutar..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    writer = PdfWriter()
-                    for p in reader.pages:
-                        rotate_page_safe(p, angle)
-                        writer.add_page(p)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download rotated.pdf", buf.getvalue(), file_name="rotated.pdf", mime="application/pdf")
+                    out, _ = rotate_pages(f, angle)
+                    data = spool_to_bytes(out); out.close()
+                st.download_button("Download rotated.pdf", data, file_name="rotated.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Kompres PDF":
         st.markdown("---")
         st.markdown("###  Kompres Ukuran PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
-        if f and st.button("Compress (rewrite)"):
+        f = file_uploader("Upload PDF", type="pdf")
+        col1, col2 = st.columns(2)
+        target_dpi = col1.slider("Target DPI gambar", 72, 300, 150, help="Gambar scan di atas DPI ini akan di-downsample.")
+        jpeg_quality = col2.slider("Kualitas JPEG", 30, 95, 70)
+        if f and st.button("Kompres PDF"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
-                with st.spinner("Mengompres (rewrite)..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    writer = PdfWriter()
-                    for p in reader.pages:
-                        writer.add_page(p)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download compressed.pdf", buf.getvalue(), file_name="compressed.pdf", mime="application/pdf")
+                with st.spinner("Mengompres (gambar, duplikat, stream, object streams)..."):
+                    data, report = compress_pdf(f, target_dpi=target_dpi, quality=jpeg_quality)
+                original = f.size
+                st.success(f"Ukuran: {original/1024:.0f} KB -> {len(data)/1024:.0f} KB (hemat {max(0, original - len(data))/max(1, original)*100:.1f}%)")
+                df_report = pd.DataFrame(report)
+                df_report["size_kb"] = (df_report["size"] / 1024).round(1)
+                df_report["saved_kb"] = (df_report["saved"] / 1024).round(1)
+                st.dataframe(df_report[["stage", "size_kb", "saved_kb", "detail"]], use_container_width=True)
+                st.download_button("Download compressed.pdf", data, file_name="compressed.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Watermark PDF":
         st.markdown("---")
         st.markdown("###  Tambah Watermark ke PDF")
-        base = st.file_uploader("Base PDF", type="pdf")
-        watermark = st.file_uploader("Watermark PDF (single page)", type="pdf")
+        base = file_uploader("Base PDF", type="pdf")
+        watermark = file_uploader("Watermark PDF (single page)", type="pdf")
         if base and watermark and st.button("Apply watermark"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Menerapkan watermark..."):
-                    rb = PdfReader(io.BytesIO(base.read()))
-                    rm = PdfReader(io.BytesIO(watermark.read()))
-                    wm = rm.pages[0]
-                    writer = PdfWriter()
-                    for p in rb.pages:
-                        try:
-                            p.merge_page(wm)
-                        except Exception:
-                            try:
-                                p.mergeTranslatedPage(wm, 0, 0)
-                            except Exception:
-                                pass
-                        writer.add_page(p)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download watermarked.pdf", buf.getvalue(), file_name="watermarked.pdf", mime="application/pdf")
+                    # Watermark dijadikan satu Form XObject bersama; dokumen besar diproses paralel per potongan
+                    prog = st.progress(0)
+                    out, n_pages = watermark_pdf(base, watermark, progress=lambda i, total: prog.progress(int(i/total*100)))
+                    data = spool_to_bytes(out); out.close()
+                st.success(f"Watermark diterapkan ke {n_pages} halaman.")
+                st.download_button("Download watermarked.pdf", data, file_name="watermarked.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
@@ -948,76 +846,52 @@ if menu == "PDF Tools":
         st.markdown("---")
         st.markdown("###  PDF ke Gambar (PNG/JPEG)")
         st.info("Requires pdf2image + poppler (server).")
-        f = st.file_uploader("Upload PDF", type="pdf")
+        f = file_uploader("Upload PDF", type="pdf")
         dpi = st.slider("DPI", 100, 300, 150)
         fmt = st.radio("Format", ["PNG", "JPEG"])
+        window = st.number_input("Halaman per batch render", min_value=1, max_value=64, value=RASTER_WINDOW, help="Memori puncak sebanding dengan jumlah halaman per batch, bukan total halaman.")
         if f and st.button("Convert to images"):
-            try:
-                if not PDF2IMAGE_AVAILABLE:
-                    st.error("pdf2image not installed or poppler missing.")
-                    st.stop()
-                else:
-                    with st.spinner("Converting..."):
-                        pdf_bytes = f.read()
-                        images = None
-                        if convert_from_bytes is not None:
-                            images = convert_from_bytes(pdf_bytes, dpi=dpi)
-                        else:
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                                tmp.write(pdf_bytes)
-                            tmp_path = tmp.name
-                            images = convert_from_path(tmp_path, dpi=dpi)
-                            try:
-                                os.unlink(tmp_path)
-                            except Exception:
-                                pass
-                        out_map = {}
-                        for i, img in enumerate(images):
-                            b = io.BytesIO(); img.save(b, format=fmt); out_map[f"page_{i+1}.{fmt.lower()}"] = b.getvalue()
-                        zipb = make_zip_from_map(out_map)
-                        st.download_button("Download images.zip", zipb, file_name="pdf_images.zip", mime="application/zip")
-            except Exception:
-                st.error(traceback.format_exc())
+            if not PDF2IMAGE_AVAILABLE:
+                st.error("pdf2image not installed or poppler missing.")
+                st.stop()
+            # Render per jendela halaman (multi-thread poppler), hasil langsung masuk ZIP milik job
+            start_job("raster_job", "rasterize", rasterize_task, [(f.name, f)], f"{f.name} -> {fmt} ({dpi} DPI)",
+                      dpi=dpi, fmt=fmt, window=int(window))
+        job_panel("raster_job", lambda summary: st.caption(f"{summary['pages']} halaman dikonversi."))
 
     if tool == "Image -> PDF":
         st.markdown("---")
         st.markdown("###  Gambar ke PDF")
-        imgs = st.file_uploader("Upload images", type=["jpg","png","jpeg"], accept_multiple_files=True)
+        imgs = file_uploader("Upload images", type=["jpg","png","jpeg"], accept_multiple_files=True)
+        c1, c2, c3 = st.columns(3)
+        page_size = c1.selectbox("Ukuran halaman", list(PAGE_SIZES), format_func=lambda k: "Ikuti gambar" if k == "image" else k)
+        fit_mode = c2.selectbox("Penempatan", FIT_MODES, format_func={"fit": "Muat (fit)", "fill": "Penuhi (fill)", "original": "Ukuran asli"}.get)
+        img_dpi = c3.number_input("DPI gambar", min_value=36, max_value=1200, value=72, step=1)
         if imgs and st.button("Images -> PDF"):
             try:
                 with st.spinner("Membuat PDF dari gambar..."):
-                    pil = [Image.open(io.BytesIO(i.read())).convert("RGB") for i in imgs]
-                    buf = io.BytesIO()
-                    if len(pil) == 1:
-                        pil[0].save(buf, format="PDF")
-                    else:
-                        pil[0].save(buf, save_all=True, append_images=pil[1:], format="PDF")
-                    buf.seek(0)
-                st.download_button("Download images_as_pdf.pdf", buf.getvalue(), file_name="images_as_pdf.pdf", mime="application/pdf")
+                    # Satu gambar per langkah; JPEG disisipkan langsung tanpa decode ulang
+                    prog = st.progress(0)
+                    out, n_pages, n_jpeg = images_to_pdf(imgs, page_size=page_size, fit=fit_mode, dpi=img_dpi,
+                                                         progress=lambda i, total: prog.progress(int(i/total*100)))
+                    pdf_bytes = spool_to_bytes(out); out.close()
+                st.success(f"{n_pages} halaman ({n_jpeg} JPEG disisipkan tanpa re-encode)")
+                st.download_button("Download images_as_pdf.pdf", pdf_bytes, file_name="images_as_pdf.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Extract Text":
         st.markdown("---")
         st.markdown("###  Ekstraksi Teks dari PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
+        f = file_uploader("Upload PDF", type="pdf")
+        ranges_str = st.text_input("Halaman (kosong = semua, contoh: 1-3, 5)", key="extract_text_pages")
         if f and st.button("Extract text"):
             try:
                 if PdfReader is None and pdfplumber is None:
                     st.error("PyPDF2 atau pdfplumber tidak terinstall.")
                     st.stop()
                 with st.spinner("Mengekstrak teks..."):
-                    text_blocks = []
-                    raw = f.read()
-                    if pdfplumber:
-                        with pdfplumber.open(io.BytesIO(raw)) as doc:
-                            for i, p in enumerate(doc.pages):
-                                text_blocks.append(f"--- Page {i+1} ---\n" + (p.extract_text() or ""))
-                    else:
-                        reader = PdfReader(io.BytesIO(raw))
-                        for i, p in enumerate(reader.pages):
-                            text_blocks.append(f"--- Page {i+1} ---\n" + (p.extract_text() or ""))
-                    full = "\n".join(text_blocks)
+                    full = page_texts_to_text(extract_texts_ui(f, ranges_str))
                     st.text_area("Extracted text (preview)", full[:10000], height=300)
                     st.download_button("Download .txt", full, file_name="extracted_text.txt", mime="text/plain")
             except Exception:
@@ -1029,74 +903,81 @@ if menu == "PDF Tools":
         if pdfplumber is None:
             st.error("pdfplumber is required for table extraction (pip install pdfplumber)")
         else:
-            f = st.file_uploader("Upload PDF", type="pdf")
+            f = file_uploader("Upload PDF", type="pdf")
+            ranges_str = st.text_input("Halaman (kosong = semua, contoh: 1-3, 5)", key="extract_tables_pages")
+            sheet_per_page = st.checkbox("Satu sheet per halaman", value=False)
+            with st.expander("Pengaturan deteksi tabel (pdfplumber)"):
+                c1, c2 = st.columns(2)
+                v_strategy = c1.selectbox("Vertical strategy", TABLE_STRATEGIES)
+                h_strategy = c2.selectbox("Horizontal strategy", TABLE_STRATEGIES)
+                snap_tol = c1.number_input("Snap tolerance", 0, 20, DEFAULT_TABLE_SETTINGS["snap_tolerance"])
+                inter_tol = c2.number_input("Intersection tolerance", 0, 20, DEFAULT_TABLE_SETTINGS["intersection_tolerance"])
             if f and st.button("Extract tables"):
                 try:
-                    with st.spinner("Mengekstrak tabel..."):
-                        tables = []
-                        with pdfplumber.open(io.BytesIO(f.read())) as doc:
-                            for page in doc.pages:
-                                for tbl in page.extract_tables():
-                                    if tbl and len(tbl) > 1: # Menghilangkan baris header yang mungkin diduplikasi
-                                        df = pd.DataFrame(tbl[1:], columns=tbl[0])
-                                        tables.append(df)
-                        if tables:
-                            df_all = pd.concat(tables, ignore_index=True)
-                            st.dataframe(df_all.head())
-                            excel_bytes = df_to_excel_bytes(df_all)
-                            st.download_button("Download Excel", data=excel_bytes, file_name="extracted_tables.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                        else:
-                            st.info("No tables found.")
+                    pages = select_pages(ranges_str, cached_page_count(f)) if ranges_str.strip() else None
+                    settings = {
+                        "vertical_strategy": v_strategy, "horizontal_strategy": h_strategy,
+                        "snap_tolerance": snap_tol, "intersection_tolerance": inter_tol,
+                    }
+                    with st.spinner("Mengekstrak tabel (paralel)..."):
+                        # Baris tabel langsung ditulis ke workbook write-only, tanpa pd.concat di memori
+                        prog = st.progress(0)
+                        out, info = tables_to_xlsx(f, settings, pages, sheet_per_page,
+                                                   progress=lambda i, total: prog.progress(int(i/total*100)))
+                        # Spool tetap terbuka selama tombol unduh ada (dibaca saat diklik, lalu dilepas GC)
+                        excel_data = spool_reader(out)
+                    if info["tables"]:
+                        preview = info["preview"]
+                        st.dataframe(pd.DataFrame(preview[1:], columns=[str(c) for c in preview[0]]))
+                        st.success(f"{info['tables']} tabel, {info['rows']} baris.")
+                        st.download_button("Download Excel", data=excel_data, file_name="extracted_tables.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+                    else:
+                        st.info("No tables found.")
+                except ValueError as e:
+                    st.error(str(e))
                 except Exception:
                     st.error(traceback.format_exc())
 
     if tool == "PDF -> Word":
         st.markdown("---")
         st.markdown("###  Konversi PDF ke Word (Text-based)")
-        if Document is None:
+        if not DOCX_AVAILABLE:
             st.error("python-docx is required for PDF->Word (pip install python-docx)")
         else:
-            f = st.file_uploader("Upload PDF", type="pdf")
+            f = file_uploader("Upload PDF", type="pdf")
+            ranges_str = st.text_input("Halaman (kosong = semua, contoh: 1-3, 5)", key="pdf_word_pages")
             if f and st.button("Convert to Word"):
                 try:
                     if PdfReader is None:
                         st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                         st.stop()
                     with st.spinner("Converting..."):
-                        reader = PdfReader(io.BytesIO(f.read()))
-                        doc = Document()
-                        for p in reader.pages:
-                            txt = p.extract_text() or ""
-                            doc.add_paragraph(txt)
-                        out = io.BytesIO(); doc.save(out); out.seek(0)
-                    st.download_button("Download .docx", out.getvalue(), file_name="converted.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+                        out = page_texts_to_docx(extract_texts_ui(f, ranges_str, "pypdf"))
+                        docx_bytes = spool_to_bytes(out); out.close()
+                    st.download_button("Download .docx", docx_bytes, file_name="converted.docx", mime=DOCX_MIME)
                 except Exception:
                     st.error(traceback.format_exc())
 
     if tool == "PDF -> Excel (text)":
         st.markdown("---")
         st.markdown("###  Konversi PDF ke Excel (Text per Halaman)")
-        f = st.file_uploader("Upload PDF", type="pdf")
+        f = file_uploader("Upload PDF", type="pdf")
+        ranges_str = st.text_input("Halaman (kosong = semua, contoh: 1-3, 5)", key="pdf_excel_pages")
         if f and st.button("Convert to Excel (text)"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Converting..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    rows = []
-                    for i, p in enumerate(reader.pages):
-                        rows.append({"page": i+1, "text": p.extract_text() or ""})
-                    df = pd.DataFrame(rows)
-                    excel_bytes = df_to_excel_bytes(df)
-                    st.download_button("Download Excel", excel_bytes, file_name="pdf_text.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+                    excel_data = df_to_excel(page_texts_frame(extract_texts_ui(f, ranges_str, "pypdf")))
+                    st.download_button("Download Excel", excel_data, file_name="pdf_text.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Encrypt PDF":
         st.markdown("---")
         st.markdown("###  Kunci (Encrypt) PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
+        f = file_uploader("Upload PDF", type="pdf")
         pw = st.text_input("Password", type="password")
         if f and pw and st.button("Encrypt"):
             try:
@@ -1104,20 +985,16 @@ if menu == "PDF Tools":
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Mengunci PDF..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    writer = PdfWriter()
-                    for p in reader.pages:
-                        writer.add_page(p)
-                    try_encrypt(writer, pw)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download encrypted.pdf", buf.getvalue(), file_name="encrypted.pdf", mime="application/pdf")
+                    out, _ = encrypt_pdf(f, pw)
+                    data = spool_to_bytes(out); out.close()
+                st.download_button("Download encrypted.pdf", data, file_name="encrypted.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Decrypt PDF":
         st.markdown("---")
         st.markdown("###  Buka Kunci (Decrypt) PDF")
-        f = st.file_uploader("Upload encrypted PDF", type="pdf")
+        f = file_uploader("Upload encrypted PDF", type="pdf")
         pw = st.text_input("Password for decryption", type="password")
         if f and pw and st.button("Decrypt"):
             try:
@@ -1125,126 +1002,74 @@ if menu == "PDF Tools":
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
                 with st.spinner("Membuka PDF..."):
-                    reader = PdfReader(io.BytesIO(f.read()))
-                    if getattr(reader, "is_encrypted", False):
-                        reader.decrypt(pw)
-                    writer = PdfWriter()
-                    for p in reader.pages:
-                        writer.add_page(p)
-                    buf = io.BytesIO(); writer.write(buf); buf.seek(0)
-                st.download_button("Download decrypted.pdf", buf.getvalue(), file_name="decrypted.pdf", mime="application/pdf")
+                    out, _ = decrypt_pdf(f, pw)
+                    data = spool_to_bytes(out); out.close()
+                st.download_button("Download decrypted.pdf", data, file_name="decrypted.pdf", mime="application/pdf")
             except Exception:
                 st.error(traceback.format_exc())
 
     if tool == "Batch Lock (Excel)":
         st.markdown("---")
         st.markdown("###  Batch Lock PDF Berdasarkan Daftar Excel")
-        excel_file = st.file_uploader("Upload Excel (filename,password) or CSV", type=["xlsx","csv"])
-        pdfs = st.file_uploader("Upload PDFs (multiple)", type="pdf", accept_multiple_files=True)
+        excel_file = file_uploader("Upload Excel (filename,password) or CSV", type=["xlsx","csv"])
+        pdfs = file_uploader("Upload PDFs (multiple)", type="pdf", accept_multiple_files=True)
         if excel_file and pdfs and st.button("Batch Lock"):
             try:
                 if PdfReader is None:
                     st.error("PyPDF2 tidak terinstall (pip install PyPDF2)")
                     st.stop()
-                with st.spinner("Batch locking PDFs..."):
-                    if excel_file.name.lower().endswith(".csv"):
-                        df = pd.read_csv(io.BytesIO(excel_file.read()))
-                    else:
-                        df = pd.read_excel(io.BytesIO(excel_file.read()))
-                    pdf_map = {p.name: p.read() for p in pdfs}
-                    out_map = {}
-                    not_found = []
-                    total = len(df)
-                    prog = st.progress(0)
-                    for idx, (_, row) in enumerate(df.iterrows()):
-                        cols = [c.lower() for c in df.columns]
-                        try:
-                            # Safely extract column names
-                            # Mencari 'filename' atau 'nama_file'
-                            target_col = next((c for c in df.columns if c.lower() in ('filename', 'nama_file')), None)
-                            # Mencari 'password' atau 'kata_sandi'
-                            pwd_col = next((c for c in df.columns if c.lower() in ('password', 'kata_sandi')), None)
-
-                            if target_col and pwd_col:
-                                target = str(row[target_col]).strip()
-                                pwd = str(row[pwd_col]).strip()
-                            else:
-                                # Jika kolom tidak ditemukan, coba asumsi posisi
-                                target = str(row.iloc[0]).strip() # Asumsi kolom 1 adalah filename
-                                pwd = str(row.iloc[1]).strip() # Asumsi kolom 2 adalah password
-                        except Exception:
-                            target = None; pwd = None
-                        
-                        if target and pwd:
-                            # Cek yang exact match dulu
-                            matches = [k for k in pdf_map.keys() if k == target]
-                            if matches:
-                                key = matches[0]
-                                reader = PdfReader(io.BytesIO(pdf_map[key]))
-                                writer = PdfWriter()
-                                for p in reader.pages:
-                                    writer.add_page(p)
-                                try_encrypt(writer, pwd)
-                                b = io.BytesIO(); writer.write(b); out_map[f"locked_{key}"] = b.getvalue()
-                            else:
-                                not_found.append(target)
-                        prog.progress(int((idx+1)/total*100))
-                    if out_map:
-                        st.download_button("Download locked_pdfs.zip", make_zip_from_map(out_map), file_name="locked_pdfs.zip", mime="application/zip")
-                    if not_found:
-                        st.warning(f"{len(not_found)} files not found sample: {not_found[:10]}")
+                df = read_table(excel_file)
+                # Kolom dicari sekali, file dicocokkan lewat dict (bukan scan semua nama per baris)
+                pdf_map = {p.name: p for p in pdfs}
+                jobs, not_found = plan_lock_jobs(df, pdf_map)
+                # Hanya PDF yang ada di daftar yang disalin ke job; password tetap di memori (tidak ditulis ke disk)
+                start_job("lock_job", "lock", lock_task, [(name, pdf_map[name]) for name in dict(jobs)],
+                          f"Batch lock {len(jobs)} PDF", jobs=jobs, not_found=not_found)
+            except ValueError as e:
+                st.error(str(e))
             except Exception:
                 st.error(traceback.format_exc())
 
+        def show_lock(summary):
+            st.caption(f"{summary['locked']} file dikunci.")
+            if summary["n_not_found"]:
+                st.warning(f"{summary['n_not_found']} files not found sample: {summary['not_found'][:10]}")
+            if summary["n_errors"]:
+                st.warning(f"{summary['n_errors']} file gagal dikunci, contoh: {summary['errors'][:5]}")
+
+        job_panel("lock_job", show_lock)
+
     if tool == "Preview PDF":
         st.markdown("---")
         st.markdown("###  Preview PDF")
-        f = st.file_uploader("Upload PDF", type="pdf")
-        mode = st.radio("Preview mode", ["First page (fast)", "All pages (slow)"])
-        if f and st.button("Show Preview"):
+        f = file_uploader("Upload PDF", type="pdf")
+        c1, c2 = st.columns(2)
+        with c1:
+            preview_dpi = st.slider("Resolusi thumbnail (DPI)", 30, 150, PREVIEW_DPI, step=10)
+        with c2:
+            per_view = st.number_input("Halaman per tampilan", 1, 24, PREVIEW_PAGE_SIZE)
+        if f:
             try:
-                if PdfReader is None and not PDF2IMAGE_AVAILABLE:
-                    st.error("PyPDF2/pdf2image tidak terinstall.")
+                if PdfReader is None:
+                    st.error("PyPDF2 tidak terinstall.")
                     st.stop()
-                with st.spinner("Preparing preview..."):
-                    pdf_bytes = f.read()
-                    if PDF2IMAGE_AVAILABLE:
-                        if mode.startswith("First"):
-                            if convert_from_bytes is not None:
-                                imgs = convert_from_bytes(pdf_bytes, first_page=1, last_page=1)
-                            else:
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                                    tmp.write(pdf_bytes)
-                                tmp_path = tmp.name
-                                imgs = convert_from_path(tmp_path, first_page=1, last_page=1)
-                                try:
-                                    os.unlink(tmp_path)
-                                except Exception:
-                                    pass
-                            buf = io.BytesIO(); imgs[0].save(buf, format="PNG"); buf.seek(0)
-                            st.image(buf.getvalue(), caption="Page 1")
-                        else:
-                            if convert_from_bytes is not None:
-                                images = convert_from_bytes(pdf_bytes)
-                            else:
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                                    tmp.write(pdf_bytes)
-                                tmp_path = tmp.name
-                                images = convert_from_path(tmp_path)
-                                try:
-                                    os.unlink(tmp_path)
-                                except:
-                                    pass
-                            for i, img in enumerate(images):
-                                buf = io.BytesIO(); img.save(buf, format="PNG"); st.image(buf.getvalue(), caption=f"Page {i+1}")
-                    else:
-                        reader = PdfReader(io.BytesIO(pdf_bytes))
-                        if mode.startswith("First"):
-                            text = reader.pages[0].extract_text() or "Teks tidak dapat diekstrak (Mungkin gambar)"
-                            st.text_area("Preview Page 1 (Text only)", text, height=300)
-                        else:
-                            all_text = [p.extract_text() or "Teks tidak dapat diekstrak" for p in reader.pages]
-                            st.text_area("Preview All Pages (Text only)", "\n\n--- Halaman Berikutnya ---\n\n".join(all_text), height=500)
+                # Hash isi dokumen: kunci cache render, jadi rerun/pindah halaman tidak merender ulang
+                doc_key = content_hash(f)
+                total_pages = cached_page_count(f, doc_key)
+                n_views = (total_pages + per_view - 1) // per_view
+                view = st.number_input(f"Tampilan (1-{n_views})", 1, max(n_views, 1), 1, key=f"preview_view_{doc_key}")
+                first = (view - 1) * per_view + 1
+                pages = list(range(first, min(first + per_view, total_pages + 1)))
+                st.caption(f"Halaman {pages[0]}-{pages[-1]} dari {total_pages}")
+                if PDF2IMAGE_AVAILABLE:
+                    with st.spinner("Rendering thumbnail..."):
+                        thumbs = render_thumbnails(f, pages, preview_dpi, doc_key)
+                    cols = st.columns(3)
+                    for i, (page_no, png) in enumerate(thumbs):
+                        cols[i % 3].image(png, caption=f"Page {page_no}")
+                else:
+                    for page_no, text in page_texts(f, pages, doc_key):
+                        st.text_area(f"Page {page_no} (Text only)", text or "Teks tidak dapat diekstrak (Mungkin gambar)", height=200)
             except Exception as e:
                 st.error(f"Gagal menampilkan preview. Pastikan Poppler terinstall untuk konversi ke gambar. Error: {e}")
                 traceback.print_exc()
@@ -1267,31 +1092,28 @@ if menu == "File Tools":
         mode = st.radio("Pilih Mode", ["Compress to ZIP", "Extract from ZIP"])
 
         if mode == "Compress to ZIP":
-            files = st.file_uploader("Unggah File (Multiple)", accept_multiple_files=True)
+            files = file_uploader("Unggah File (Multiple)", accept_multiple_files=True)
             if files and st.button("Buat ZIP"):
                 try:
-                    out_map = {f.name: f.read() for f in files}
-                    zipb = make_zip_from_map(out_map)
+                    out, _ = zip_files([(f.name, f) for f in files])
+                    zipb = spool_to_bytes(out); out.close()
                     st.download_button("Unduh ZIP", zipb, file_name="compressed_files.zip", mime="application/zip")
                     st.success("Kompresi selesai.")
                 except Exception as e:
                     st.error(f"Gagal: {e}")
 
         elif mode == "Extract from ZIP":
-            f = st.file_uploader("Unggah File ZIP", type=["zip"])
+            f = file_uploader("Unggah File ZIP", type=["zip"])
             if f and st.button("Ekstrak ke Folder/ZIP"):
                 try:
-                    z = zipfile.ZipFile(io.BytesIO(f.read()))
-                    extracted_files = {}
-                    for name in z.namelist():
-                        if not name.endswith('/'): # Skip directories
-                            extracted_files[name] = z.read(name)
-                    
-                    if extracted_files:
-                        st.download_button("Unduh Hasil Ekstraksi (ZIP)", make_zip_from_map(extracted_files), file_name="extracted_content.zip", mime="application/zip")
-                        st.info(f"{len(extracted_files)} file berhasil diekstrak.")
+                    # Entri folder dilewati; isi tiap file disalin bertahap ke arsip baru
+                    out, n_files = extract_zip(f)
+                    if n_files:
+                        st.download_button("Unduh Hasil Ekstraksi (ZIP)", spool_to_bytes(out), file_name="extracted_content.zip", mime="application/zip")
+                        st.info(f"{n_files} file berhasil diekstrak.")
                     else:
                         st.warning("File ZIP kosong atau hanya berisi folder.")
+                    out.close()
                 except Exception as e:
                     st.error(f"Gagal ekstrak: {e}")
 
@@ -1299,24 +1121,17 @@ if menu == "File Tools":
     if file_tool == " Konversi Dasar (misal: TXT/CSV/JSON -> Excel)":
         st.markdown("---")
         st.subheader("Konversi Data ke Excel")
-        f = st.file_uploader("Unggah file (TXT, CSV, JSON)", type=["txt", "csv", "json"])
+        f = file_uploader("Unggah file (TXT, CSV, JSON)", type=["txt", "csv", "json"])
         if f:
             df = None
             try:
-                if f.name.lower().endswith(".csv"):
-                    df = pd.read_csv(io.BytesIO(f.read()))
-                elif f.name.lower().endswith(".json"):
-                    df = pd.read_json(io.BytesIO(f.read()))
-                elif f.name.lower().endswith(".txt"):
-                    # Asumsi txt adalah CSV sederhana
-                    df = pd.read_csv(io.BytesIO(f.read())) 
+                if f.name.lower().endswith((".csv", ".json", ".txt")):
+                    # txt diasumsikan CSV sederhana
+                    df = read_table(f)
                 
                 if df is not None:
                     st.dataframe(df.head())
-                    if st.button("Konversi ke Excel"):
-                        excel_bytes = df_to_excel_bytes(df)
-                        st.download_button("Unduh Excel", excel_bytes, file_name="converted_file.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                        st.success("Konversi berhasil.")
+                    dataframe_download(df, "converted_file", key="basic_convert", cache_key=content_hash(f))
             except Exception as e:
                 st.error(f"Gagal memproses file: {e}")
 
@@ -1328,9 +1143,10 @@ if menu == "File Tools":
         libs = {
             "PyPDF2": PdfReader is not None,
             "pdfplumber": pdfplumber is not None,
-            "python-docx (Document)": Document is not None,
+            "python-docx (Document)": DOCX_AVAILABLE,
             "pdf2image (convert_from_path/bytes)": PDF2IMAGE_AVAILABLE,
             "deep_translator (GoogleTranslator)": Translator is not None, 
+            "pikepdf (Kompres PDF: object streams)": PIKEPDF_AVAILABLE,
         }
 
         for name, is_available in libs.items():
@@ -1356,69 +1172,46 @@ if menu == "MCU Tools":
         st.subheader(" Organise by Excel (Original Logic)")
         st.info("Fitur ini akan membuat struktur folder di dalam file ZIP berdasarkan data Excel dan nama file PDF yang diunggah.")
         
-        excel_up = st.file_uploader("Upload Excel (No_MCU, Nama, Departemen, JABATAN) or (filename,target_folder)", type=["xlsx","csv"], key="mcu_organize_excel")
-        pdfs = st.file_uploader("Upload PDF files (multiple)", type="pdf", accept_multiple_files=True, key="mcu_organize_pdf")
+        excel_up = file_uploader("Upload Excel (No_MCU, Nama, Departemen, JABATAN) or (filename,target_folder)", type=["xlsx","csv"], key="mcu_organize_excel")
+        pdfs = file_uploader("Upload PDF files (multiple)", type="pdf", accept_multiple_files=True, key="mcu_organize_pdf")
         
         if excel_up and pdfs and st.button("Process MCU"):
             try:
                 with st.spinner("Memproses MCU..."):
-                    # Baca Excel/CSV
-                    if excel_up.name.lower().endswith(".csv"):
-                        df = pd.read_csv(io.BytesIO(excel_up.read()))
-                    else:
-                        df = pd.read_excel(io.BytesIO(excel_up.read()))
+                    # Baca Excel/CSV (hanya kolom yang dipakai salah satu mode organise)
+                    df = read_table(excel_up, columns=MCU_COLUMNS + FOLDER_COLUMNS)
                         
-                    pdf_map = {p.name: p.read() for p in pdfs}
-                    out_map = {}
+                    pdf_map = {p.name: p for p in pdfs}
+                    sink = ZipSink()
                     not_found = []
                     
-                    # Logika Organise by Excel (dari input user)
-                    if all(c in df.columns for c in ["No_MCU","Nama","Departemen","JABATAN"]):
-                        st.info("Mode: Organisasi berdasarkan kolom **No_MCU, Departemen, JABATAN** (Struktur: Dept/Jabatan/File.pdf).")
-                        total = len(df)
-                        prog = st.progress(0)
-                        for idx, r in df.iterrows():
-                            # Pastikan konversi ke string dan strip.
-                            # Mengganti karakter yang tidak valid untuk nama folder/file di ZIP dengan underscore
-                            no = str(r["No_MCU"]).strip()
-                            # Cleaning folder names for ZIP paths
-                            dept = str(r["Departemen"]).strip().replace('/', '_').replace('\\', '_') if not pd.isna(r["Departemen"]) else "Unknown_Dept"
-                            jab = str(r["JABATAN"]).strip().replace('/', '_').replace('\\', '_') if not pd.isna(r["JABATAN"]) else "Unknown_JABATAN"
-                            
-                            # Mencari PDF yang namanya diawali dengan No_MCU
-                            # Hati-hati: gunakan .lower() jika nama file mungkin tidak case-sensitive
-                            matches = [k for k in pdf_map.keys() if k.startswith(no)] 
-                            
-                            if matches:
-                                # Hanya ambil match pertama jika ada banyak (asumsi 1 MCU = 1 PDF)
-                                out_map[f"{dept}/{jab}/{matches[0]}"] = pdf_map[matches[0]]
-                            else:
-                                not_found.append(no)
-                            prog.progress(int((idx+1)/total*100))
-                            
-                    elif "filename" in df.columns and "target_folder" in df.columns:
-                        st.info("Mode: Organisasi berdasarkan kolom **filename** dan **target_folder** (Struktur: Folder/File.pdf).")
-                        total = len(df)
-                        prog = st.progress(0)
-                        for idx, r in df.iterrows():
-                            fn = str(r["filename"]).strip()
-                            # Cleaning folder name
-                            tgt = str(r["target_folder"]).strip().replace('/', '_').replace('\\', '_')
-                            
-                            if fn in pdf_map:
-                                out_map[f"{tgt}/{fn}"] = pdf_map[fn]
-                            else:
-                                not_found.append(fn)
-                            prog.progress(int((idx+1)/total*100))
-                            
-                    else:
+                    # Logika Organise by Excel (dari input user). Mode MCU memakai indeks prefix:
+                    # tiap No_MCU hanya dicocokkan dengan nama file yang diawali ID tersebut
+                    plan = None
+                    t0 = time.perf_counter()
+                    try:
+                        mode, plan, not_found, ambiguous = plan_organise(df, pdf_map)
+                    except ValueError:
                         st.error("Format Excel/CSV tidak valid. Diperlukan kolom: **No_MCU, Nama, Departemen, JABATAN** ATAU **filename, target_folder**.")
-                        
+                    else:
+                        if mode == "mcu":
+                            st.info("Mode: Organisasi berdasarkan kolom **No_MCU, Departemen, JABATAN** (Struktur: Dept/Jabatan/File.pdf).")
+                        else:
+                            st.info("Mode: Organisasi berdasarkan kolom **filename** dan **target_folder** (Struktur: Folder/File.pdf).")
+                        if ambiguous:
+                            sample = dict(list(ambiguous.items())[:10])
+                            st.warning(f"{len(ambiguous)} No_MCU cocok dengan lebih dari satu file (file pertama yang dipakai). Contoh: {sample}")
+
+                    if plan is not None:
+                        st.caption(f"Waktu pencocokan: {time.perf_counter() - t0:.3f} s untuk {len(df)} baris x {len(pdf_map)} file")
+                        prog = st.progress(0)
+                        write_organised(plan, pdf_map, sink, progress=lambda i, total: prog.progress(int(i/total*100)))
+
                 # Hasil Download
-                if out_map:
-                    zipb = make_zip_from_map(out_map)
+                if sink.count:
+                    zipb = sink.getvalue()
                     st.download_button("Download MCU zip", zipb, file_name="mcu_structured.zip", mime="application/zip")
-                    st.success(f" {len(out_map)} file berhasil diproses dan diatur strukturnya.")
+                    st.success(f" {sink.count} file berhasil diproses dan diatur strukturnya.")
                 else:
                     st.warning("Tidak ada file yang berhasil diproses.")
                     
@@ -1435,7 +1228,7 @@ if menu == "MCU Tools":
         st.subheader(" Dashboard Analisis Hasil MCU Massal (Diperbarui)")
         st.markdown("Unggah data hasil MCU (Excel/CSV) untuk analisis cepat, visualisasi, dan filter data.")
         
-        uploaded_file = st.file_uploader(
+        uploaded_file = file_uploader(
             "Unggah file Data MCU (Excel/CSV):",
             type=["xlsx", "csv"],
             key="mcu_data_uploader_new"
@@ -1445,15 +1238,15 @@ if menu == "MCU Tools":
             try:
                 # 1. Baca File
                 with st.spinner("Membaca data dan normalisasi kolom..."):
-                    if uploaded_file.name.lower().endswith('.csv'):
-                        df = pd.read_csv(io.BytesIO(uploaded_file.read()))
-                    else:
-                        df = pd.read_excel(io.BytesIO(uploaded_file.read()))
+                    t0 = time.perf_counter()
+                    # Upload di-parse sekali ke cache Arrow di disk; rerun berikutnya cukup memory-map.
+                    # Profil (nama kolom dinormalisasi, kolom status/kategorikal -> category, jumlah per nilai)
+                    # juga dihitung sekali per file dan dipakai ulang oleh semua grafik, filter dan export.
+                    profile = cached_profile(uploaded_file)
+                    df = profile.df
     
                     st.success(f"Data berhasil dimuat. Total Baris: {len(df)}")
-                    
-                    # Normalisasi kolom: Hapus karakter non-alfanumerik/underscore dan buat lowercase
-                    df.columns = df.columns.str.replace('[^A-Za-z0-9_]+', '', regex=True).str.lower()
+                    st.caption(f"Waktu muat: {time.perf_counter() - t0:.3f} s")
                 
                 st.markdown("#### Preview Data (5 Baris Teratas)")
                 st.dataframe(df.head(), use_container_width=True)
@@ -1463,7 +1256,7 @@ if menu == "MCU Tools":
                 
                 # 2. Analisis Status Kesehatan
                 # Cari kolom yang mengandung 'status', 'fit', atau 'hasil'
-                status_cols = [col for col in df.columns if 'status' in col or 'fit' in col or 'hasil' in col]
+                status_cols = profile.status_columns
                 
                 if status_cols:
                     col1, col2 = st.columns([2, 1])
@@ -1478,21 +1271,18 @@ if menu == "MCU Tools":
                     
                     st.markdown(f"##### 1. Distribusi Status Kesehatan (`{status_col}`)")
                     
-                    # Data Cleaning & Aggregation
-                    df[status_col] = df[status_col].astype(str).str.strip().str.upper().fillna("TIDAK DIKETAHUI")
-                    status_counts = df[status_col].value_counts().reset_index()
-                    status_counts.columns = [status_col, 'Jumlah']
-                    status_counts = status_counts.sort_values(by='Jumlah', ascending=False)
+                    # Nilai sudah dinormalisasi (strip + huruf besar) dan dihitung saat profiling
+                    status_counts = profile.counts(status_col)
                     
                     if len(status_counts) > 0:
                         st.dataframe(status_counts, use_container_width=True)
                         st.bar_chart(status_counts.set_index(status_col))
                         
                         # Download Data Agregat
-                        excel_bytes = df_to_excel_bytes(status_counts)
+                        excel_data = df_to_excel(status_counts)
                         st.download_button(
                             " Unduh Data Agregasi Status (Excel)", 
-                            data=excel_bytes, 
+                            data=excel_data, 
                             file_name="status_agregat.xlsx", 
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                         )
@@ -1506,11 +1296,8 @@ if menu == "MCU Tools":
                 # 3. Analisis Categorical/Filter
                 st.markdown("###  Filter dan Analisis Data Kategorikal")
                 
-                # Pilih kolom kategorikal (object type) dengan jumlah unik > 1 dan <= 50
-                filter_cols = [
-                    col for col in df.columns 
-                    if df[col].dtype == 'object' and df[col].nunique() > 1 and df[col].nunique() <= 50
-                ]
+                # Kolom teks dengan jumlah unik > 1 dan <= 50 (dihitung sekali saat profiling)
+                filter_cols = profile.filter_columns
                 
                 if filter_cols:
                     col_to_analyze = st.selectbox(
@@ -1521,19 +1308,16 @@ if menu == "MCU Tools":
                     
                     st.write(f"##### Distribusi Nilai dalam Kolom `{col_to_analyze}`")
                     
-                    # Data Cleaning & Aggregation
-                    df[col_to_analyze] = df[col_to_analyze].astype(str).str.strip().str.upper().fillna("TIDAK DIKETAHUI")
-                    cat_counts = df[col_to_analyze].value_counts().reset_index()
-                    cat_counts.columns = [col_to_analyze, 'Jumlah']
+                    cat_counts = profile.counts(col_to_analyze)
                     
                     st.dataframe(cat_counts, use_container_width=True)
                     st.bar_chart(cat_counts.set_index(col_to_analyze))
                     
                     # Download Agregat Kategorikal
-                    excel_bytes_cat = df_to_excel_bytes(cat_counts)
+                    excel_data_cat = df_to_excel(cat_counts)
                     st.download_button(
                         f" Unduh Data Agregasi {col_to_analyze} (Excel)", 
-                        data=excel_bytes_cat, 
+                        data=excel_data_cat, 
                         file_name=f"{col_to_analyze.lower()}_agregat.xlsx", 
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
@@ -1542,7 +1326,7 @@ if menu == "MCU Tools":
                     st.markdown("---")
                     st.markdown("##### Tampilkan Data Mentah Terfilter")
                     
-                    filter_values = ["-- Pilih Nilai untuk Filter Data --"] + list(df[col_to_analyze].unique())
+                    filter_values = ["-- Pilih Nilai untuk Filter Data --"] + profile.categories(col_to_analyze)
                     selected_value = st.selectbox(
                         f"Pilih Nilai `{col_to_analyze}` untuk Menampilkan Data:", 
                         filter_values,
@@ -1550,23 +1334,23 @@ if menu == "MCU Tools":
                     )
                     
                     if selected_value != "-- Pilih Nilai untuk Filter Data --":
-                        df_filtered = df[df[col_to_analyze] == selected_value]
+                        # Filter lewat kode kategori (integer), bukan perbandingan string per baris
+                        df_filtered = profile.filter(col_to_analyze, selected_value)
                         st.info(f"Menampilkan **{len(df_filtered)}** baris data untuk `{selected_value}`.")
                         st.dataframe(df_filtered, use_container_width=True)
                         
-                        # Download Filtered Data Mentah
-                        excel_bytes_filtered = df_to_excel_bytes(df_filtered)
-                        st.download_button(
-                            f" Unduh Data Filtered ({selected_value}) (Excel)", 
-                            data=excel_bytes_filtered, 
-                            file_name=f"data_filtered_{selected_value.lower().replace(' ', '_')}.xlsx", 
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        # Download Filtered Data Mentah (dibuat hanya saat diminta; CSV/Parquet untuk data besar)
+                        dataframe_download(
+                            df_filtered,
+                            f"data_filtered_{selected_value.lower().replace(' ', '_')}",
+                            key="mcu_filtered_download",
+                            cache_key=(profile.doc_key, col_to_analyze, selected_value),
                         )
                         
                     else:
                         st.info("Pilih nilai di atas untuk menampilkan dan mengunduh data mentah yang terfilter.")
                 else:
-                    st.info("Tidak ada kolom kategorikal yang cocok (object type dengan 2-50 nilai unik) untuk analisis mendalam. Pastikan kolom seperti 'Departemen' atau 'Gender' bertipe teks.")
+                    st.info("Tidak ada kolom kategorikal yang cocok (kolom teks dengan 2-50 nilai unik) untuk analisis mendalam. Pastikan kolom seperti 'Departemen' atau 'Gender' bertipe teks.")
 
             except Exception as e:
                 st.error(f"Gagal memuat atau memproses file. Pastikan file Excel/CSV Anda valid: {e}")
@@ -1578,12 +1362,45 @@ if menu == "MCU Tools":
         st.subheader("Ekstraksi Data dari Laporan MCU PDF")
         st.warning("Fitur ini sangat bergantung pada struktur dan format PDF. Mungkin memerlukan konfigurasi kustom.")
         
-        pdf_up = st.file_uploader("Unggah Laporan MCU PDF:", type=["pdf"], key="mcu_pdf_up")
+        pdf_up = file_uploader("Unggah Laporan MCU PDF:", type=["pdf"], key="mcu_pdf_up")
         
         if pdf_up and st.button("Ekstrak Data"):
             st.error("Fitur ini adalah placeholder dan memerlukan logic ekstraksi PDF yang kompleks untuk diimplementasikan.")
 
 
+# -------------- Riwayat Job --------------
+if menu == "Riwayat Job":
+    add_back_to_dashboard_button()
+    st.subheader(" Riwayat Job Latar Belakang")
+    st.caption("Hasil job disimpan di server (dibersihkan otomatis setelah 7 hari) dan bisa diunduh ulang tanpa diproses lagi, juga setelah halaman di-refresh.")
+    remember_job_owner()
+    with st.expander("Kode riwayat (membuka riwayat yang sama di browser/perangkat lain)"):
+        st.caption("Kode ini adalah kunci riwayat job Anda: jangan dibagikan.")
+        st.code(job_owner(), language=None)
+        resume_code = st.text_input("Buka riwayat dengan kode", type="password", key="job_owner_code").strip()
+        if st.button("Buka riwayat", key="job_owner_resume"):
+            if valid_job_owner(resume_code):
+                st.session_state.job_owner = resume_code
+                st.rerun()
+            st.error("Kode riwayat tidak valid.")
+    jobs = job_runner().jobs(owner=job_owner())
+    if not jobs:
+        st.info("Belum ada job.")
+    for job in jobs:
+        created = time.strftime("%d-%m-%Y %H:%M", time.localtime(job["created"]))
+        with st.expander(f"{job['title']} — {JOB_STATE_LABELS[job['state']]} ({created})", expanded=job["state"] in ("queued", "running")):
+            if job["state"] in ("queued", "running"):
+                job_progress(job["id"])
+            elif job["state"] == "done":
+                job_downloads(job, "history")
+                if st.button("Hapus job", key=f"delete_{job['id']}"):
+                    job_runner().delete(job["id"], owner=job_owner())
+                    st.rerun()
+            elif job["state"] == "failed":
+                st.error(job["error"])
+            else:
+                st.warning("Job dibatalkan.")
+
 # -------------- Tentang (Diperbarui) --------------
 if menu == "Tentang":
     add_back_to_dashboard_button() 
@@ -1604,9 +1421,16 @@ if menu == "Tentang":
     - `python-docx` untuk menghasilkan .docx: `pip install python-docx`
     - `deep-translator` untuk fitur terjemahan PDF: `pip install deep-translator`
     - `pdf2image` + poppler untuk konversi PDF->Gambar / Preview gambar: `pip install pdf2image`
+    - `pikepdf` (opsional) untuk tahap object streams di Kompres PDF: `pip install pikepdf`
     - `pandas` & `openpyxl` untuk Analisis MCU dan Batch Rename by Excel: `pip install pandas openpyxl`
     """)
     st.info("Data diproses di server tempat Streamlit dijalankan. Untuk mengaktifkan semua fitur, pasang dependensi yang diperlukan.")
+    up_stats = upload_store().stats()
+    st.caption(f"Upload sesi ini: {up_stats['files']} file ({up_stats['spooled']} di disk), "
+               f"{up_stats['used'] / 1024 / 1024:.1f} dari kuota {up_stats['quota'] / 1024 / 1024:.0f} MB")
+
+# Upload milik tool yang tidak ditampilkan di run ini dilepas dari disk/kuota
+upload_store().release_unbound()
 
 # ----------------- Footer -----------------
 st.markdown("""
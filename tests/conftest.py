@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+
+def _pdf(page_texts, size=(595, 842), image=None):
+    """
+    PDF minimal (Helvetica) dengan satu baris teks per halaman. `image` = PIL.Image RGB tanpa kompresi
+    yang digambar selebar halaman di setiap halaman (untuk uji kompresi).
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    xobject = b""
+    if image is not None:
+        raw = image.convert("RGB").tobytes()
+        objects.append(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                       b"/BitsPerComponent 8 /Length %d >>\nstream\n" % (image.width, image.height, len(raw))
+                       + raw + b"\nendstream")
+        xobject = b" /XObject << /Im1 %d 0 R >>" % len(objects)
+    kids = []
+    for text in page_texts:
+        content = b"BT /F1 12 Tf 40 %d Td (%s) Tj ET" % (size[1] - 40, text.encode("latin-1"))
+        if image is not None:
+            content = b"q %d 0 0 %d 0 0 cm /Im1 Do Q " % size + content
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] " % size
+                       + b"/Resources << /Font << /F1 3 0 R >>%s >> /Contents %d 0 R >>" % (xobject, len(objects)))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    buf = io.BytesIO()
+    buf.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, 1):
+        offsets.append(buf.tell())
+        buf.write(b"%d 0 obj\n" % num + obj + b"\nendobj\n")
+    xref = buf.tell()
+    buf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        buf.write(b"%010d 00000 n \n" % off)
+    buf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return buf.getvalue()
+
+
+@pytest.fixture
+def make_pdf():
+    """Pabrik PDF uji: make_pdf(["teks hal 1", "teks hal 2"], image=None) -> bytes."""
+    return _pdf
+
+
+@pytest.fixture
+def pdf_texts():
+    """Teks per halaman dari output (bytes, path atau file-like) untuk memeriksa isi hasil."""
+    from PyPDF2 import PdfReader
+
+    def read(out):
+        if isinstance(out, (bytes, bytearray)):
+            out = io.BytesIO(out)
+        elif hasattr(out, "seek"):
+            out.seek(0)
+        return [page.extract_text().strip() for page in PdfReader(out).pages]
+    return read
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PIL import Image
+from PyPDF2 import PdfReader
+
+from kay_core import compress_pdf
+
+
+def _photo(side=600):
+    """Gambar gradasi halus (mirip foto hasil scan) tanpa kompresi."""
+    img = Image.linear_gradient("L").resize((side, side)).convert("RGB")
+    return Image.merge("RGB", (img.getchannel(0), img.rotate(90).getchannel(0), img.rotate(180).getchannel(0)))
+
+
+def test_compress_pdf_shrinks_and_still_opens(make_pdf):
+    source = make_pdf(["hasil 1", "hasil 2", "hasil 3"], size=(200, 200), image=_photo())
+    stages = []
+    data, report = compress_pdf(source, target_dpi=150, quality=60, progress=stages.append)
+
+    assert len(data) < len(source) / 4
+    assert stages == ["images", "dedupe", "flate", "objstm"]
+    by_stage = {r["stage"]: r for r in report}
+    assert by_stage["images"]["saved"] > len(source) / 2
+
+    reader = PdfReader(io.BytesIO(data))
+    assert [p.extract_text().strip() for p in reader.pages] == ["hasil 1", "hasil 2", "hasil 3"]
+    image = reader.pages[0]["/Resources"]["/XObject"]["/Im1"].get_object()
+    assert image["/Filter"] == "/DCTDecode" and image["/Width"] < 600
+    Image.open(io.BytesIO(image._data)).load()
+
+
+def test_compress_pdf_stage_selection(make_pdf):
+    source = make_pdf(["a"] * 4)
+    data, report = compress_pdf(source, stages=("flate",))
+    assert [r["stage"] for r in report] == ["rewrite", "flate"]
+    assert report[-1]["size"] <= report[0]["size"]
+    assert len(PdfReader(io.BytesIO(data)).pages) == 4
@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+import pytest
+
+import kay_core.export as export
+from kay_core import available_export_formats, export_dataframe, spool_reader
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "nama": ["Ani", "Budi\x07", None],
+        "umur": [31, 45, 28],
+        "tekanan": [120.5, None, 110.0],
+        "tanggal": pd.to_datetime(["2024-01-02", None, "2024-03-04"]).tz_localize("Asia/Jakarta"),
+        "campur": ["a", 1, 2.5],
+    })
+
+
+def test_export_csv_roundtrip(frame):
+    data = spool_reader(export_dataframe(frame, "csv"))()
+    assert data.startswith(b"\xef\xbb\xbf")
+    back = pd.read_csv(io.BytesIO(data), encoding="utf-8-sig")
+    assert list(back.columns) == list(frame.columns) and back["umur"].tolist() == [31, 45, 28]
+
+
+def test_export_parquet_roundtrip(frame):
+    if "parquet" not in available_export_formats():
+        pytest.skip("pyarrow tidak terinstall")
+    back = pd.read_parquet(export_dataframe(frame, "parquet"))
+    assert back["umur"].tolist() == [31, 45, 28]
+    # Kolom object campuran disimpan sebagai teks
+    assert back["campur"].tolist() == ["a", "1", "2.5"]
+
+
+def test_export_xlsx_chunks_and_cleans_values(frame, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)
+    ws = openpyxl.load_workbook(export_dataframe(frame, "xlsx"), read_only=True).active
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0] == ("nama", "umur", "tekanan", "tanggal", "campur")
+    assert [r[1] for r in rows[1:]] == [31, 45, 28]
+    assert rows[2][0] == "Budi" and rows[3][0] is None and rows[2][2] is None
+    assert rows[1][3].tzinfo is None and rows[2][3] is None
+
+
+def test_export_rejects_unknown_format_and_excel_overflow(frame, monkeypatch):
+    with pytest.raises(ValueError):
+        export_dataframe(frame, "ods")
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", 3)
+    with pytest.raises(ValueError):
+        export_dataframe(frame, "xlsx")
@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PIL import Image
+from PyPDF2 import PdfReader
+
+from kay_core import images_to_pdf
+
+
+def _image_bytes(size, fmt, mode="RGB"):
+    img = Image.linear_gradient("L").resize(size).convert(mode)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _xobject(page):
+    return page["/Resources"]["/XObject"]["/Im0"].get_object()
+
+
+def test_jpeg_passthrough_keeps_original_bytes():
+    jpeg = _image_bytes((300, 200), "JPEG")
+    png = _image_bytes((100, 400), "PNG", "RGBA")
+    out, pages, passthrough = images_to_pdf([jpeg, png, _image_bytes((64, 64), "JPEG", "L")])
+    assert (pages, passthrough) == (3, 2)
+
+    reader = PdfReader(out)
+    first, second, third = (_xobject(p) for p in reader.pages)
+    assert first["/Filter"] == "/DCTDecode" and first._data == jpeg
+    assert third["/ColorSpace"] == "/DeviceGray"
+    assert second["/Filter"] == "/FlateDecode" and (second["/Width"], second["/Height"]) == (100, 400)
+    assert second.get_data() == Image.open(io.BytesIO(png)).convert("RGB").tobytes()
+    # page_size "image" pada 72 DPI: satu piksel = satu point
+    assert [float(v) for v in reader.pages[0].mediabox[2:]] == [300, 200]
+
+
+def test_page_size_follows_orientation():
+    out, _, _ = images_to_pdf([_image_bytes((400, 200), "JPEG")], page_size="A4")
+    box = PdfReader(out).pages[0].mediabox
+    assert float(box.width) > float(box.height)
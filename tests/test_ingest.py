@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from kay_core import columnar_table, read_table
+from kay_core.parsed import parsed_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("KAY_CACHE_DIR", str(tmp_path / "cache"))
+    parsed_cache().clear()
+    yield
+    parsed_cache().clear()
+
+
+def _read_both(path, columns=None):
+    """Dibaca lewat parsing baru, lalu (setelah file Arrow dibuat) lewat cache kolumnar."""
+    fresh = read_table(path, columns=columns)
+    parsed_cache().clear()
+    columnar_table(path)
+    cached = read_table(path, columns=columns)
+    return fresh, cached
+
+
+def test_csv_fresh_and_cached_match(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("id,tanggal,nilai,2024,kode\n1,2024-01-05,1.5,10,A1\n2,2024-02-06,,20,\n3,2024-03-07,3.25,30,C3\n")
+    fresh, cached = _read_both(str(path))
+    pd.testing.assert_frame_equal(fresh, cached)
+
+
+def test_excel_mixed_columns_fresh_and_cached_match(tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "data.xlsx"
+    pd.DataFrame({
+        "id": [1, "A2", 3],
+        "tgl": pd.to_datetime(["2024-01-01", "2024-02-01", None]),
+        2024: [1, 2, 3],
+        "x": [1.0, None, 2.0],
+    }).to_excel(path, index=False)
+    fresh, cached = _read_both(str(path))
+    pd.testing.assert_frame_equal(fresh, cached)
+    assert list(fresh.columns) == ["id", "tgl", "2024", "x"]
+
+
+def test_column_subset_matches(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b,c\n1,x,2.5\n2,y,3.5\n")
+    fresh, cached = _read_both(str(path), columns=["c", "a", "tidak_ada"])
+    pd.testing.assert_frame_equal(fresh, cached)
+    assert list(fresh.columns) == ["a", "c"]
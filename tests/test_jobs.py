@@ -0,0 +1,57 @@
+import pytest
+
+from kay_core import JobRunner, JobStore, job_fingerprint
+
+
+def _write_task(ctx, text="halo"):
+    with ctx.output("hasil.txt", "text/plain") as fh:
+        fh.write(text.encode())
+    return {"n": len(text)}
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = JobRunner(JobStore(str(tmp_path / "jobs")), workers=1)
+    yield runner
+    runner.shutdown()
+
+
+def _finished(runner, job_id):
+    runner.shutdown()  # menunggu job di antrean selesai
+    return runner.status(job_id)
+
+
+def test_fingerprint_reuse_is_scoped_to_owner(runner):
+    fp = job_fingerprint("tulis", text="halo")
+    first = runner.submit("tulis", _write_task, owner="a", fingerprint=fp, text="halo")
+    assert _finished(runner, first)["state"] == "done"
+    assert runner.find(fp, "a")["id"] == first
+    assert runner.find(fp, "b") is None
+
+
+def test_other_owner_cannot_see_or_delete(runner):
+    job_id = runner.submit("tulis", _write_task, owner="a")
+    _finished(runner, job_id)
+    assert runner.status(job_id, owner="b") is None
+    assert runner.jobs(owner="b") == []
+    assert runner.delete(job_id, owner="b") is False
+    assert runner.status(job_id, owner="a")["state"] == "done"
+    assert runner.delete(job_id, owner="a") is True
+    assert runner.status(job_id) is None
+
+
+def test_owner_token_is_not_stored_in_record(runner):
+    job_id = runner.submit("tulis", _write_task, owner="token-rahasia")
+    _finished(runner, job_id)
+    assert runner.store.load(job_id)["owner"] != "token-rahasia"
+    assert [job["id"] for job in runner.jobs(owner="token-rahasia")] == [job_id]
+
+
+def test_fingerprint_with_secret_hides_params():
+    params = {"jobs": [["a.pdf", "password123"]]}
+    plain = job_fingerprint("lock", **params)
+    keyed = job_fingerprint("lock", secret="owner-a", **params)
+    assert keyed != plain
+    assert keyed == job_fingerprint("lock", secret="owner-a", **params)
+    assert keyed != job_fingerprint("lock", secret="owner-b", **params)
+    assert keyed != job_fingerprint("lock", secret="owner-a", jobs=[["a.pdf", "lain"]])
@@ -0,0 +1,44 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PyPDF2 import PdfReader
+
+from kay_core import lock_pdfs_to_zip, plan_lock_jobs
+
+
+def test_plan_lock_jobs_matches_names():
+    df = pd.DataFrame({"Nama_File": ["a.pdf", " b.pdf ", "hilang.pdf", "c.pdf", None],
+                       "Kata_Sandi": ["1", "2", "3", " ", "5"]})
+    jobs, not_found = plan_lock_jobs(df, ["a.pdf", "b.pdf", "c.pdf"])
+    assert jobs == [("a.pdf", "1"), ("b.pdf", "2")]
+    assert not_found == ["hilang.pdf"]
+
+
+def test_parallel_batch_lock(make_pdf, tmp_path):
+    sources = {}
+    for i in range(9):
+        data = make_pdf([f"dok {i}"])
+        if i % 2:
+            path = tmp_path / f"f{i}.pdf"
+            path.write_bytes(data)
+            data = str(path)
+        sources[f"f{i}.pdf"] = data
+    sources["rusak.pdf"] = b"bukan pdf"
+    jobs = [(name, f"pw{i}") for i, name in enumerate(sources)]
+    done = []
+    out, count, errors = lock_pdfs_to_zip(jobs, sources, workers=2, progress=lambda d, t: done.append((d, t)))
+
+    assert count == 9 and [name for name, _ in errors] == ["rusak.pdf"]
+    assert done[-1] == (10, 10)
+    with zipfile.ZipFile(out) as zf:
+        assert sorted(zf.namelist()) == sorted(f"locked_f{i}.pdf" for i in range(9))
+        for i in range(9):
+            reader = PdfReader(io.BytesIO(zf.read(f"locked_f{i}.pdf")))
+            assert reader.is_encrypted
+            assert reader.decrypt("salah") == 0
+            assert reader.decrypt(f"pw{i}") != 0
+            assert reader.pages[0].extract_text().strip() == f"dok {i}"
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from kay_core import StreamingPdfMerger, merge_pdfs_in_memory, merge_pdfs_streaming
+
+
+def test_streaming_merge_keeps_pages_and_text(make_pdf, pdf_texts, tmp_path):
+    on_disk = tmp_path / "b.pdf"
+    on_disk.write_bytes(make_pdf(["b1"]))
+    sources = [make_pdf(["a1", "a2"]), str(on_disk), make_pdf(["c1", "c2", "c3"])]
+    done = []
+    out, count = merge_pdfs_streaming(sources, progress=done.append)
+    assert count == 6 and done == [1, 2, 3]
+    assert pdf_texts(out) == ["a1", "a2", "b1", "c1", "c2", "c3"]
+
+    legacy, legacy_count = merge_pdfs_in_memory(sources)
+    assert legacy_count == count and pdf_texts(legacy) == pdf_texts(out)
+
+
+def test_merger_counts_files_and_pages(make_pdf, pdf_texts):
+    merger = StreamingPdfMerger()
+    assert merger.append(make_pdf(["x"])) == 1
+    assert merger.append(make_pdf(["y", "z"])) == 2
+    assert (merger.file_count, merger.page_count) == (2, 3)
+    assert pdf_texts(merger.finish()) == ["x", "y", "z"]
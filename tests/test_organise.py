@@ -0,0 +1,9 @@
+from kay_core import PrefixIndex
+
+
+def test_prefix_index_keeps_upload_order():
+    index = PrefixIndex(["12_b.pdf", "2_a.pdf", "12_a.pdf", "12_b.pdf", "120.pdf"])
+    assert len(index) == 4
+    assert index.matches("12") == ["12_b.pdf", "12_a.pdf", "120.pdf"]
+    assert index.matches("12_") == ["12_b.pdf", "12_a.pdf"]
+    assert index.matches("3") == []
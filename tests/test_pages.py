@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PyPDF2 import PdfReader
+
+import kay_core.parsed as parsed
+from kay_core import cached_page_count, open_pdf_reader, remove_pages, reorder_pages
+
+
+def test_reorder_and_remove_pages(make_pdf, pdf_texts):
+    pdf = make_pdf(["satu", "dua", "tiga"])
+    data, count = reorder_pages(pdf, [3, 1, 2])
+    assert count == 3 and pdf_texts(data) == ["tiga", "satu", "dua"]
+    data, count = remove_pages(pdf, [2])
+    assert count == 2 and pdf_texts(data) == ["satu", "tiga"]
+
+
+def test_remove_pages_parses_once(make_pdf, monkeypatch):
+    opened = []
+    monkeypatch.setattr(parsed, "PdfReader", lambda stream: opened.append(stream) or PdfReader(stream))
+    remove_pages(make_pdf(["a", "b", "c"]), [1, 3])
+    assert len(opened) == 1
+
+
+def test_readers_are_independent_and_page_count_cached(make_pdf, monkeypatch):
+    pdf = make_pdf(["a", "b"])
+    first, second = open_pdf_reader(pdf), open_pdf_reader(pdf)
+    assert first is not second and first.stream is not second.stream
+    assert cached_page_count(pdf) == 2
+    monkeypatch.setattr(parsed, "PdfReader", None)
+    assert cached_page_count(pdf) == 2
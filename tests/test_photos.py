@@ -0,0 +1,43 @@
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+
+from kay_core import compress_images_to_zip
+from kay_core.photos import compress_image_bytes
+
+
+def _image_bytes(size, fmt="JPEG", mode="RGB"):
+    img = Image.linear_gradient("L").resize(size).convert(mode)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, quality=95)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("size, fmt, mode", [((3000, 2000), "JPEG", "RGB"), ((900, 1600), "PNG", "RGBA")])
+def test_compress_image_bytes_fits_max_side(size, fmt, mode):
+    data = compress_image_bytes(_image_bytes(size, fmt, mode), max_side=800, quality=70)
+    img = Image.open(io.BytesIO(data))
+    assert img.format == "JPEG" and img.mode == "RGB"
+    assert max(img.size) == 800
+    assert abs(img.width / img.height - size[0] / size[1]) < 0.01
+
+
+def test_compress_images_to_zip_parallel(tmp_path):
+    sources = []
+    for i in range(5):
+        path = tmp_path / f"foto{i}.jpg"
+        path.write_bytes(_image_bytes((2400, 1800)))
+        sources.append((path.name, str(path)))
+    sources.append(("rusak.jpg", b"bukan gambar"))
+    done = []
+    out, count, errors = compress_images_to_zip(sources, max_side=600, workers=2,
+                                                progress=lambda d, t: done.append((d, t)))
+    assert count == 5 and [name for name, _ in errors] == ["rusak.jpg"] and done[-1] == (6, 6)
+    with zipfile.ZipFile(out) as zf:
+        assert sorted(zf.namelist()) == [f"compressed_foto{i}.jpg" for i in range(5)]
+        for name in zf.namelist():
+            data = zf.read(name)
+            assert len(data) < (tmp_path / name[len("compressed_"):]).stat().st_size
+            assert Image.open(io.BytesIO(data)).size == (600, 450)
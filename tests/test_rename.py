@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from kay_core import plan_rename
+
+
+def test_plan_rename_extensions_not_found_and_duplicates():
+    df = pd.DataFrame({
+        "nama_lama": [" a.pdf ", "b.pdf", "c.pdf", "hilang.pdf", "d.PDF"],
+        "nama_baru": ["Satu", "dua.pdf", "Satu", "x", "empat.v2"],
+    })
+    plan = plan_rename(df, ["a.pdf", "b.pdf", "c.pdf", "d.PDF", "tidak_dipakai.pdf"])
+    assert plan.pairs == [
+        ("a.pdf", "Satu.pdf"), ("b.pdf", "dua.pdf"), ("c.pdf", "Satu.pdf"), ("d.PDF", "empat.v2"),
+    ]
+    assert plan.not_found == ["hilang.pdf"]
+    assert plan.duplicates == {"Satu.pdf": ["a.pdf", "c.pdf"]}
+
+
+def test_plan_rename_force_ext():
+    df = pd.DataFrame({"nama_lama": ["a.jpg", "b.jpg"], "nama_baru": ["A", "B.PNG"]})
+    plan = plan_rename(df, ["a.jpg", "b.jpg"], force_ext=".png")
+    assert plan.pairs == [("a.jpg", "A.png"), ("b.jpg", "B.PNG")]
+
+
+def test_plan_rename_requires_columns():
+    with pytest.raises(ValueError):
+        plan_rename(pd.DataFrame({"nama_lama": ["a.pdf"]}), ["a.pdf"])
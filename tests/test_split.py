@@ -0,0 +1,17 @@
+import pytest
+
+from kay_core import plan_split
+
+
+def test_plan_split_modes():
+    assert plan_split(3) == [("page_1.pdf", [0]), ("page_2.pdf", [1]), ("page_3.pdf", [2])]
+    assert plan_split(5, "every", every=2) == [
+        ("pages_1-2.pdf", [0, 1]), ("pages_3-4.pdf", [2, 3]), ("page_5.pdf", [4]),
+    ]
+    assert plan_split(10, "ranges", ranges="1-3, 7") == [("pages_1-3.pdf", [0, 1, 2]), ("page_7.pdf", [6])]
+
+
+@pytest.mark.parametrize("mode, ranges", [("ranges", "2-11"), ("ranges", "3-1"), ("ranges", " , "), ("acak", "")])
+def test_plan_split_invalid(mode, ranges):
+    with pytest.raises(ValueError):
+        plan_split(10, mode, ranges=ranges)
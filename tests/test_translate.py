@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+
+import pytest
+
+from kay_core import TranslationError, translate_chunks, translate_segments
+from kay_core.translate import ThrottledError
+
+
+class FakeBackend:
+    """Backend uji: prefix "T:" per paragraf setelah jeda acak; `throttle_first` panggilan pertama dibalas 429."""
+
+    def __init__(self, throttle_first: int = 0, hang: bool = False, delay: float = 0.01):
+        self.throttle_first = throttle_first
+        self.hang = hang
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+
+    def translate(self, text: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            throttled = self.calls <= self.throttle_first
+            delay = self._rng.uniform(0, self.delay)
+        try:
+            if throttled:
+                raise ThrottledError("429 Too Many Requests")
+            if self.hang:
+                self.release.wait(30)
+            time.sleep(delay)
+            return "\n\n".join(f"T:{p}" for p in text.split("\n\n"))
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def hanging():
+    backend = FakeBackend(hang=True)
+    yield backend
+    backend.release.set()
+
+
+def test_results_keep_input_order_and_respect_workers():
+    backend = FakeBackend(delay=0.02)
+    chunks = [f"c{i}" for i in range(40)] + ["  "]
+    seen = []
+    out, stats = translate_chunks(chunks, lambda: backend, workers=3, rate=1000, progress=lambda d, t: seen.append(d))
+    assert out == [f"T:c{i}" for i in range(40)] + ["  "]
+    assert backend.peak <= 3
+    assert seen == sorted(seen) and seen[-1] == len(chunks)
+    assert stats["calls"] == 40 and stats["failed"] == []
+
+
+def test_throttled_chunks_are_retried_and_rate_drops():
+    backend = FakeBackend(throttle_first=2)
+    chunks = [f"c{i}" for i in range(8)]
+    out, stats = translate_chunks(chunks, lambda: backend, workers=4, rate=50, max_retries=6, backoff=0.01)
+    assert out == [f"T:c{i}" for i in range(8)]
+    assert stats["throttled"] == 2 and stats["retries"] >= 2
+    assert stats["final_rate"] < 50
+
+
+def test_hanging_backend_fails_remaining_chunks_within_bound(hanging):
+    chunks = [f"c{i}" for i in range(6)]
+    t0 = time.monotonic()
+    out, stats = translate_chunks(chunks, lambda: hanging, workers=2, rate=1000, timeout=0.2, max_retries=1,
+                                  backoff=0.01, on_fail="keep")
+    assert time.monotonic() - t0 < 5
+    assert out == chunks
+    assert sorted(stats["failed"]) == list(range(6))
+    assert hanging.peak <= 2
+
+
+def test_hanging_backend_raises_when_on_fail_raise(hanging):
+    t0 = time.monotonic()
+    with pytest.raises(TranslationError):
+        translate_chunks(["a", "b", "c"], lambda: hanging, workers=1, rate=1000, timeout=0.2, max_retries=0)
+    assert time.monotonic() - t0 < 5
+
+
+def test_translate_segments_dedupes_and_splits_back():
+    backend = FakeBackend()
+    segments = ["halo", "", "dunia", "halo"]
+    out, stats = translate_segments(segments, lambda: backend, chunk_size=20, workers=2, rate=1000)
+    assert out == ["T:halo", "", "T:dunia", "T:halo"]
+    assert stats["sent_segments"] == 2 and stats["failed"] == []
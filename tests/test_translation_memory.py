@@ -0,0 +1,55 @@
+import itertools
+import sys
+import types
+
+import pytest
+
+from kay_core import TranslationMemory
+
+# kay_core.translation_memory tertutup fungsi bernama sama di __init__, jadi modulnya diambil dari sys.modules
+tm_module = sys.modules[TranslationMemory.__module__]
+
+
+@pytest.fixture
+def tm(tmp_path, monkeypatch):
+    # Jam palsu yang selalu maju: urutan last_used pasti berbeda untuk setiap operasi
+    clock = itertools.count(1)
+    monkeypatch.setattr(tm_module, "time", types.SimpleNamespace(time=lambda: float(next(clock))))
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), max_bytes=2000)
+    yield memory
+    memory.close()
+
+
+def _pair(i):
+    return f"segmen nomor {i:03d} " + "x" * 20, f"segment number {i:03d} " + "y" * 20
+
+
+def test_lookup_normalizes_and_persists(tm):
+    tm.store("google", "id", "en", [("Hasil  pemeriksaan\n normal", "Examination result normal")])
+    assert tm.lookup("google", "id", "en", ["Hasil pemeriksaan normal", "baru"]) == {0: "Examination result normal"}
+    assert tm.lookup("google", "id", "ja", ["Hasil pemeriksaan normal"]) == {}
+    again = TranslationMemory(tm.path)
+    assert again.lookup("google", "id", "en", [" Hasil pemeriksaan normal "]) == {0: "Examination result normal"}
+    again.close()
+
+
+def test_eviction_stays_under_budget_and_keeps_recent(tm):
+    tm.store("google", "id", "en", [_pair(0)])
+    for i in range(1, 40):
+        tm.store("google", "id", "en", [_pair(i)])
+        # Entri 0 terus dipakai: tidak boleh terbuang walaupun paling lama disimpan
+        assert tm.lookup("google", "id", "en", [_pair(0)[0]]) == {0: _pair(0)[1]}
+        assert tm.stats()["bytes"] <= tm.max_bytes
+
+    stats = tm.stats()
+    assert stats["evictions"] > 0
+    assert tm.lookup("google", "id", "en", [_pair(1)[0]]) == {}
+    assert tm.lookup("google", "id", "en", [_pair(39)[0]]) == {0: _pair(39)[1]}
+
+    # Setelah eviction ukuran turun ke <= 90% batas, bukan sekadar di bawah batas
+    before = tm.evictions
+    i = 40
+    while tm.evictions == before:
+        tm.store("google", "id", "en", [_pair(i)])
+        i += 1
+    assert tm.stats()["bytes"] <= tm.max_bytes * 0.9
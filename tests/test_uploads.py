@@ -0,0 +1,39 @@
+import io
+import os
+
+from kay_core import StoredUpload, UploadStore
+
+
+def _upload(name, size):
+    f = io.BytesIO(b"x" * size)
+    f.name = name
+    return f
+
+
+def test_interrupted_run_releases_on_next_run(tmp_path):
+    store = UploadStore(str(tmp_path), spool_min=10)
+    store.begin_run()
+    stored = store.bind("tool_a", _upload("a.pdf", 100))
+    assert isinstance(stored, StoredUpload) and os.path.exists(stored.path)
+    store.release_unbound()
+
+    # Run berikutnya membuka tool lain dan berhenti (st.stop) sebelum release_unbound()
+    store.begin_run()
+    store.bind("tool_b", _upload("b.pdf", 5))
+    assert os.path.exists(stored.path)
+
+    store.begin_run()
+    assert not os.path.exists(stored.path)
+    assert store.stats()["files"] == 1
+    store.close()
+
+
+def test_completed_run_keeps_bound_uploads(tmp_path):
+    store = UploadStore(str(tmp_path), spool_min=10)
+    store.begin_run()
+    stored = store.bind("tool_a", [_upload("a.pdf", 100)])[0]
+    store.release_unbound()
+    store.begin_run()
+    assert os.path.exists(stored.path)
+    store.close()
+    assert not os.path.exists(store.root)
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PyPDF2 import PdfReader
+
+from kay_core import watermark_pdf
+from kay_core.watermark import WATERMARK_NAME
+
+
+def _forms(reader):
+    """idnum Form XObject watermark per halaman."""
+    return [page["/Resources"]["/XObject"].raw_get(WATERMARK_NAME).idnum for page in reader.pages]
+
+
+@pytest.mark.parametrize("workers, chunk_pages", [(1, 500), (2, 2)])
+def test_watermark_shares_one_form_per_chunk(make_pdf, pdf_texts, workers, chunk_pages):
+    base = make_pdf([f"isi {i}" for i in range(1, 6)])
+    calls = []
+    out, count = watermark_pdf(base, make_pdf(["RAHASIA"]), workers=workers, chunk_pages=chunk_pages,
+                               progress=lambda done, total: calls.append((done, total)))
+    assert count == 5 and calls[-1][0] == calls[-1][1]
+
+    texts = pdf_texts(out)
+    assert [t.splitlines()[0] for t in texts] == [f"isi {i}" for i in range(1, 6)]
+    out.seek(0)
+    reader = PdfReader(out)
+    forms = _forms(reader)
+    # Satu Form XObject dibagi semua halaman dalam satu potongan (bukan salinan per halaman)
+    assert len(set(forms)) == (1 if workers == 1 else len(calls))
+    form = reader.get_object(forms[0])
+    assert form["/Subtype"] == "/Form" and b"RAHASIA" in form.get_data()
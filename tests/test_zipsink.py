@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+import pytest
+
+from kay_core import ZipSink, compression_for
+
+
+@pytest.mark.parametrize("name, head, expected", [
+    ("scan.PDF", b"", zipfile.ZIP_STORED),
+    ("foto.jpg", b"", zipfile.ZIP_STORED),
+    ("data.xlsx", b"", zipfile.ZIP_STORED),
+    ("tanpa_ekstensi", b"%PDF-1.7", zipfile.ZIP_STORED),
+    ("hasil.bin", b"\x89PNG\r\n\x1a\n", zipfile.ZIP_STORED),
+    ("teks.txt", b"", zipfile.ZIP_DEFLATED),
+    ("data.csv", b"a,b,c\n", zipfile.ZIP_DEFLATED),
+])
+def test_compression_for(name, head, expected):
+    assert compression_for(name, head) == expected
+
+
+def test_zipsink_entries_use_per_entry_compression():
+    with ZipSink() as sink:
+        sink.add("a.txt", b"teks " * 1000)
+        sink.add("b.pdf", b"%PDF-1.4 isi")
+        sink.add_file("c", io.BufferedReader(io.BytesIO(b"\xff\xd8\xff" + b"0" * 100)))
+        sink.add("a.txt", b"duplikat")
+        data = sink.getvalue()
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        types = {info.filename: info.compress_type for info in zf.infolist()}
+        assert zf.read("a_2.txt") == b"duplikat"
+    assert types == {"a.txt": zipfile.ZIP_DEFLATED, "b.pdf": zipfile.ZIP_STORED,
+                     "c": zipfile.ZIP_STORED, "a_2.txt": zipfile.ZIP_DEFLATED}